@@ -1,35 +1,65 @@
-from flask import Flask, render_template, request, jsonify, send_file, redirect, url_for, session, flash, send_from_directory
+from flask import Flask, Blueprint, current_app, render_template, request, jsonify, send_file, redirect, url_for, session, flash, send_from_directory, Response, stream_with_context, g, make_response
+from flask.cli import with_appcontext
+from flask.wrappers import Request as FlaskRequest
 from werkzeug.utils import secure_filename
+import click
 from werkzeug.security import generate_password_hash, check_password_hash
 from functools import wraps
 import os
-import PyPDF2
-import openpyxl
-from openpyxl import Workbook
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload
 import io
 import json
 import os.path
-from datetime import datetime
+from datetime import datetime, timedelta
 import sqlite3
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, make_url
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.exc import IntegrityError
 from flask_wtf.csrf import CSRFProtect
 import uuid
+import base64
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from scoring import batch_score, rank_top_k, tokenize, SCORING_MODES
+from text_cache import TextCache, content_hash, file_hash
+from extraction import extract_resume_text as _extract_resume_text, ExtractionLimits, extractor_versions, supported_extensions
+from screening import build_index
+from ingestion import copy_and_hash, iter_upload_members
+from drive_sync import download_files, list_folder_files, local_name, next_cursor
+from drive_service import DriveServiceFactory, SCOPES
+from jira_integration import JiraClient, issue_fields
+from jira_outbox import JiraOutbox
+from skills import SKILLS_VERSION, dump_skills, extract_skills, load_skills, match_score
+from exports import iter_csv, write_xlsx
+import instrumentation
+from identity import Identity, IdentityCache
+from job_listing import ActiveJobsCache, JobSummary
+from instrumentation import timed
 
-app = Flask(__name__)
-app.config['UPLOAD_FOLDER'] = 'uploads'
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
-app.secret_key = 'your-secret-key-here'  # Change this in production
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///recruitment.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+class AppRequest(FlaskRequest):
+    @property
+    def max_content_length(self):
+        # Bulk imports carry many resumes per request, so they get their own body limit
+        if self.endpoint == 'main.bulk_import_resumes':
+            return current_app.config['BULK_IMPORT_MAX_CONTENT_LENGTH']
+        return super().max_content_length
 
-# Initialize extensions
-db = SQLAlchemy(app)
-csrf = CSRFProtect(app)
+class AppFlask(Flask):
+    request_class = AppRequest
+
+    def get_send_file_max_age(self, filename):
+        # Static URLs are versioned by static_version, so only they may be kept for long;
+        # exports and other send_file responses keep Flask's no-cache default
+        if request.endpoint == 'static':
+            return self.config['STATIC_MAX_AGE']
+        return super().get_send_file_max_age(filename)
+
+# Extensions are bound to an app in create_app
+db = SQLAlchemy()
+csrf = CSRFProtect()
+bp = Blueprint('main', __name__)
 
 # Models
 class User(db.Model):
@@ -41,6 +71,14 @@ class User(db.Model):
     name = db.Column(db.String(100))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
+# Signed-in users' role and email, shared across requests in this process
+identity_cache = IdentityCache()
+
+@event.listens_for(User, 'after_update')
+@event.listens_for(User, 'after_delete')
+def _invalidate_cached_identity(mapper, connection, target):
+    identity_cache.invalidate(target.id)
+
 class Job(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
@@ -67,12 +105,283 @@ class Application(db.Model):
     candidate = db.relationship('User', backref='applications')
     job = db.relationship('Job')
 
-# Create database tables
-with app.app_context():
-    db.create_all()
+    __table_args__ = (
+        db.Index('ix_application_candidate_applied', 'candidate_id', 'applied_date'),
+    )
+
+    def to_dict(self):
+        # Keys the candidate dashboard renders
+        return {
+            'id': self.id,
+            'position': self.job.title if self.job else None,
+            'company': self.job.company if self.job else None,
+            'dateAdded': self.applied_date.strftime('%Y-%m-%d') if self.applied_date else None,
+            'status': self.status,
+            'jobId': self.job_id,
+            'score': self.score
+        }
+
+# Active jobs are the same for every visitor; cached and dropped when a Job change commits
+active_jobs_cache = ActiveJobsCache()
+
+# Edits to these columns change a job's skill profile
+PROFILED_JOB_FIELDS = ('title', 'description', 'requirements')
+
+@event.listens_for(Session, 'before_flush')
+def _note_job_changes(session, flush_context, instances):
+    if any(isinstance(obj, Job) for obj in (*session.new, *session.dirty, *session.deleted)):
+        session.info['jobs_changed'] = True
+    # Re-profile edited jobs before the flush, so the new profile is written with them
+    for obj in session.dirty:
+        if isinstance(obj, Job) and any(
+            db.inspect(obj).attrs[field].history.has_changes() for field in PROFILED_JOB_FIELDS
+        ):
+            refresh_job_skills(obj)
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_active_jobs(session):
+    if session.info.pop('jobs_changed', False):
+        active_jobs_cache.invalidate()
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_job_changes(session):
+    session.info.pop('jobs_changed', None)
+
+def get_active_jobs():
+    """Active jobs by title, from the process-wide cache"""
+    return active_jobs_cache.get(lambda: [
+        JobSummary.from_job(job) for job in Job.query.filter_by(is_active=True).order_by(Job.title)
+    ])
+
+class ScreeningJob(db.Model):
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    created_by = db.Column(db.Integer, db.ForeignKey('user.id'))
+    status = db.Column(db.String(20), default='queued', index=True)  # queued, running, completed, failed
+    mode = db.Column(db.String(20), default='percentage')
+    job_description = db.Column(db.Text, nullable=False)
+    total = db.Column(db.Integer, default=0)
+    processed = db.Column(db.Integer, default=0)
+    files_per_second = db.Column(db.Float)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    heartbeat_at = db.Column(db.DateTime)  # refreshed while the job runs; a stopped heartbeat means it was interrupted
+    finished_at = db.Column(db.DateTime)
+
+    def to_dict(self):
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'mode': self.mode,
+            'processed': self.processed or 0,
+            'total': self.total or 0,
+            'files_per_second': self.files_per_second,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'heartbeat_at': self.heartbeat_at.isoformat() if self.heartbeat_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+class ScreeningResult(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(36), db.ForeignKey('screening_job.id'), nullable=False)
+    resume = db.Column(db.String(500), nullable=False)
+    name = db.Column(db.String(200))
+    email = db.Column(db.String(200))
+    score = db.Column(db.Float, nullable=False)
+    status = db.Column(db.String(20), default='Pending Review')
+
+    __table_args__ = (
+        db.Index('ix_screening_result_job_score', 'job_id', 'score'),
+    )
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'email': self.email,
+            'score': self.score,
+            'status': self.status,
+            'resume': self.resume
+        }
+
+class ScreeningScore(db.Model):
+    # Percentage score of one resume (by content hash) against one JD (by token hash)
+    jd_hash = db.Column(db.String(64), primary_key=True)
+    resume_hash = db.Column(db.String(64), primary_key=True)
+    score = db.Column(db.Float, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class ResumeRecord(db.Model):
+    id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    name = db.Column(db.String(200))
+    email = db.Column(db.String(120), index=True)
+    phone = db.Column(db.String(50))
+    position = db.Column(db.String(200))
+    company = db.Column(db.String(100))
+    date_added = db.Column(db.String(10))  # YYYY-MM-DD, as shown on the dashboards
+    status = db.Column(db.String(20), default='New')
+    source = db.Column(db.String(50))
+    file_name = db.Column(db.String(500))
+    file_path = db.Column(db.String(500))
+    application_id = db.Column(db.Integer, db.ForeignKey('application.id'))
+    applied_date = db.Column(db.DateTime, index=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), index=True)
+    score = db.Column(db.Float)
+
+    def to_dict(self):
+        # Same keys as the old resume_database.json entries used by the templates
+        return {
+            'id': self.id,
+            'name': self.name,
+            'email': self.email,
+            'phone': self.phone,
+            'position': self.position,
+            'company': self.company,
+            'dateAdded': self.date_added,
+            'status': self.status,
+            'source': self.source,
+            'fileName': self.file_name,
+            'filePath': self.file_path,
+            'applicationId': self.application_id,
+            'appliedDate': self.applied_date.isoformat() if self.applied_date else None,
+            'jobId': self.job_id,
+            'score': self.score if self.score is not None else 0
+        }
+
+class JobDescription(db.Model):
+    # A job's uploaded JD, extracted and tokenized once at upload
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), primary_key=True)
+    file_name = db.Column(db.String(255), nullable=False)
+    file_path = db.Column(db.String(500), nullable=False)
+    content_hash = db.Column(db.String(64), nullable=False)
+    text = db.Column(db.Text, nullable=False)
+    tokens = db.Column(db.Text, nullable=False)  # scoring tokens, space-separated
+    uploaded_by = db.Column(db.Integer, db.ForeignKey('user.id'))
+    uploaded_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    
+    job = db.relationship('Job', backref=db.backref('jd', uselist=False))
+
+    def keywords(self):
+        return self.tokens.split()
+
+class JobSkills(db.Model):
+    # Skill terms extracted once from a job's title, description and requirements
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), primary_key=True)
+    skills = db.Column(db.Text, nullable=False, default='')  # sorted, space-separated
+    version = db.Column(db.String(20))
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class ApplicationSkills(db.Model):
+    # Skill terms extracted once from an application's resume
+    application_id = db.Column(db.Integer, db.ForeignKey('application.id'), primary_key=True)
+    skills = db.Column(db.Text, nullable=False, default='')
+    version = db.Column(db.String(20))
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class JobMatch(db.Model):
+    # Precomputed ranking of each job's applicants, updated as applications arrive
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), primary_key=True)
+    application_id = db.Column(db.Integer, db.ForeignKey('application.id'), primary_key=True)
+    candidate_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    score = db.Column(db.Float, nullable=False)
 
-# Dummy HR user (for demo purposes only)
-with app.app_context():
+    __table_args__ = (
+        db.Index('ix_job_match_job_score', 'job_id', 'score'),
+    )
+
+class DriveSync(db.Model):
+    # Per-folder cursor: the next sync lists files modified at or after it
+    folder_id = db.Column(db.String(200), primary_key=True)
+    cursor = db.Column(db.String(40))  # Drive modifiedTime, RFC 3339
+    files_imported = db.Column(db.Integer, default=0)
+    last_synced_at = db.Column(db.DateTime)
+
+class ResumeFile(db.Model):
+    # One stored file per distinct resume content, so re-imports are skipped
+    content_hash = db.Column(db.String(64), primary_key=True)
+    resume_id = db.Column(db.String(36), db.ForeignKey('resume_record.id'))
+    file_path = db.Column(db.String(500), nullable=False)
+    size = db.Column(db.Integer)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+@timed('resume_json_migration')
+def migrate_resume_database_json():
+    """One-shot import of uploads/resume_database.json into the resume_record table"""
+    resume_db_path = os.path.join(current_app.config['UPLOAD_FOLDER'], 'resume_database.json')
+    if not os.path.exists(resume_db_path):
+        return 0
+    
+    with open(resume_db_path, 'r') as f:
+        entries = json.load(f)
+    
+    def _parse_date(value):
+        try:
+            return datetime.fromisoformat(value) if value else None
+        except ValueError:
+            return None
+    
+    def _parse_int(value):
+        try:
+            return int(value) if value not in (None, '') else None
+        except (TypeError, ValueError):
+            return None
+    
+    existing_ids = {row.id for row in db.session.query(ResumeRecord.id)}
+    records = []
+    for entry in entries:
+        record_id = str(entry.get('id') or uuid.uuid4())
+        if record_id in existing_ids:
+            continue
+        existing_ids.add(record_id)
+        records.append(ResumeRecord(
+            id=record_id,
+            name=entry.get('name'),
+            email=entry.get('email'),
+            phone=entry.get('phone'),
+            position=entry.get('position'),
+            company=entry.get('company'),
+            date_added=entry.get('dateAdded'),
+            status=entry.get('status', 'New'),
+            source=entry.get('source'),
+            file_name=entry.get('fileName'),
+            file_path=entry.get('filePath'),
+            application_id=_parse_int(entry.get('applicationId')),
+            applied_date=_parse_date(entry.get('appliedDate') or entry.get('dateAdded')),
+            job_id=_parse_int(entry.get('jobId')),
+            score=entry.get('score')
+        ))
+    db.session.add_all(records)
+    db.session.commit()
+    
+    # Keep the original file around, but never import it twice
+    os.replace(resume_db_path, resume_db_path + '.migrated')
+    return len(records)
+
+def add_missing_columns():
+    """Add nullable model columns that an existing database's tables lack"""
+    inspector = db.inspect(db.engine)
+    preparer = db.engine.dialect.identifier_preparer
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing and column.nullable and not column.primary_key:
+                    conn.execute(db.text(
+                        f'ALTER TABLE {preparer.format_table(table)} '
+                        f'ADD COLUMN {preparer.format_column(column)} {column.type.compile(db.engine.dialect)}'
+                    ))
+
+def init_db():
+    """Create the tables, seed the demo HR user and jobs, and import legacy JSON records"""
+    db.create_all()
+    # create_all skips new columns and indexes on tables that already exist
+    add_missing_columns()
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(db.engine, checkfirst=True)
+    
+    # Dummy HR user (for demo purposes only)
     if not User.query.filter_by(username='hr101').first():
         hr_user = User(
             username='hr101',
@@ -105,77 +414,668 @@ with app.app_context():
         db.session.bulk_save_objects(jobs)
         db.session.commit()
 
+    # Skill profiles for jobs created before they existed
+    profiled = db.session.query(JobSkills.job_id).filter(JobSkills.version == SKILLS_VERSION)
+    for job in Job.query.filter(Job.id.not_in(profiled)):
+        refresh_job_skills(job)
+    db.session.commit()
+
+    # Move any legacy JSON resume records into the database
+    migrate_resume_database_json()
+
+def rebuild_matches():
+    """Re-extract every application's skills and rebuild all job rankings"""
+    for application in Application.query.yield_per(500):
+        index_application(application, rank=False)
+    db.session.commit()
+    for job in Job.query.all():
+        refresh_job_skills(job)
+    db.session.commit()
+
+def engine_options(config):
+    """Connection pool sizing; in-memory SQLite keeps Flask-SQLAlchemy's single shared connection"""
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() == 'sqlite' and url.database in (None, '', ':memory:'):
+        return {}
+    return {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+    }
+
+def set_sqlite_pragmas(engine, pragmas):
+    """Apply PRAGMAs to every new SQLite connection in the engine's pool"""
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+    
+    @event.listens_for(engine, 'connect')
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """Create and seed the database; run once per deployment and after model changes"""
+    init_db()
+    click.echo('Initialized the database.')
+
+@click.command('rebuild-matches')
+@with_appcontext
+def rebuild_matches_command():
+    """Rebuild skill profiles and job rankings, e.g. after the skill rules change"""
+    rebuild_matches()
+    click.echo('Rebuilt job matches.')
+
 # Google Drive API Setup
-SCOPES = ['https://www.googleapis.com/auth/drive.readonly']
+# Credentials and built services are cached for the whole process
+drive_services = DriveServiceFactory(scopes=SCOPES)
 
 def get_google_drive_service():
-    creds = None
-    if os.path.exists('token.json'):
-        creds = Credentials.from_authorized_user_file('token.json', SCOPES)
-    
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(
-                'credentials.json', SCOPES)
-            creds = flow.run_local_server(port=0)
-        
-        with open('token.json', 'w') as token:
-            token.write(creds.to_json())
-    
-    return build('drive', 'v3', credentials=creds)
+    return drive_services()
+
+# Shared extracted-text cache, opened by create_app
+text_cache = None
 
-def extract_text_from_pdf(pdf_file):
-    reader = PyPDF2.PdfReader(pdf_file)
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text() + "\n"
-    return text
+def extract_resume_text(path):
+    """Extract text from a resume or JD file through the shared text cache"""
+    return _extract_resume_text(path, text_cache, extraction_limits())
 
+def extraction_limits():
+    """Page and character caps for PDF extraction, from the app config"""
+    return ExtractionLimits(current_app.config['PDF_MAX_PAGES'], current_app.config['PDF_MAX_CHARS'])
+
+def warm_text_cache(path):
+    """Extract an uploaded file once so screening runs hit the cache"""
+    try:
+        extract_resume_text(path)
+    except Exception as e:
+        print(f"Error extracting {path}: {str(e)}")
+
+@timed('screen_resume')
 def screen_resume(resume_text, job_description):
     # Simple keyword matching for demo
     # In production, you might want to use NLP or more sophisticated matching
-    keywords = job_description.lower().split()
-    resume_words = resume_text.lower().split()
+    # Scoring: percentage of keywords found in resume, via the batch scorer
+    return batch_score(job_description, [(0, resume_text)])[0]
+
+def refresh_job_skills(job):
+    """Re-extract a job's skills and re-rank its applicants from their stored skills; the caller commits"""
+    jd_text = job.jd.text if job.jd else None
+    skills = extract_skills(' '.join(filter(None, [job.title, job.description, job.requirements, jd_text])))
+    profile = db.session.get(JobSkills, job.id) or JobSkills(job_id=job.id)
+    profile.skills = dump_skills(skills)
+    profile.version = SKILLS_VERSION
+    profile.updated_at = datetime.utcnow()
+    db.session.add(profile)
+    
+    # Applicants are re-scored from their stored profiles; no resume is read again
+    applicants = db.session.query(Application.id, Application.candidate_id, ApplicationSkills.skills).join(
+        ApplicationSkills, ApplicationSkills.application_id == Application.id
+    ).filter(Application.job_id == job.id).all()
+    JobMatch.query.filter_by(job_id=job.id).delete()
+    if applicants:
+        db.session.execute(db.insert(JobMatch), [
+            {
+                'job_id': job.id,
+                'application_id': application_id,
+                'candidate_id': candidate_id,
+                'score': match_score(skills, load_skills(candidate_skills))
+            }
+            for application_id, candidate_id, candidate_skills in applicants
+        ])
+    return skills
+
+def get_job_skills(job_id):
+    """A job's stored skills, extracted on first use"""
+    profile = db.session.get(JobSkills, job_id)
+    if profile is None or profile.version != SKILLS_VERSION:
+        return refresh_job_skills(db.session.get(Job, job_id))
+    return load_skills(profile.skills)
+
+def index_application(application, rank=True):
+    """Extract an application's resume skills once and upsert its row in the job's ranking; the caller commits"""
+    try:
+        skills = extract_skills(extract_resume_text(application.resume_path))
+    except Exception as e:
+        print(f"Error extracting skills from {application.resume_path}: {str(e)}")
+        skills = []
+    db.session.merge(ApplicationSkills(
+        application_id=application.id,
+        skills=dump_skills(skills),
+        version=SKILLS_VERSION,
+        updated_at=datetime.utcnow()
+    ))
+    if rank:
+        db.session.merge(JobMatch(
+            job_id=application.job_id,
+            application_id=application.id,
+            candidate_id=application.candidate_id,
+            score=match_score(get_job_skills(application.job_id), skills)
+        ))
+    return skills
+
+def top_candidates_by_job(limit=5):
+    """The best `limit` applicants of every active job.
+
+    One small query per job on the (job_id, score) index, so the cost follows
+    the number of active jobs rather than the size of the match table.
+    """
+    top = []
+    for job in sorted(get_active_jobs(), key=lambda job: job.id):
+        rows = db.session.execute(
+            db.select(User.name, User.email, JobMatch.score)
+            .join(User, User.id == JobMatch.candidate_id)
+            .where(JobMatch.job_id == job.id)
+            .order_by(JobMatch.score.desc(), JobMatch.application_id)
+            .limit(limit)
+        ).all()
+        if rows:
+            top.append({
+                'job_id': job.id,
+                'title': job.title,
+                'candidates': [{'name': name, 'email': email, 'score': score} for name, email, score in rows]
+            })
+    return top
+
+def list_resume_files(resumes_dir):
+    """Resume files in the uploads folder that screening can read"""
+    return [f for f in os.listdir(resumes_dir) if f.lower().endswith(supported_extensions())]
+
+def jd_fingerprint(keywords):
+    """Hash of the JD's tokens and the extractor version that produced resume text"""
+    version = extraction_limits().version(extractor_versions())
+    return content_hash(f"{version}\n{' '.join(keywords)}".encode('utf-8'))
+
+def save_job_description(job, upload, user_id=None):
+    """Store an uploaded JD for a job, replacing its previous one, with its text and tokens.
+
+    The file is extracted once here; screening reads the stored tokens and
+    never parses the JD again. Raises ValueError if no text can be read.
+    """
+    jds_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'jds')
+    os.makedirs(jds_dir, exist_ok=True)
+    file_name = secure_filename(upload.filename)
+    extension = os.path.splitext(file_name)[1].lower()
+    # The temporary name keeps the extension, which picks the extractor
+    temp_path = os.path.join(jds_dir, f'.upload-{uuid.uuid4().hex}{extension}')
+    digest, _ = copy_and_hash(upload.stream, temp_path)
+    
+    # Read the upload before it replaces anything, so a bad file leaves nothing behind
+    try:
+        text = extract_resume_text(temp_path)
+    except Exception as e:
+        os.remove(temp_path)
+        raise ValueError(f'Could not read the job description: {str(e)}')
+    if not text.strip():
+        os.remove(temp_path)
+        raise ValueError('No text could be read from the job description')
+    file_path = os.path.join(jds_dir, f'job_{job.id}_{digest[:16]}{extension}')
+    os.replace(temp_path, file_path)
+    
+    try:
+        for attempt in range(2):
+            jd = job.jd or JobDescription(job_id=job.id)
+            previous_path = jd.file_path
+            jd.file_name = file_name
+            jd.file_path = file_path
+            jd.content_hash = digest
+            jd.text = text
+            jd.tokens = ' '.join(tokenize(text))
+            jd.uploaded_by = user_id
+            jd.uploaded_at = datetime.utcnow()
+            job.jd = jd
+            try:
+                db.session.add(jd)
+                # The JD's terms also feed the job's skill profile and candidate ranking
+                refresh_job_skills(job)
+                db.session.commit()
+                break
+            except IntegrityError:
+                # A concurrent first upload created the job's JD row; replace that one instead
+                db.session.rollback()
+                if attempt:
+                    raise
+    except BaseException:
+        db.session.rollback()
+        # No orphan file, unless a concurrent upload of the same content stored it
+        if not JobDescription.query.filter_by(file_path=file_path).first():
+            os.remove(file_path)
+        raise
+    if previous_path and previous_path != file_path and os.path.exists(previous_path):
+        os.remove(previous_path)
+    return jd
+
+def screening_jd(user_id):
+    """The JD a screening request targets: the form's job_id, else this user's latest upload"""
+    job_id = request.values.get('job_id', type=int)
+    if job_id is not None:
+        return db.session.get(JobDescription, job_id)
+    return JobDescription.query.filter_by(uploaded_by=user_id).order_by(JobDescription.uploaded_at.desc()).first()
+
+def load_screening_scores(jd_hash, resume_hashes, batch_size=500):
+    """Stored scores for resume hashes already screened against this JD"""
+    resume_hashes = list(resume_hashes)
+    stored = {}
+    for start in range(0, len(resume_hashes), batch_size):
+        rows = ScreeningScore.query.filter(
+            ScreeningScore.jd_hash == jd_hash,
+            ScreeningScore.resume_hash.in_(resume_hashes[start:start + batch_size])
+        ).all()
+        stored.update((row.resume_hash, row.score) for row in rows)
+    return stored
+
+def record_screening_scores(jd_hash, scores_by_hash, scores_by_path, job_id=None, batch_size=500):
+    """Persist new JD/resume scores and copy the latest score onto the job's matching applications.
+
+    Without a job_id only the scores are stored: a score is only meaningful
+    on an application or resume record for the job the JD belongs to.
+    """
+    rows = [
+        ScreeningScore(jd_hash=jd_hash, resume_hash=resume_hash, score=score)
+        for resume_hash, score in scores_by_hash.items()
+    ]
+    try:
+        db.session.add_all(rows)
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent run stored some of the same pairs first
+        db.session.rollback()
+        for row in rows:
+            db.session.merge(row)
+        db.session.commit()
+    if job_id is None:
+        return
+    
+    paths = list(scores_by_path)
+    for start in range(0, len(paths), batch_size):
+        batch = paths[start:start + batch_size]
+        applications = Application.query.filter(Application.job_id == job_id, Application.resume_path.in_(batch))
+        for application in applications:
+            if application.score != scores_by_path[application.resume_path]:
+                application.score = scores_by_path[application.resume_path]
+        records = ResumeRecord.query.filter(ResumeRecord.job_id == job_id, ResumeRecord.file_path.in_(batch))
+        for record in records:
+            if record.score != scores_by_path[record.file_path]:
+                record.score = scores_by_path[record.file_path]
+    db.session.commit()
+
+@timed('run_screening')
+def run_screening(keywords, resumes_dir, resume_files, mode='percentage', workers=0, progress=None, job_id=None):
+    """Score resume files against a job description's tokens; returns (unordered results, throughput).
+
+    Percentage scores are stored per (JD hash, resume hash), so a repeat run
+    for the same JD only extracts and scores files that are new or changed.
+    When the JD belongs to a job, its applications' scores are updated too.
+    """
+    paths = {resume_file: os.path.join(resumes_dir, resume_file) for resume_file in resume_files}
+    scores = {}
+    resume_hashes = {}
+    if mode == 'percentage':
+        jd_hash = jd_fingerprint(keywords)
+        for resume_file, path in paths.items():
+            try:
+                resume_hashes[resume_file] = file_hash(path)
+            except OSError as e:
+                print(f"Error processing {resume_file}: {str(e)}")
+        stored = load_screening_scores(jd_hash, set(resume_hashes.values()))
+        scores = {f: stored[h] for f, h in resume_hashes.items() if h in stored}
+    
+    pending = [resume_file for resume_file in resume_files if resume_file not in scores]
+    reused = len(scores)
+    
+    def pending_progress(done, total):
+        progress(reused + done, len(resume_files))
+    
+    # Tokenize each new resume once into a corpus-wide index, optionally across a process pool
+    index, errors, throughput = build_index(
+        [(resume_file, paths[resume_file]) for resume_file in pending],
+        cache=text_cache,
+        workers=workers,
+        chunk_size=current_app.config['SCREENING_CHUNK_SIZE'],
+        timeout=current_app.config['SCREENING_FILE_TIMEOUT'],
+        progress=pending_progress if progress else None,
+        limits=extraction_limits()
+    )
+    for resume_file, error in errors.items():
+        print(f"Error processing {resume_file}: {error}")
+    throughput['reused'] = reused
+    
+    # Score the job description against the whole index in one pass
+    new_scores = index.score_terms(keywords, mode=mode)
+    scores.update(new_scores)
+    
+    if mode == 'percentage' and scores:
+        record_screening_scores(
+            jd_hash,
+            {resume_hashes[f]: score for f, score in new_scores.items() if f in resume_hashes},
+            {paths[f]: score for f, score in scores.items()},
+            job_id
+        )
+    
+    results = []
+    for resume_file in resume_files:
+        if resume_file not in scores:
+            continue
+        
+        # Get candidate info from filename or database
+        # For now, we'll use the filename
+        candidate_name = ' '.join(resume_file.split('_')[:-2])  # Remove timestamp and extension
+        
+        results.append({
+            'name': candidate_name,
+            'email': f"{candidate_name.replace(' ', '.').lower()}@example.com",
+            'score': scores[resume_file],
+            'status': 'Pending Review',
+            'resume': resume_file
+        })
+    
+    # Ranking is left to the caller: top-K heap or an indexed ORDER BY
+    return results, throughput
+
+def save_screening_results(job_id, results):
+    """Bulk insert one run's results; the caller commits"""
+    if results:
+        db.session.execute(db.insert(ScreeningResult), [dict(result, job_id=job_id) for result in results])
+
+def import_resumes(uploads, resumes_dir, job=None):
+    """Stream uploaded resumes and zip members to disk, skipping content already stored.
+
+    Files are hashed while they are written, and records are inserted in
+    batches of BULK_IMPORT_BATCH_SIZE, one transaction per batch.
+    """
+    os.makedirs(resumes_dir, exist_ok=True)
+    summary = {'imported': 0, 'duplicates': [], 'skipped': []}
+    seen = set()
+    batch = []
+    for name, stream, error in iter_upload_members(uploads, supported_extensions()):
+        if error:
+            summary['skipped'].append({'file': name, 'error': error})
+            continue
+        # Hidden .part names are ignored by screening until the file is renamed
+        temp_path = os.path.join(resumes_dir, f'.import-{uuid.uuid4().hex}.part')
+        try:
+            digest, size = copy_and_hash(stream, temp_path, current_app.config['BULK_IMPORT_MAX_FILE_BYTES'])
+        except Exception as e:
+            summary['skipped'].append({'file': name, 'error': str(e)})
+            continue
+        if digest in seen:
+            os.remove(temp_path)
+            summary['duplicates'].append(name)
+            continue
+        seen.add(digest)
+        batch.append((name, temp_path, digest, size))
+        if len(batch) >= current_app.config['BULK_IMPORT_BATCH_SIZE']:
+            save_imported_resumes(batch, resumes_dir, job, summary)
+            batch = []
+    if batch:
+        save_imported_resumes(batch, resumes_dir, job, summary)
+    return summary
+
+def sync_drive_folder(folder_id, service_factory=None):
+    """Import resumes added or changed in a Drive folder since its last sync.
+
+    service_factory returns a Drive service and is called once per download
+    thread; it defaults to get_google_drive_service and can be swapped for a
+    fake in tests.
+    """
+    service_factory = service_factory or get_google_drive_service
+    state = db.session.get(DriveSync, folder_id) or DriveSync(folder_id=folder_id, files_imported=0)
+    resumes_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'resumes')
+    os.makedirs(resumes_dir, exist_ok=True)
+    
+    summary = {'imported': 0, 'duplicates': [], 'skipped': []}
+    seen = set()
+    batch = []
+    downloads = []
+    files = list_folder_files(service_factory(), folder_id, state.cursor, current_app.config['DRIVE_PAGE_SIZE'])
+    for download in download_files(service_factory, files, resumes_dir, supported_extensions(),
+                                   workers=current_app.config['DRIVE_SYNC_WORKERS'],
+                                   max_bytes=current_app.config['BULK_IMPORT_MAX_FILE_BYTES'],
+                                   retries=current_app.config['DRIVE_DOWNLOAD_RETRIES']):
+        downloads.append(download._replace(path=None))
+        name = local_name(download.file)
+        if download.error:
+            summary['skipped'].append({'file': name, 'error': download.error})
+            continue
+        if download.digest in seen:
+            os.remove(download.path)
+            summary['duplicates'].append(name)
+            continue
+        seen.add(download.digest)
+        batch.append((name, download.path, download.digest, download.size))
+        if len(batch) >= current_app.config['BULK_IMPORT_BATCH_SIZE']:
+            save_imported_resumes(batch, resumes_dir, None, summary, source='Google Drive')
+            batch = []
+    if batch:
+        save_imported_resumes(batch, resumes_dir, None, summary, source='Google Drive')
     
-    # Simple scoring: percentage of keywords found in resume
-    matched = sum(1 for word in keywords if word in resume_words)
-    score = (matched / len(keywords)) * 100 if keywords else 0
-    return min(100, round(score, 2))
+    state.cursor = next_cursor(state.cursor, downloads)
+    state.files_imported = (state.files_imported or 0) + summary['imported']
+    state.last_synced_at = datetime.utcnow()
+    db.session.add(state)
+    db.session.commit()
+    return dict(summary, cursor=state.cursor)
+
+def stored_resume_hashes(hashes):
+    return {row.content_hash for row in db.session.query(ResumeFile.content_hash).filter(ResumeFile.content_hash.in_(hashes))}
+
+def save_imported_resumes(batch, resumes_dir, job, summary, source='Bulk Import'):
+    """Move one batch of new files into place and insert their records in one transaction"""
+    known = stored_resume_hashes([digest for _, _, digest, _ in batch])
+    now = datetime.now()
+    pending = []
+    for name, temp_path, digest, size in batch:
+        if digest in known:
+            os.remove(temp_path)
+            summary['duplicates'].append(name)
+            continue
+        # Named like other uploads, so screening reads the candidate name from it
+        stem, ext = os.path.splitext(secure_filename(os.path.basename(name)))
+        filename = f"{stem or 'resume'}_{int(now.timestamp())}_{digest[:12]}{ext.lower()}"
+        path = os.path.join(resumes_dir, filename)
+        os.replace(temp_path, path)
+        record = {
+            'id': str(uuid.uuid4()),
+            'name': stem.replace('_', ' '),
+            'position': job.title if job else None,
+            'company': job.company if job else None,
+            'date_added': now.strftime('%Y-%m-%d'),
+            'status': 'New',
+            'source': source,
+            'file_name': filename,
+            'file_path': path,
+            'applied_date': now,
+            'job_id': job.id if job else None
+        }
+        pending.append((name, record, {'content_hash': digest, 'resume_id': record['id'], 'file_path': path, 'size': size}))
+    
+    while pending:
+        try:
+            db.session.execute(db.insert(ResumeRecord), [record for _, record, _ in pending])
+            db.session.execute(db.insert(ResumeFile), [stored for _, _, stored in pending])
+            db.session.commit()
+            summary['imported'] += len(pending)
+            return
+        except IntegrityError:
+            # A concurrent import stored some of the same content first
+            db.session.rollback()
+            known = stored_resume_hashes([stored['content_hash'] for _, _, stored in pending])
+            if not known:
+                raise
+            for name, record, stored in pending:
+                if stored['content_hash'] in known:
+                    os.remove(record['file_path'])
+                    summary['duplicates'].append(name)
+            pending = [entry for entry in pending if entry[2]['content_hash'] not in known]
+
+# Background screening jobs
+screening_executor = None
+screening_executor_lock = threading.Lock()
+active_screening_jobs = set()
+
+def get_screening_executor():
+    """Start the job worker pool on first use and requeue jobs interrupted by a restart"""
+    global screening_executor
+    with screening_executor_lock:
+        if screening_executor is None:
+            app = current_app._get_current_object()
+            screening_executor = ThreadPoolExecutor(
+                max_workers=app.config['SCREENING_JOB_WORKERS'],
+                thread_name_prefix='screening-job'
+            )
+            pending = ScreeningJob.query.filter(ScreeningJob.status.in_(['queued', 'running'])).all()
+            for job in pending:
+                screening_executor.submit(run_screening_job, app, job.id)
+        return screening_executor
+
+def run_screening_job(app, job_id):
+    """Run one screening job, recording progress and results in the database"""
+    # Never run the same job twice in this process
+    with screening_executor_lock:
+        if job_id in active_screening_jobs:
+            return
+        active_screening_jobs.add(job_id)
+    
+    with app.app_context():
+        # Claim the job in one UPDATE so only one worker process runs it. A job
+        # left 'running' counts as interrupted once its heartbeat is older than the stale limit.
+        now = datetime.utcnow()
+        stale = now - timedelta(seconds=current_app.config['SCREENING_JOB_STALE_AFTER'])
+        claimed = ScreeningJob.query.filter(
+            ScreeningJob.id == job_id,
+            db.or_(
+                ScreeningJob.status == 'queued',
+                db.and_(
+                    ScreeningJob.status == 'running',
+                    db.func.coalesce(ScreeningJob.heartbeat_at, ScreeningJob.started_at) < stale
+                )
+            )
+        ).update({'status': 'running', 'started_at': now, 'heartbeat_at': now}, synchronize_session=False)
+        db.session.commit()
+        job = db.session.get(ScreeningJob, job_id)
+        if not claimed or job is None:
+            with screening_executor_lock:
+                active_screening_jobs.discard(job_id)
+            return
+        
+        try:
+            # A job resumed after a restart starts over from a clean slate
+            ScreeningResult.query.filter_by(job_id=job.id).delete()
+            resumes_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'resumes')
+            resume_files = list_resume_files(resumes_dir) if os.path.exists(resumes_dir) else []
+            job.total = len(resume_files)
+            job.processed = 0
+            db.session.commit()
+            
+            # Persist progress, and with it the heartbeat, at most this often to keep commits cheap
+            interval = current_app.config['SCREENING_JOB_HEARTBEAT']
+            last_update = [time.monotonic()]
+            def progress(done, total):
+                if done == total or time.monotonic() - last_update[0] >= interval:
+                    job.processed = done
+                    job.heartbeat_at = datetime.utcnow()
+                    db.session.commit()
+                    last_update[0] = time.monotonic()
+            
+            # A job only snapshots JD text, not the job it is for, so no application scores are written
+            results, throughput = run_screening(
+                tokenize(job.job_description), resumes_dir, resume_files, job.mode,
+                current_app.config['SCREENING_WORKERS'], progress
+            )
+            save_screening_results(job.id, results)
+            job.status = 'completed'
+            job.processed = len(resume_files)
+            job.files_per_second = throughput['files_per_second']
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            job.status = 'failed'
+            job.error = str(e)
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+        finally:
+            with screening_executor_lock:
+                active_screening_jobs.discard(job_id)
+
+# Jira calls go through a durable outbox so requests never wait on Jira
+jira_outbox = None  # opened by create_app
+instrumentation.register_gauge('jira_outbox_depth', 'Jira operations waiting to be sent',
+                               lambda: jira_outbox.stats()['depth'])
+instrumentation.register_gauge('jira_outbox_lag_seconds', 'Age of the oldest unsent Jira operation',
+                               lambda: jira_outbox.stats()['lag_seconds'])
+
+def get_jira_outbox():
+    """Start the outbox worker on first use; it also sends anything left from a previous run"""
+    jira_outbox.start()
+    return jira_outbox
+
+def get_current_identity():
+    """Signed-in user's Identity (or None), loaded at most once per request"""
+    if 'current_identity' in g:
+        return g.current_identity
+    
+    identity = None
+    user_id = session.get('user_id')
+    if user_id is not None:
+        identity = identity_cache.get(user_id)
+        if identity is None:
+            user = User.query.get(user_id)
+            if user:
+                identity = Identity.from_user(user)
+                identity_cache.set(user_id, identity)
+    g.current_identity = identity
+    return identity
 
 def login_required(role=None):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
             if 'user_id' not in session:
-                return redirect(url_for('role_selection', next=request.url))
+                return redirect(url_for('main.role_selection', next=request.url))
             
-            user = User.query.get(session['user_id'])
+            user = get_current_identity()
             if not user:
                 session.pop('user_id', None)
-                return redirect(url_for('role_selection', next=request.url))
+                return redirect(url_for('main.role_selection', next=request.url))
                 
             if role and user.role != role:
                 flash('You do not have permission to access this page.', 'danger')
-                return redirect(url_for(f'{user.role}_dashboard'))
+                return redirect(url_for(f'main.{user.role}_dashboard'))
                 
             return f(*args, **kwargs)
         return decorated_function
     return decorator
 
 # Routes
-@app.route('/')
+@bp.route('/frontend.html')
+def frontend():
+    # Revalidated on every load; unchanged copies get a 304 from the ETag
+    return send_from_directory(current_app.root_path, 'frontend.html', max_age=0)
+
+@bp.app_url_defaults
+def static_version(endpoint, values):
+    # Versioned static URLs, so browsers may keep them for STATIC_MAX_AGE
+    if endpoint == 'static' and 'filename' in values and 'v' not in values:
+        try:
+            values['v'] = int(os.stat(os.path.join(current_app.static_folder, values['filename'])).st_mtime)
+        except OSError:
+            pass
+
+@bp.route('/')
 def role_selection():
-    if 'user_id' in session:
-        user = User.query.get(session['user_id'])
+    user = get_current_identity()
+    if user:
         if user.role == 'hr':
-            return redirect(url_for('hr_dashboard'))
+            return redirect(url_for('main.hr_dashboard'))
         else:
-            return redirect(url_for('candidate_dashboard'))
+            return redirect(url_for('main.candidate_dashboard'))
     return render_template('role_selection.html')
 
-@app.route('/login/<role>', methods=['GET', 'POST'])
+@bp.route('/login/<role>', methods=['GET', 'POST'])
 def login(role):
     if request.method == 'POST':
         username = request.form.get('username')
@@ -185,12 +1085,13 @@ def login(role):
         
         if user and check_password_hash(user.password, password):
             session['user_id'] = user.id
+            identity_cache.set(user.id, Identity.from_user(user))
             next_page = request.args.get('next')
             
             if role == 'hr':
-                return redirect(next_page or url_for('hr_dashboard'))
+                return redirect(next_page or url_for('main.hr_dashboard'))
             else:
-                return redirect(next_page or url_for('candidate_dashboard'))
+                return redirect(next_page or url_for('main.candidate_dashboard'))
         else:
             flash('Invalid credentials. Please try again.', 'danger')
     
@@ -199,61 +1100,98 @@ def login(role):
     else:
         return render_template('candidate_login.html', role=role)
 
-@app.route('/hr/dashboard')
+_templates_version = None
+
+def templates_version():
+    """Newest template mtime, so a deploy with changed templates changes every dashboard ETag"""
+    global _templates_version
+    if _templates_version is None:
+        folder = os.path.join(current_app.root_path, current_app.template_folder)
+        _templates_version = max((os.stat(os.path.join(folder, name)).st_mtime for name in os.listdir(folder)), default=0)
+    return _templates_version
+
+def render_with_etag(template, state, **context):
+    """Render a page whose content is fully determined by state, answering 304 when the client has it.
+
+    The ETag is built from state before rendering, so a repeat view costs the
+    queries that produced state and no template work. Pending flash messages
+    are part of it, since they change the page, and always get a full render:
+    only rendering consumes them.
+    """
+    flashes = session.get('_flashes')
+    payload = json.dumps([templates_version(), state, flashes], default=str, sort_keys=True)
+    etag = content_hash(payload.encode('utf-8'))
+    if not flashes and request.if_none_match.contains(etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = make_response(render_template(template, **context))
+    response.set_etag(etag)
+    # Per-user pages: browsers may keep them but must revalidate each time
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+@bp.route('/hr/dashboard')
 @login_required(role='hr')
 def hr_dashboard():
-    # Load resume database for HR view
-    resume_db_path = os.path.join(app.config['UPLOAD_FOLDER'], 'resume_database.json')
-    resume_database = []
-    if os.path.exists(resume_db_path):
-        try:
-            with open(resume_db_path, 'r') as f:
-                resume_database = json.load(f)
-        except Exception:
-            resume_database = []
-
-    # Add default score if not present
-    for app in resume_database:
-        if 'score' not in app:
-            app['score'] = 0  # Default score if not present
-
-    # Sort by date added (desc) if present
-    def _parse_date(entry):
-        try:
-            return datetime.fromisoformat(entry.get('appliedDate') or entry.get('dateAdded', ''))
-        except Exception:
-            return datetime.min
-
-    recent_applications = sorted(resume_database, key=_parse_date, reverse=True)[:20]
+    # Most recent applications straight from the applied_date index
+    records = ResumeRecord.query.order_by(ResumeRecord.applied_date.desc()).limit(20).all()
+    recent_applications = [record.to_dict() for record in records]
+    top_candidates = top_candidates_by_job()
+    jobs = get_active_jobs()
+    
+    return render_with_etag('index.html', [get_current_identity(), recent_applications, top_candidates, jobs],
+                            recent_applications=recent_applications,
+                            top_candidates=top_candidates,
+                            jobs=jobs,
+                            score_num=0)  # Default score for the template
 
-    return render_template('index.html', 
-                         recent_applications=recent_applications,
-                         score_num=0)  # Default score for the template
+@bp.route('/hr/jobs/<int:job_id>/candidates')
+@login_required(role='hr')
+def job_candidates(job_id):
+    job = Job.query.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 500)
+    
+    # Served from the precomputed match table via its (job_id, score) index
+    rows = db.session.query(JobMatch, User.name, User.email).join(User, User.id == JobMatch.candidate_id).filter(
+        JobMatch.job_id == job.id
+    ).order_by(JobMatch.score.desc(), JobMatch.application_id).limit(limit).all()
+    return jsonify({
+        'job_id': job.id,
+        'title': job.title,
+        'skills': get_job_skills(job.id),
+        'candidates': [
+            {
+                'application_id': match.application_id,
+                'candidate_id': match.candidate_id,
+                'name': name,
+                'email': email,
+                'score': match.score
+            }
+            for match, name, email in rows
+        ]
+    })
 
-@app.route('/candidate/dashboard')
+@bp.route('/candidate/dashboard')
 @login_required(role='candidate')
 def candidate_dashboard():
-    user = User.query.get(session['user_id'])
-    
-    # Load resume database
-    resume_db_path = os.path.join(app.config['UPLOAD_FOLDER'], 'resume_database.json')
-    resume_database = []
-    if os.path.exists(resume_db_path):
-        with open(resume_db_path, 'r') as f:
-            resume_database = json.load(f)
+    user = get_current_identity()
     
-    # Filter applications for current user
-    user_applications = [app for app in resume_database if app.get('email') == user.email]
+    # The user's own applications from the (candidate_id, applied_date) index, with their jobs in the same query
+    applications = Application.query.options(joinedload(Application.job)).filter_by(
+        candidate_id=user.id
+    ).order_by(Application.applied_date).all()
+    user_applications = [application.to_dict() for application in applications]
     
-    # Get available jobs
-    available_jobs = Job.query.filter_by(is_active=True).all()
+    available_jobs = get_active_jobs()
     
-    return render_template('candidate_dashboard.html', 
-                         current_user=user,
-                         applications=user_applications,
-                         available_jobs=available_jobs)
+    return render_with_etag('candidate_dashboard.html', [user, user_applications, available_jobs],
+                            current_user=user,
+                            applications=user_applications,
+                            available_jobs=available_jobs)
 
-@app.route('/candidate/apply', methods=['POST'])
+@bp.route('/candidate/apply', methods=['POST'])
 @login_required(role='candidate')
 def submit_application():
     if 'resume' not in request.files:
@@ -271,13 +1209,14 @@ def submit_application():
         job = Job.query.get(job_id)
         if not job:
             flash('Invalid job selected', 'danger')
-            return redirect(url_for('candidate_dashboard'))
+            return redirect(url_for('main.candidate_dashboard'))
         
         # Save the resume file
         filename = secure_filename(f"{session['user_id']}_{int(datetime.now().timestamp())}_{resume.filename}")
-        resume_path = os.path.join(app.config['UPLOAD_FOLDER'], 'resumes', filename)
+        resume_path = os.path.join(current_app.config['UPLOAD_FOLDER'], 'resumes', filename)
         os.makedirs(os.path.dirname(resume_path), exist_ok=True)
         resume.save(resume_path)
+        warm_text_cache(resume_path)
         
         # Create application record in database
         application = Application(
@@ -288,78 +1227,101 @@ def submit_application():
             status='Pending'
         )
         db.session.add(application)
-        db.session.commit()
+        db.session.flush()
         
-        # Also add to resume database
-        resume_db_path = os.path.join(app.config['UPLOAD_FOLDER'], 'resume_database.json')
-        resume_data = {
-            'id': str(uuid.uuid4()),
-            'name': request.form.get('full_name', ''),
-            'email': request.form.get('email', ''),
-            'phone': request.form.get('phone', ''),
-            'position': job.title,
-            'company': job.company,
-            'dateAdded': datetime.now().strftime('%Y-%m-%d'),
-            'status': 'New',
-            'source': 'Portal',
-            'fileName': filename,
-            'filePath': resume_path,
-            'applicationId': application.id,
-            'appliedDate': datetime.now().isoformat(),
-            'jobId': job_id
-        }
-        
-        # Load existing data and append new entry
-        existing_data = []
-        if os.path.exists(resume_db_path):
-            with open(resume_db_path, 'r') as f:
-                existing_data = json.load(f)
-        
-        existing_data.append(resume_data)
-        
-        # Save back to file
-        with open(resume_db_path, 'w') as f:
-            json.dump(existing_data, f, indent=2)
+        # Also add to resume database, in the same transaction
+        now = datetime.now()
+        db.session.add(ResumeRecord(
+            name=request.form.get('full_name', ''),
+            email=request.form.get('email', ''),
+            phone=request.form.get('phone', ''),
+            position=job.title,
+            company=job.company,
+            date_added=now.strftime('%Y-%m-%d'),
+            status='New',
+            source='Portal',
+            file_name=filename,
+            file_path=resume_path,
+            application_id=application.id,
+            applied_date=now,
+            job_id=job.id
+        ))
+        # Skills are extracted once here and the job's ranking updated in place
+        index_application(application)
+        db.session.commit()
         
         flash('Application submitted successfully!', 'success')
-        return redirect(url_for('candidate_dashboard'))
+        return redirect(url_for('main.candidate_dashboard'))
     
     flash('Error processing your application', 'danger')
-    return redirect(url_for('candidate_dashboard'))
+    return redirect(url_for('main.candidate_dashboard'))
 
-@app.route('/candidate/upload-resume', methods=['POST'])
+@bp.route('/candidate/upload-resume', methods=['POST'])
 @login_required(role='candidate')
 def upload_resume():
     if 'resume' not in request.files:
         flash('No file uploaded', 'danger')
-        return redirect(url_for('candidate_dashboard'))
+        return redirect(url_for('main.candidate_dashboard'))
     
     resume = request.files['resume']
     if resume.filename == '':
         flash('No selected file', 'danger')
-        return redirect(url_for('candidate_dashboard'))
+        return redirect(url_for('main.candidate_dashboard'))
     
     if resume:
         # Save the resume file
         filename = secure_filename(f"{session['user_id']}_{int(datetime.now().timestamp())}_{resume.filename}")
-        resume_path = os.path.join(app.config['UPLOAD_FOLDER'], 'resumes', filename)
+        resume_path = os.path.join(current_app.config['UPLOAD_FOLDER'], 'resumes', filename)
         os.makedirs(os.path.dirname(resume_path), exist_ok=True)
         resume.save(resume_path)
+        warm_text_cache(resume_path)
         
         # Update user's resume path (or create a new resume record)
         # This is a simplified example - you might want to create a separate Resume model
         
         flash('Resume uploaded successfully!', 'success')
     
-    return redirect(url_for('candidate_dashboard'))
+    return redirect(url_for('main.candidate_dashboard'))
 
-@app.route('/logout')
+@bp.route('/hr/resumes/import', methods=['POST'])
+@login_required(role='hr')
+def bulk_import_resumes():
+    # Any mix of resume files and zip archives under the 'resumes' field
+    uploads = [f for f in request.files.getlist('resumes') if f.filename]
+    if not uploads:
+        return jsonify({'error': 'No files uploaded'}), 400
+    
+    job = None
+    if request.form.get('job_id'):
+        job = Job.query.get(request.form.get('job_id', type=int))
+        if not job:
+            return jsonify({'error': 'Invalid job selected'}), 400
+    
+    summary = import_resumes(uploads, os.path.join(current_app.config['UPLOAD_FOLDER'], 'resumes'), job)
+    return jsonify(dict(summary, message=f"Imported {summary['imported']} resumes", job_id=job.id if job else None))
+
+@bp.route('/hr/drive/sync', methods=['POST'])
+@login_required(role='hr')
+def drive_sync():
+    folder_id = request.form.get('folder_id')
+    if not folder_id:
+        return jsonify({'error': 'No Drive folder given'}), 400
+    
+    try:
+        summary = sync_drive_folder(folder_id)
+    except Exception as e:
+        return jsonify({'error': f'Error syncing Drive folder: {str(e)}'}), 500
+    return jsonify(dict(summary, message=f"Imported {summary['imported']} resumes from Google Drive", folder_id=folder_id))
+
+@bp.route('/logout')
 def logout():
-    session.pop('user_id', None)
-    return redirect(url_for('role_selection'))
+    user_id = session.pop('user_id', None)
+    if user_id is not None:
+        identity_cache.invalidate(user_id)
+    return redirect(url_for('main.role_selection'))
 
-@app.route('/upload_jd', methods=['POST'])
-@login_required
+@bp.route('/upload_jd', methods=['POST'])
+@login_required(role='hr')
 def upload_jd():
     if 'job_description' not in request.files:
         return jsonify({'error': 'No file part'}), 400
@@ -367,115 +1329,377 @@ def upload_jd():
     file = request.files['job_description']
     if file.filename == '':
         return jsonify({'error': 'No selected file'}), 400
+    if not file.filename.lower().endswith(supported_extensions()):
+        return jsonify({'error': 'Please upload a PDF or Word document'}), 400
     
-    if file:
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], 'jd.pdf')
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        file.save(filepath)
-        return jsonify({'message': 'Job description uploaded successfully'})
+    job = Job.query.get(request.form.get('job_id', type=int))
+    if not job:
+        return jsonify({'error': 'Please select the job this description is for'}), 400
+    
+    try:
+        jd = save_job_description(job, file, session['user_id'])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({
+        'message': 'Job description uploaded successfully',
+        'job_id': job.id,
+        'file_name': jd.file_name,
+        'keywords': len(jd.keywords())
+    })
 
-@app.route('/screen_resumes', methods=['POST'])
+@bp.route('/screen_resumes', methods=['POST'])
 @login_required(role='hr')
 def screen_resumes():
     try:
-        # Get job description
-        jd_path = os.path.join(app.config['UPLOAD_FOLDER'], 'jd.pdf')
-        if not os.path.exists(jd_path):
+        # Stored JD text and tokens; no file is parsed here
+        jd = screening_jd(session['user_id'])
+        if jd is None:
             return jsonify({'error': 'Please upload a job description first'}), 400
-            
-        with open(jd_path, 'rb') as jd_file:
-            job_description = extract_text_from_pdf(jd_file)
         
         # Get resumes from uploads folder
-        resumes_dir = os.path.join(app.config['UPLOAD_FOLDER'], 'resumes')
+        resumes_dir = os.path.join(current_app.config['UPLOAD_FOLDER'], 'resumes')
         if not os.path.exists(resumes_dir):
             return jsonify({'error': 'No resumes found. Please upload some resumes first.'}), 400
             
         # Get list of resume files
-        resume_files = [f for f in os.listdir(resumes_dir) if f.lower().endswith(('.pdf', '.doc', '.docx'))]
+        resume_files = list_resume_files(resumes_dir)
         
         if not resume_files:
             return jsonify({'error': 'No valid resume files found. Please upload PDF or Word documents.'}), 400
         
-        # Process each resume
-        results = []
-        for resume_file in resume_files:
-            try:
-                resume_path = os.path.join(resumes_dir, resume_file)
-                with open(resume_path, 'rb') as f:
-                    resume_text = extract_text_from_pdf(f) if resume_file.lower().endswith('.pdf') else ""
-                    # For non-PDF files, you might want to add text extraction for .doc/.docx
-                    if not resume_text and resume_file.lower().endswith(('.doc', '.docx')):
-                        resume_text = f"[Content from {resume_file} - text extraction for .doc/.docx not implemented]"
-                    
-                    # Simple scoring based on keyword matching
-                    score = screen_resume(resume_text, job_description)
-                    
-                    # Get candidate info from filename or database
-                    # For now, we'll use the filename
-                    candidate_name = ' '.join(resume_file.split('_')[:-2])  # Remove timestamp and extension
-                    
-                    results.append({
-                        'name': candidate_name,
-                        'email': f"{candidate_name.replace(' ', '.').lower()}@example.com",
-                        'score': score,
-                        'status': 'Pending Review',
-                        'resume': resume_file
-                    })
-            except Exception as e:
-                print(f"Error processing {resume_file}: {str(e)}")
-                continue
-        
-        # Sort results by score (highest first)
-        results.sort(key=lambda x: x['score'], reverse=True)
-        
-        # Save results to session for download
-        session['screening_results'] = results
-        
-        # Save to Excel
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Screened Candidates"
+        scoring_mode = request.form.get('mode', 'percentage')
+        if scoring_mode not in SCORING_MODES:
+            return jsonify({'error': f'Unknown scoring mode: {scoring_mode}'}), 400
         
-        # Add headers
-        headers = ['Name', 'Email', 'Score (%)']
-        for col_num, header in enumerate(headers, 1):
-            ws.cell(row=1, column=col_num, value=header)
+        # Each worker is a process, so a request may not ask for more than the configured maximum
+        workers = request.form.get('workers', current_app.config['SCREENING_WORKERS'], type=int)
+        workers = min(max(workers, 0), current_app.config['SCREENING_MAX_WORKERS'])
+        results, throughput = run_screening(
+            jd.keywords(), resumes_dir, resume_files, scoring_mode, workers, job_id=jd.job_id
+        )
         
-        # Add data
-        for row_num, result in enumerate(results, 2):
-            ws.cell(row=row_num, column=1, value=result['name'])
-            ws.cell(row=row_num, column=2, value=result['email'])
-            ws.cell(row=row_num, column=3, value=result['score'])
+        # Record the run so its export isn't overwritten by other HR users' runs
+        now = datetime.utcnow()
+        run = ScreeningJob(
+            created_by=session['user_id'],
+            status='completed',
+            mode=scoring_mode,
+            job_description=jd.text,
+            total=len(resume_files),
+            processed=len(resume_files),
+            files_per_second=throughput['files_per_second'],
+            started_at=now,
+            finished_at=now
+        )
+        db.session.add(run)
+        db.session.flush()
+        save_screening_results(run.id, results)
+        db.session.commit()
+        # Only the run id goes in the cookie session; results stay server-side
+        session['screening_job_id'] = run.id
         
-        # Save the workbook
-        excel_path = os.path.join(app.config['UPLOAD_FOLDER'], 'screened_candidates.xlsx')
-        wb.save(excel_path)
+        top_k = request.form.get('top_k', current_app.config['SCREENING_TOP_K'], type=int)
         
         return jsonify({
             'message': f'Successfully screened {len(results)} resumes',
-            'results': results,
-            'excel_path': excel_path
+            'results': rank_top_k(results, max(top_k, 0)),
+            'total': len(results),
+            'job_id': run.id,
+            'jd_job_id': jd.job_id,
+            'results_url': url_for('main.screening_job_results', job_id=run.id),
+            'download_url': url_for('main.download_results', job_id=run.id),
+            'cache': text_cache.stats(),
+            'throughput': throughput
         })
         
     except Exception as e:
         return jsonify({'error': f'Error screening resumes: {str(e)}'}), 500
 
-@app.route('/download_results')
+@bp.route('/screening/jobs', methods=['POST'])
+@login_required(role='hr')
+def submit_screening_job():
+    jd = screening_jd(session['user_id'])
+    if jd is None:
+        return jsonify({'error': 'Please upload a job description first'}), 400
+    
+    scoring_mode = request.form.get('mode', 'percentage')
+    if scoring_mode not in SCORING_MODES:
+        return jsonify({'error': f'Unknown scoring mode: {scoring_mode}'}), 400
+    
+    # Start the worker pool (and recover old jobs) before queueing this one
+    executor = get_screening_executor()
+    
+    # Snapshot the JD text so later uploads don't change a queued job
+    job = ScreeningJob(
+        created_by=session['user_id'],
+        mode=scoring_mode,
+        job_description=jd.text
+    )
+    db.session.add(job)
+    db.session.commit()
+    
+    executor.submit(run_screening_job, current_app._get_current_object(), job.id)
+    
+    return jsonify({
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': url_for('main.screening_job_status', job_id=job.id),
+        'results_url': url_for('main.screening_job_results', job_id=job.id)
+    }), 202
+
+@bp.route('/screening/jobs/<job_id>')
+@login_required(role='hr')
+def screening_job_status(job_id):
+    get_screening_executor()
+    job = ScreeningJob.query.get(job_id)
+    if not job:
+        return jsonify({'error': 'Screening job not found'}), 404
+    return jsonify(job.to_dict())
+
+@bp.route('/screening/jobs/<job_id>/results')
+@login_required(role='hr')
+def screening_job_results(job_id):
+    job = ScreeningJob.query.get(job_id)
+    if not job:
+        return jsonify({'error': 'Screening job not found'}), 404
+    if job.status != 'completed':
+        return jsonify({'error': f'Screening job is {job.status}', 'job': job.to_dict()}), 409
+    
+    per_page = min(max(request.args.get('per_page', current_app.config['SCREENING_RESULTS_PER_PAGE'], type=int), 1), 500)
+    query = ScreeningResult.query.filter_by(job_id=job.id)
+    
+    min_score = request.args.get('min_score', type=float)
+    if min_score is not None:
+        query = query.filter(ScreeningResult.score >= min_score)
+    
+    # Keyset pagination: resume after the last (score, id) of the previous page
+    cursor = request.args.get('cursor')
+    page = None
+    if cursor:
+        try:
+            last_score, last_id = decode_results_cursor(cursor)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        query = query.filter(db.or_(
+            ScreeningResult.score < last_score,
+            db.and_(ScreeningResult.score == last_score, ScreeningResult.id > last_id)
+        ))
+    
+    query = query.order_by(ScreeningResult.score.desc(), ScreeningResult.id)
+    if not cursor and 'page' in request.args:
+        page = max(request.args.get('page', 1, type=int), 1)
+        query = query.offset((page - 1) * per_page)
+    results = query.limit(per_page + 1).all()
+    
+    has_next = len(results) > per_page
+    results = results[:per_page]
+    return jsonify({
+        'job': job.to_dict(),
+        'page': page,
+        'per_page': per_page,
+        'has_next': has_next,
+        'next_cursor': encode_results_cursor(results[-1]) if has_next else None,
+        'results': [result.to_dict() for result in results]
+    })
+
+@bp.route('/screening/jobs/<job_id>/jira', methods=['POST'])
+@login_required(role='hr')
+def create_shortlist_tickets(job_id):
+    # One interview ticket per shortlisted candidate, sent in the background
+    job = ScreeningJob.query.get(job_id)
+    if not job:
+        return jsonify({'error': 'Screening job not found'}), 404
+    if job.status != 'completed':
+        return jsonify({'error': f'Screening job is {job.status}', 'job': job.to_dict()}), 409
+    
+    project_key = request.form.get('project_key') or current_app.config['JIRA_PROJECT_KEY']
+    if not project_key:
+        return jsonify({'error': 'No Jira project configured'}), 400
+    min_score = request.form.get('min_score', current_app.config['JIRA_SHORTLIST_SCORE'], type=float)
+    
+    shortlist = ScreeningResult.query.filter(
+        ScreeningResult.job_id == job.id,
+        ScreeningResult.score >= min_score
+    ).order_by(ScreeningResult.score.desc(), ScreeningResult.id).all()
+    
+    outbox = get_jira_outbox()
+    outbox_ids = [
+        outbox.enqueue_create(issue_fields(
+            project_key,
+            f"Interview {result.name} ({result.score:g})",
+            f"Shortlisted by screening run {job.id}.\nEmail: {result.email}\nResume: {result.resume}"
+        ))
+        for result in shortlist
+    ]
+    return jsonify({
+        'message': f'Queued {len(outbox_ids)} Jira tickets',
+        'queued': len(outbox_ids),
+        'outbox_ids': outbox_ids,
+        'status_url': url_for('main.jira_outbox_status')
+    }), 202
+
+@bp.route('/jira/issues/<issue_key>', methods=['POST'])
+@login_required(role='hr')
+def queue_jira_update(issue_key):
+    fields = (request.get_json(silent=True) or {}).get('fields')
+    if not fields or not isinstance(fields, dict):
+        return jsonify({'error': 'No fields to update'}), 400
+    outbox_id = get_jira_outbox().enqueue_update(issue_key, fields)
+    return jsonify({'message': f'Queued update for {issue_key}', 'outbox_id': outbox_id}), 202
+
+@bp.route('/jira/outbox')
+@login_required(role='hr')
+def jira_outbox_status():
+    outbox_id = request.args.get('id', type=int)
+    if outbox_id is not None:
+        entry = jira_outbox.get(outbox_id)
+        if entry is None:
+            return jsonify({'error': 'Unknown outbox entry'}), 404
+        return jsonify(entry)
+    return jsonify(jira_outbox.stats())
+
+def encode_results_cursor(result):
+    return base64.urlsafe_b64encode(json.dumps([result.score, result.id]).encode()).decode()
+
+def decode_results_cursor(cursor):
+    try:
+        score, result_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(score), int(result_id)
+    except Exception:
+        raise ValueError(f'Invalid cursor: {cursor}')
+
+@bp.route('/download_results')
 @login_required(role='hr')
 def download_results():
-    excel_path = os.path.join(app.config['UPLOAD_FOLDER'], 'screened_candidates.xlsx')
-    if not os.path.exists(excel_path):
+    # Export a specific run, defaulting to this user's latest synchronous run
+    job_id = request.args.get('job_id') or session.get('screening_job_id')
+    job = ScreeningJob.query.get(job_id) if job_id else None
+    if not job or job.status != 'completed':
         return jsonify({'error': 'No results available'}), 404
     
+    export_format = request.args.get('format', 'xlsx')
+    if export_format not in ('xlsx', 'csv'):
+        return jsonify({'error': f'Unsupported export format: {export_format}'}), 400
+    
+    # Rows are read from the database in batches, never all at once
+    results = (
+        result.to_dict() for result in ScreeningResult.query.filter_by(job_id=job.id)
+        .order_by(ScreeningResult.score.desc(), ScreeningResult.id)
+        .yield_per(1000)
+    )
+    download_name = f'screened_candidates_{job.id}.{export_format}'
+    
+    if export_format == 'csv':
+        return Response(
+            stream_with_context(iter_csv(results)),
+            mimetype='text/csv',
+            headers={'Content-Disposition': f'attachment; filename={download_name}'}
+        )
+    
+    # .xlsx is a zip archive, so it is built in an anonymous temp file that
+    # disappears once the response closes it
+    excel_file = tempfile.TemporaryFile(suffix='.xlsx')
+    try:
+        write_xlsx(results, excel_file)
+    except Exception:
+        excel_file.close()
+        raise
+    excel_file.seek(0)
     return send_file(
-        excel_path,
+        excel_file,
         as_attachment=True,
-        download_name='screened_candidates.xlsx',
+        download_name=download_name,
         mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
     )
 
+def create_app(config=None):
+    """Build the Flask app; config overrides the defaults below.
+
+    Only cheap setup happens here. Tables and demo data are created by
+    `flask --app app init-db`, and the PDF, Excel, Drive and Jira libraries
+    are imported on first use.
+    """
+    global text_cache, jira_outbox
+    
+    app = AppFlask(__name__)
+    app.config['UPLOAD_FOLDER'] = 'uploads'
+    app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+    app.config['BULK_IMPORT_MAX_CONTENT_LENGTH'] = 1024 * 1024 * 1024  # 1GB per bulk import request
+    app.config['BULK_IMPORT_MAX_FILE_BYTES'] = 16 * 1024 * 1024  # per resume, after unzipping
+    app.config['BULK_IMPORT_BATCH_SIZE'] = 500  # records inserted per transaction
+    app.config['DRIVE_SYNC_WORKERS'] = 4  # concurrent Google Drive downloads
+    app.config['DRIVE_PAGE_SIZE'] = 100  # files per Drive list call
+    app.config['DRIVE_DOWNLOAD_RETRIES'] = 3  # retries per chunk on rate limits and server errors
+    app.config['JIRA_PROJECT_KEY'] = os.environ.get('JIRA_PROJECT_KEY')
+    app.config['JIRA_SHORTLIST_SCORE'] = 70  # minimum screening score that gets an interview ticket
+    app.secret_key = 'your-secret-key-here'  # Change this in production
+    app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL', 'sqlite:///recruitment.db')
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['TEXT_CACHE_MAX_BYTES'] = 256 * 1024 * 1024  # 256MB of extracted text
+    app.config['PDF_MAX_PAGES'] = 10  # pages read per PDF; None reads every page
+    app.config['PDF_MAX_CHARS'] = 100000  # characters kept per PDF; None keeps all
+    app.config['SCREENING_WORKERS'] = 0  # >1 extracts resumes across a process pool
+    app.config['SCREENING_MAX_WORKERS'] = os.cpu_count() or 1  # upper bound for a request's 'workers'
+    app.config['SCREENING_CHUNK_SIZE'] = 32
+    app.config['SCREENING_FILE_TIMEOUT'] = 60  # seconds per resume in parallel mode
+    app.config['SCREENING_JOB_WORKERS'] = 2  # background screening jobs run concurrently
+    app.config['SCREENING_RESULTS_PER_PAGE'] = 50
+    app.config['SCREENING_TOP_K'] = 50  # results returned inline by /screen_resumes
+    app.config['METRICS_ENABLED'] = os.environ.get('METRICS_ENABLED', '').lower() in ('1', 'true', 'yes')
+    app.config['PROFILING_ENABLED'] = os.environ.get('PROFILING_ENABLED', '').lower() in ('1', 'true', 'yes')
+    app.config['PROFILE_DIR'] = 'profiles'  # cProfile dumps for requests sent with X-Profile
+    app.config['PROFILING_TOKEN'] = os.environ.get('PROFILING_TOKEN')  # the X-Profile value that turns profiling on
+    app.config['METRICS_TOKEN'] = os.environ.get('METRICS_TOKEN')  # bearer token for /metrics; unset serves localhost only
+    # Seconds a cached user role/email stays valid. A change is seen at once by
+    # the worker process that made it; other workers keep the old role for up
+    # to this long, so it is kept short. 0 reads the user on every request.
+    app.config['IDENTITY_CACHE_TTL'] = 30
+    app.config['ACTIVE_JOBS_CACHE_TTL'] = 60  # seconds before other workers see a job change
+    app.config['SCREENING_JOB_HEARTBEAT'] = 5  # seconds between progress commits of a running job
+    # Seconds without a heartbeat before another worker takes over a running job;
+    # above SCREENING_FILE_TIMEOUT, since a slow file delays the next heartbeat
+    app.config['SCREENING_JOB_STALE_AFTER'] = 120
+    app.config['SQLITE_PRAGMAS'] = {
+        'journal_mode': 'WAL',  # readers and the writer don't block each other
+        'synchronous': 'NORMAL',  # durable with WAL; fsync only at checkpoints
+        'busy_timeout': 5000,  # ms to wait for a write lock instead of failing with "database is locked"
+        'cache_size': -16000,  # KiB of page cache per connection
+        'temp_store': 'MEMORY',
+    }
+    app.config['DB_POOL_SIZE'] = 10  # connections per process; keep at least the WSGI threads per worker
+    app.config['DB_MAX_OVERFLOW'] = 10
+    app.config['DB_POOL_TIMEOUT'] = 30  # seconds a request waits for a free connection
+    app.config['STATIC_MAX_AGE'] = 365 * 24 * 3600  # seconds browsers keep versioned static files
+    # FLASK_* environment variables, e.g. FLASK_SQLALCHEMY_DATABASE_URI for the WSGI entry point
+    app.config.from_prefixed_env()
+    app.config.update(config or {})
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config))
+    # Files kept next to the uploads unless configured elsewhere
+    app.config.setdefault('TEXT_CACHE_PATH', os.path.join(app.config['UPLOAD_FOLDER'], 'text_cache.db'))
+    app.config.setdefault('JIRA_OUTBOX_PATH', os.path.join(app.config['UPLOAD_FOLDER'], 'jira_outbox.db'))
+    
+    db.init_app(app)
+    with app.app_context():
+        set_sqlite_pragmas(db.engine, app.config['SQLITE_PRAGMAS'])
+    csrf.init_app(app)
+    app.register_blueprint(bp)
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(rebuild_matches_command)
+    
+    # Opt-in request timing, SQL timing and /metrics (no-op unless METRICS_ENABLED)
+    instrumentation.init_app(app, db)
+    
+    identity_cache.ttl = app.config['IDENTITY_CACHE_TTL']
+    active_jobs_cache.ttl = app.config['ACTIVE_JOBS_CACHE_TTL']
+    # Both open their SQLite files lazily, on first use
+    text_cache = TextCache(app.config['TEXT_CACHE_PATH'], max_bytes=app.config['TEXT_CACHE_MAX_BYTES'])
+    jira_outbox = JiraOutbox(app.config['JIRA_OUTBOX_PATH'], JiraClient)
+    return app
+
 if __name__ == '__main__':
+    # Development server; production runs wsgi:app under gunicorn (see gunicorn.conf.py)
+    app = create_app()
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+    with app.app_context():
+        init_db()
     app.run(debug=True)
@@ -0,0 +1,384 @@
+"""Reproducible benchmarks for extraction, scoring and the screening endpoints.
+
+Generates synthetic PDF/DOCX/DOC resumes and a JD for each corpus size, then reports
+throughput, p50/p99 latency and peak RSS as JSON so runs can be compared:
+
+    python benchmarks.py --sizes 100 1000 --output bench.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import random
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime, timedelta
+
+SKILLS = [
+    'python', 'flask', 'django', 'sql', 'postgresql', 'docker', 'kubernetes', 'aws',
+    'java', 'spring', 'react', 'typescript', 'go', 'rust', 'terraform', 'linux',
+    'pandas', 'spark', 'airflow', 'kafka', 'redis', 'graphql', 'ci/cd', 'agile',
+]
+FILLER = [
+    'experience', 'team', 'project', 'delivered', 'built', 'led', 'designed', 'years',
+    'with', 'and', 'the', 'in', 'of', 'for', 'production', 'services', 'platform',
+]
+FIRST_NAMES = ['alex', 'sam', 'priya', 'chen', 'maria', 'omar', 'lena', 'kofi', 'yuki', 'ravi']
+LAST_NAMES = ['smith', 'garcia', 'khan', 'li', 'novak', 'okafor', 'silva', 'tanaka', 'patel', 'berg']
+
+
+def make_pdf(lines, lines_per_page=45):
+    """Build a minimal multi-page PDF with one Helvetica text line per entry"""
+    lines = list(lines) or ['']
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+    font_number = 3 + 2 * len(pages)
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            ' '.join(f'{3 + 2 * i} 0 R' for i in range(len(pages))), len(pages)),
+    ]
+    for i, page in enumerate(pages):
+        escaped = [line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') for line in page]
+        content = "BT /F1 11 Tf 14 TL 72 750 Td " + ' '.join(f"({line}) '" for line in escaped) + " ET"
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 {font_number} 0 R >> >> /Contents {4 + 2 * i} 0 R >>"
+        )
+        objects.append(f"<< /Length {len(content)} >>\nstream\n{content}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode('latin-1')
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return out
+
+
+def make_docx(lines):
+    """Build a minimal .docx with one paragraph per line"""
+    from xml.sax.saxutils import escape
+
+    body = ''.join(f'<w:p><w:r><w:t xml:space="preserve">{escape(line)}</w:t></w:r></w:p>' for line in lines)
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{body}</w:body></w:document>'
+    )
+    content_types = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/word/document.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+        '</Types>'
+    )
+    rels = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="word/document.xml"/></Relationships>'
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', content_types)
+        archive.writestr('_rels/.rels', rels)
+        archive.writestr('word/document.xml', document)
+    return buffer.getvalue()
+
+
+def make_doc(lines):
+    """Approximate a Word 97-2003 file: OLE header, binary tables and UTF-16LE body text"""
+    rng = random.Random(len(lines))
+    header = bytes.fromhex('d0cf11e0a1b11ae1') + bytes(504)
+    binary = bytes(rng.randrange(0, 32) for _ in range(2048))
+    body = '\r'.join(lines).encode('utf-16-le')
+    fonts = 'Times New Roman'.encode('utf-16-le') + bytes(8) + b'Normal' + bytes(8)
+    return header + binary + body + bytes(64) + fonts + binary
+
+
+DOCUMENT_BUILDERS = {'.pdf': make_pdf, '.docx': make_docx, '.doc': make_doc}
+
+
+def synthetic_lines(rng, n_words, words_per_line=10, skill_ratio=0.3):
+    """Random resume/JD text as a list of lines"""
+    words = [
+        rng.choice(SKILLS) if rng.random() < skill_ratio else rng.choice(FILLER)
+        for _ in range(n_words)
+    ]
+    return [' '.join(words[i:i + words_per_line]) for i in range(0, len(words), words_per_line)]
+
+
+def generate_corpus(directory, size, seed=0, min_words=150, max_words=600, extension='.pdf'):
+    """Write size synthetic resumes named like portal uploads; returns their paths"""
+    build = DOCUMENT_BUILDERS[extension]
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for i in range(size):
+        name = f'{rng.choice(FIRST_NAMES)}_{rng.choice(LAST_NAMES)}_{1700000000 + i}_resume{extension}'
+        path = os.path.join(directory, name)
+        with open(path, 'wb') as f:
+            f.write(build(synthetic_lines(rng, rng.randint(min_words, max_words))))
+        paths.append(path)
+    return paths
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(int(round(pct / 100 * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def peak_rss_kb():
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return usage // 1024 if sys.platform == 'darwin' else usage
+
+
+def summarize(benchmark, size, latencies, elapsed, items=None):
+    """One result row: throughput, p50/p99 latency (ms) and peak RSS so far"""
+    items = len(latencies) if items is None else items
+    return {
+        'benchmark': benchmark,
+        'corpus_size': size,
+        'operations': len(latencies),
+        'items': items,
+        'seconds': round(elapsed, 4),
+        'throughput_per_s': round(items / elapsed, 2) if elapsed else None,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3) if latencies else None,
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3) if latencies else None,
+        'peak_rss_kb': peak_rss_kb(),
+    }
+
+
+def timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def bench_extraction(paths, size):
+    """Time the registered extractor for each file; all paths share one file type"""
+    from extraction import get_extractor
+
+    extractor = get_extractor(paths[0])
+    texts = []
+    latencies = []
+    started = time.perf_counter()
+    for path in paths:
+        with open(path, 'rb') as f:
+            text, elapsed = timed(extractor.extract_text, f)
+        latencies.append(elapsed)
+        texts.append(text)
+    return texts, summarize(f'extract_text_from_{extractor.name}', size, latencies, time.perf_counter() - started)
+
+
+def bench_scoring(texts, job_description, size):
+    from app import screen_resume
+
+    latencies = []
+    started = time.perf_counter()
+    for text in texts:
+        latencies.append(timed(screen_resume, text, job_description)[1])
+    return summarize('screen_resume', size, latencies, time.perf_counter() - started)
+
+
+def bench_cold_start(repeats=5):
+    """Import the app and build it with create_app in fresh interpreters, as a worker boot does"""
+    script = (
+        'import sys, time; started = time.perf_counter(); sys.path.insert(0, sys.argv[1]); '
+        'import app; app.create_app(); print(time.perf_counter() - started)'
+    )
+    here = os.path.dirname(os.path.abspath(__file__))
+    latencies = []
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory() as cwd:
+        for _ in range(repeats):
+            output = subprocess.run([sys.executable, '-c', script, here], cwd=cwd, check=True,
+                                    capture_output=True, text=True).stdout
+            latencies.append(float(output.strip().splitlines()[-1]))
+    return summarize('app_cold_start', None, latencies, time.perf_counter() - started)
+
+
+def bench_endpoints(app_module, app, upload_folder, size, seed, dashboard_requests, jd_pdf):
+    """A JD upload, full /screen_resumes runs (cold and warm) plus both dashboards, rendered and 304, via the test client"""
+    from text_cache import TextCache
+
+    app.config['UPLOAD_FOLDER'] = upload_folder
+    app_module.text_cache = TextCache(os.path.join(upload_folder, 'text_cache.db'))
+    client = app.test_client()
+    rows = []
+
+    with app.app_context():
+        hr_user = app_module.User.query.filter_by(role='hr').first()
+        candidate = app_module.User.query.filter_by(username='bench_candidate').first()
+        if candidate is None:
+            candidate = app_module.User(
+                username='bench_candidate', email='bench.candidate@example.com',
+                password='-', role='candidate', name='Bench Candidate'
+            )
+            app_module.db.session.add(candidate)
+            app_module.db.session.commit()
+        hr_id, candidate_id, candidate_email = hr_user.id, candidate.id, candidate.email
+        jd_job_id = app_module.Job.query.first().id
+
+        # One resume record per corpus file; a handful belong to the candidate
+        rng = random.Random(seed)
+        now = datetime.utcnow()
+        app_module.db.session.execute(app_module.db.insert(app_module.ResumeRecord), [
+            {
+                'id': f'bench-{size}-{i}',
+                'name': f'Candidate {i}',
+                'email': candidate_email if i % max(size // 5, 1) == 0 else f'c{i}@example.com',
+                'position': 'Engineer',
+                'company': 'Bench Corp',
+                'date_added': (now - timedelta(minutes=i)).strftime('%Y-%m-%d'),
+                'status': 'New',
+                'source': 'Benchmark',
+                'applied_date': now - timedelta(minutes=rng.randint(0, 10 ** 6)),
+                'score': rng.randint(0, 100),
+            }
+            for i in range(size)
+        ])
+        # The candidate dashboard lists the candidate's own applications
+        app_module.db.session.execute(app_module.db.insert(app_module.Application), [
+            {
+                'candidate_id': candidate_id,
+                'job_id': jd_job_id,
+                'resume_path': f'bench-{size}-{i}',
+                'status': 'Pending',
+                'applied_date': now - timedelta(minutes=i),
+            }
+            for i in range(0, size, max(size // 5, 1))
+        ])
+        app_module.db.session.commit()
+
+    with client.session_transaction() as sess:
+        sess['user_id'] = hr_id
+    response, elapsed = timed(client.post, '/upload_jd', data={
+        'job_id': jd_job_id, 'job_description': (io.BytesIO(jd_pdf), 'jd.pdf')
+    })
+    if response.status_code != 200:
+        raise RuntimeError(f'/upload_jd returned {response.status_code}: {response.get_data(as_text=True)[:200]}')
+    rows.append(summarize('upload_jd', size, [elapsed], elapsed, items=1))
+    for label in ('screen_resumes_cold', 'screen_resumes_warm'):
+        response, elapsed = timed(client.post, '/screen_resumes', data={'job_id': jd_job_id})
+        if response.status_code != 200:
+            raise RuntimeError(f'/screen_resumes returned {response.status_code}: {response.get_data(as_text=True)[:200]}')
+        rows.append(summarize(label, size, [elapsed], elapsed, items=size))
+
+    for label, user_id, url in (
+        ('hr_dashboard', hr_id, '/hr/dashboard'),
+        ('candidate_dashboard', candidate_id, '/candidate/dashboard'),
+    ):
+        with client.session_transaction() as sess:
+            sess['user_id'] = user_id
+        # Full renders, then repeat views revalidated with the page's ETag
+        etag = None
+        for suffix, expected in (('', 200), ('_304', 304)):
+            headers = {'If-None-Match': etag} if expected == 304 else {}
+            latencies = []
+            started = time.perf_counter()
+            for _ in range(dashboard_requests):
+                response, elapsed = timed(client.get, url, headers=headers)
+                if response.status_code != expected:
+                    raise RuntimeError(f'{url} returned {response.status_code}')
+                latencies.append(elapsed)
+            etag = response.headers.get('ETag')
+            rows.append(summarize(label + suffix, size, latencies, time.perf_counter() - started))
+    return rows
+
+
+def run(sizes, seed=0, dashboard_requests=50, workdir=None, keep=False, formats=('docx', 'doc')):
+    """Run every benchmark for each corpus size and return the JSON report"""
+    workdir = workdir or tempfile.mkdtemp(prefix='ai-avengers-bench-')
+    import app as app_module
+
+    # Isolated database and uploads
+    app = app_module.create_app({
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(os.path.abspath(workdir), 'bench.db'),
+        'UPLOAD_FOLDER': os.path.join(workdir, 'uploads'),
+        'WTF_CSRF_ENABLED': False,
+    })
+    with app.app_context():
+        app_module.init_db()
+
+    report = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'seed': seed,
+            'sizes': list(sizes),
+            'extra_formats': list(formats),
+        },
+        'results': [bench_cold_start()],
+    }
+    try:
+        for size in sizes:
+            upload_folder = os.path.join(workdir, f'corpus_{size}')
+            rng = random.Random(seed + size)
+            paths = generate_corpus(os.path.join(upload_folder, 'resumes'), size, seed=seed + size)
+            jd_pdf = make_pdf(synthetic_lines(rng, 120, skill_ratio=0.6))
+            job_description = ' '.join(synthetic_lines(rng, 120, skill_ratio=0.6))
+
+            texts, row = bench_extraction(paths, size)
+            report['results'].append(row)
+            report['results'].append(bench_scoring(texts, job_description, size))
+            report['results'].extend(bench_endpoints(app_module, app, upload_folder, size, seed, dashboard_requests, jd_pdf))
+
+            # Extraction throughput for the other registered file types
+            for extension in formats:
+                paths = generate_corpus(
+                    os.path.join(workdir, f'{extension}_{size}'), size, seed=seed + size, extension=f'.{extension}'
+                )
+                report['results'].append(bench_extraction(paths, size)[1])
+    finally:
+        if not keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000],
+                        help='corpus sizes to generate (100 to 50000)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--formats', nargs='*', default=['docx', 'doc'], choices=['docx', 'doc'],
+                        help='extra file types to benchmark extraction for')
+    parser.add_argument('--dashboard-requests', type=int, default=50,
+                        help='requests per dashboard route')
+    parser.add_argument('--workdir', help='directory for generated files (default: temp dir)')
+    parser.add_argument('--keep', action='store_true', help='keep generated files')
+    parser.add_argument('--output', help='write JSON here instead of stdout')
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.seed, args.dashboard_requests, args.workdir, args.keep, args.formats)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
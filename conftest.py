@@ -0,0 +1,93 @@
+import io
+import os
+
+import pytest
+
+import app as app_module
+import instrumentation
+from benchmarks import make_docx
+
+
+@pytest.fixture
+def app_config():
+    """Extra create_app settings; override in a test module to change them"""
+    return {}
+
+
+@pytest.fixture
+def app(tmp_path, app_config):
+    """The app on a scratch SQLite database and uploads folder, seeded by init_db"""
+    flask_app = app_module.create_app(dict({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + str(tmp_path / 'test.db'),
+        'UPLOAD_FOLDER': str(tmp_path / 'uploads'),
+        'WTF_CSRF_ENABLED': False,
+        'SCREENING_JOB_WORKERS': 1,
+    }, **app_config))
+    with flask_app.app_context():
+        app_module.init_db()
+    yield flask_app
+
+    # Process-wide state that would otherwise leak into the next test's app
+    if app_module.screening_executor is not None:
+        app_module.screening_executor.shutdown(wait=True)
+        app_module.screening_executor = None
+    app_module.active_screening_jobs.clear()
+    app_module.identity_cache.clear()
+    app_module.active_jobs_cache.invalidate()
+    app_module.text_cache.close()
+    app_module.jira_outbox.close()
+    instrumentation.enable(False)
+    with flask_app.app_context():
+        app_module.db.engine.dispose()
+
+
+def login(app, client, username):
+    with app.app_context():
+        user_id = app_module.User.query.filter_by(username=username).one().id
+    with client.session_transaction() as sess:
+        sess['user_id'] = user_id
+    return user_id
+
+
+@pytest.fixture
+def hr_client(app):
+    client = app.test_client()
+    login(app, client, 'hr101')
+    return client
+
+
+@pytest.fixture
+def candidate(app):
+    """A candidate account: (client logged in as them, user id)"""
+    with app.app_context():
+        app_module.db.session.add(app_module.User(
+            username='cand1', email='cand1@example.com', password='-', role='candidate', name='Cand One'
+        ))
+        app_module.db.session.commit()
+    client = app.test_client()
+    return client, login(app, client, 'cand1')
+
+
+def job_ids(app):
+    with app.app_context():
+        return [job.id for job in app_module.Job.query.order_by(app_module.Job.id)]
+
+
+def write_resumes(app, texts):
+    """One .docx per text in the uploads resumes folder; returns their paths"""
+    resumes_dir = os.path.join(app.config['UPLOAD_FOLDER'], 'resumes')
+    os.makedirs(resumes_dir, exist_ok=True)
+    paths = []
+    for name, text in texts.items():
+        path = os.path.join(resumes_dir, f'{name}.docx')
+        with open(path, 'wb') as f:
+            f.write(make_docx([text]))
+        paths.append(path)
+    return paths
+
+
+def upload_jd(client, job_id, text, filename='jd.docx'):
+    return client.post('/upload_jd', data={
+        'job_id': job_id, 'job_description': (io.BytesIO(make_docx([text])), filename)
+    })
@@ -0,0 +1,96 @@
+import os
+import threading
+from datetime import datetime, timedelta
+
+SCOPES = ['https://www.googleapis.com/auth/drive.readonly']
+
+
+def _load_credentials(token_path, client_secrets_path, scopes):
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
+    if os.path.exists(token_path):
+        creds = Credentials.from_authorized_user_file(token_path, scopes)
+        if creds.refresh_token or creds.valid:
+            return creds
+    flow = InstalledAppFlow.from_client_secrets_file(client_secrets_path, scopes)
+    creds = flow.run_local_server(port=0)
+    with open(token_path, 'w') as token:
+        token.write(creds.to_json())
+    return creds
+
+
+def _build_drive(creds):
+    from googleapiclient.discovery import build
+
+    # The discovery document ships with the client; the file cache needs oauth2client
+    return build('drive', 'v3', credentials=creds, cache_discovery=False)
+
+
+class DriveServiceFactory:
+    """Process-wide source of Drive services.
+
+    Credentials are read from token.json once and kept in memory; they are
+    refreshed under a lock, only when within refresh_margin of expiry, and
+    the new token is written back. Service objects (and their HTTP
+    connections) are not thread-safe, so one is built per thread and reused
+    until the credentials change. The fast path is a thread-local lookup
+    and an expiry check.
+    """
+
+    def __init__(self, token_path='token.json', client_secrets_path='credentials.json', scopes=SCOPES,
+                 refresh_margin=300, load_credentials=None, build_service=None):
+        self.token_path = token_path
+        self.client_secrets_path = client_secrets_path
+        self.scopes = scopes
+        self.refresh_margin = timedelta(seconds=refresh_margin)
+        self._load_credentials = load_credentials or (
+            lambda: _load_credentials(token_path, client_secrets_path, scopes))
+        self._build_service = build_service or _build_drive
+        self._credentials = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _fresh(self, creds):
+        if creds is None or not creds.token:
+            return False
+        # google-auth keeps expiry as naive UTC; no expiry means the token does not expire
+        return creds.expiry is None or creds.expiry - self.refresh_margin > datetime.utcnow()
+
+    def credentials(self):
+        creds = self._credentials
+        if self._fresh(creds):
+            return creds
+        with self._lock:
+            # Another thread may have refreshed while this one waited
+            creds = self._credentials
+            if self._fresh(creds):
+                return creds
+            if creds is None:
+                creds = self._load_credentials()
+            if not self._fresh(creds) and creds.refresh_token:
+                from google.auth.transport.requests import Request
+
+                creds.refresh(Request())
+                self._save(creds)
+            self._credentials = creds
+            return creds
+
+    def _save(self, creds):
+        if self.token_path and hasattr(creds, 'to_json'):
+            with open(self.token_path, 'w') as token:
+                token.write(creds.to_json())
+
+    def __call__(self):
+        creds = self.credentials()
+        local = self._local
+        if getattr(local, 'credentials', None) is not creds:
+            local.service = self._build_service(creds)
+            local.credentials = creds
+        return local.service
+
+    def reset(self):
+        """Forget cached credentials and services, e.g. after token.json is replaced"""
+        with self._lock:
+            self._credentials = None
+            self._local = threading.local()
@@ -0,0 +1,161 @@
+import hashlib
+import os
+import threading
+import uuid
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from ingestion import UploadTooLarge
+
+FOLDER_MIME_TYPE = 'application/vnd.google-apps.folder'
+GOOGLE_DOC_MIME_TYPE = 'application/vnd.google-apps.document'
+DOCX_MIME_TYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+LIST_FIELDS = 'nextPageToken, files(id, name, mimeType, modifiedTime, size)'
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class DriveDownload(namedtuple('DriveDownload', ['file', 'path', 'digest', 'size', 'error', 'retryable'])):
+    """Outcome of fetching one Drive file; path is a temp file, or None on error"""
+
+
+def _quote(value):
+    return value.replace('\\', '\\\\').replace("'", "\\'")
+
+
+def list_folder_files(service, folder_id, modified_since=None, page_size=100):
+    """Yield metadata for the files in a Drive folder, oldest change first, one API page at a time"""
+    query = f"'{_quote(folder_id)}' in parents and trashed = false and mimeType != '{FOLDER_MIME_TYPE}'"
+    if modified_since:
+        # >= so files sharing the cursor's timestamp are listed again; content dedup drops repeats
+        query += f" and modifiedTime >= '{_quote(modified_since)}'"
+    page_token = None
+    while True:
+        response = service.files().list(
+            q=query,
+            fields=LIST_FIELDS,
+            orderBy='modifiedTime',
+            pageSize=page_size,
+            pageToken=page_token,
+            supportsAllDrives=True,
+            includeItemsFromAllDrives=True
+        ).execute()
+        yield from response.get('files', [])
+        page_token = response.get('nextPageToken')
+        if not page_token:
+            return
+
+
+def local_name(file):
+    """Name to import a Drive file under; Google Docs are exported as .docx"""
+    name = file['name']
+    if file.get('mimeType') == GOOGLE_DOC_MIME_TYPE and not name.lower().endswith('.docx'):
+        name += '.docx'
+    return name
+
+
+class _HashingWriter:
+    # MediaIoBaseDownload target that hashes and size-checks bytes as they arrive
+    def __init__(self, f, max_bytes=None):
+        self.f = f
+        self.max_bytes = max_bytes
+        self.digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+        if self.max_bytes is not None and self.size > self.max_bytes:
+            raise UploadTooLarge(f'larger than {self.max_bytes} bytes')
+        self.digest.update(data)
+        return self.f.write(data)
+
+
+def download_file(service, file, dest_path, chunk_size=DOWNLOAD_CHUNK_SIZE, max_bytes=None, retries=3):
+    """Download one Drive file to dest_path in ranged chunks; returns (sha256 hex digest, size)"""
+    from googleapiclient.http import MediaIoBaseDownload
+
+    if max_bytes is not None and int(file.get('size') or 0) > max_bytes:
+        raise UploadTooLarge(f'larger than {max_bytes} bytes')
+    if file.get('mimeType') == GOOGLE_DOC_MIME_TYPE:
+        request = service.files().export_media(fileId=file['id'], mimeType=DOCX_MIME_TYPE)
+    else:
+        request = service.files().get_media(fileId=file['id'])
+    try:
+        with open(dest_path, 'wb') as f:
+            writer = _HashingWriter(f, max_bytes)
+            downloader = MediaIoBaseDownload(writer, request, chunksize=chunk_size)
+            done = False
+            while not done:
+                _, done = downloader.next_chunk(num_retries=retries)
+    except BaseException:
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        raise
+    return writer.digest.hexdigest(), writer.size
+
+
+def is_retryable(error):
+    """Whether a failed download may succeed on a later sync.
+
+    Network errors, rate limits and server errors are retried. Other 4xx
+    answers, such as a file whose download is restricted (403) or that was
+    removed (404), fail the same way every time, so the cursor moves past them.
+    """
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    if status is None:
+        return True
+    status = int(status)
+    if status == 403:
+        # Drive reports per-user and project rate limits as 403
+        return b'ateLimitExceeded' in (getattr(error, 'content', None) or b'')
+    return status in (408, 429) or status >= 500
+
+
+def download_files(service_factory, files, dest_dir, extensions, workers=4,
+                   chunk_size=DOWNLOAD_CHUNK_SIZE, max_bytes=None, retries=3):
+    """Download Drive files into dest_dir across a bounded thread pool, yielding DriveDownloads.
+
+    Service objects are not thread-safe, so each worker thread gets its own
+    from service_factory(). At most 2 * workers downloads are in flight, so
+    the listing is consumed page by page as downloads finish.
+    """
+    local = threading.local()
+    workers = max(workers, 1)
+
+    def fetch(file):
+        if not local_name(file).lower().endswith(extensions):
+            return DriveDownload(file, None, None, None, 'unsupported file type', False)
+        if getattr(local, 'service', None) is None:
+            local.service = service_factory()
+        # Hidden .part names are ignored by screening until the file is imported
+        temp_path = os.path.join(dest_dir, f'.drive-{uuid.uuid4().hex}.part')
+        try:
+            digest, size = download_file(local.service, file, temp_path, chunk_size, max_bytes, retries)
+        except UploadTooLarge as e:
+            return DriveDownload(file, None, None, None, str(e), False)
+        except Exception as e:
+            return DriveDownload(file, None, None, None, str(e), is_retryable(e))
+        return DriveDownload(file, temp_path, digest, size, None, False)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        for file in files:
+            pending.add(executor.submit(fetch, file))
+            if len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in wait(pending).done:
+            yield future.result()
+
+
+def next_cursor(cursor, downloads):
+    """Sync cursor after a run: the oldest retryable failure's modifiedTime, else the newest seen.
+
+    Drive's RFC 3339 timestamps sort as strings, and listing uses >=, so a
+    failed file is listed again on the next sync.
+    """
+    failed = [d.file['modifiedTime'] for d in downloads if d.retryable]
+    if failed:
+        return min(failed)
+    seen = [d.file['modifiedTime'] for d in downloads if d.file.get('modifiedTime')]
+    return max(seen + ([cursor] if cursor else []), default=None)
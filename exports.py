@@ -0,0 +1,37 @@
+import csv
+import io
+
+from instrumentation import timed
+
+EXPORT_COLUMNS = [('Name', 'name'), ('Email', 'email'), ('Score (%)', 'score')]
+
+
+def iter_csv(results):
+    """Yield CSV text one row at a time for a stream of result dicts"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([header for header, _ in EXPORT_COLUMNS])
+    yield buffer.getvalue()
+    for result in results:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow([result.get(key) for _, key in EXPORT_COLUMNS])
+        yield buffer.getvalue()
+
+
+@timed('write_xlsx')
+def write_xlsx(results, fileobj):
+    """Write result dicts to an .xlsx path or binary file in write-only mode.
+
+    openpyxl streams rows to disk as they are appended, so memory use does not
+    grow with the number of results.
+    """
+    # Imported here: openpyxl is slow to import and only needed for exports
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Screened Candidates")
+    ws.append([header for header, _ in EXPORT_COLUMNS])
+    for result in results:
+        ws.append([result.get(key) for _, key in EXPORT_COLUMNS])
+    wb.save(fileobj)
@@ -0,0 +1,212 @@
+import os
+import re
+import zipfile
+from collections import namedtuple
+from functools import partial
+from xml.etree import ElementTree
+
+from instrumentation import timed
+from scoring import tokenize
+
+# Bump when an extractor's output changes so cached text is not reused
+PDF_EXTRACTOR_VERSION = 'pypdf2-2'
+DOCX_EXTRACTOR_VERSION = 'docx-xml-1'
+DOC_EXTRACTOR_VERSION = 'doc-runs-1'
+
+
+class ExtractionLimits(namedtuple('ExtractionLimits', ['max_pages', 'max_chars'])):
+    """Caps on how much of a document is read; None means unlimited"""
+
+    def version(self, base):
+        # Cached text depends on the caps, so they are part of the cache key
+        return f"{base}:p{self.max_pages}:c{self.max_chars}"
+
+
+# Enough for any resume; long portfolios stop being read past this point
+DEFAULT_LIMITS = ExtractionLimits(max_pages=10, max_chars=100000)
+UNLIMITED = ExtractionLimits(max_pages=None, max_chars=None)
+
+
+class Extractor(namedtuple('Extractor', ['name', 'version', 'iter_text', 'extract_text'])):
+    """A file type's text extractor: a lazy chunk iterator plus a whole-text helper"""
+
+
+# File extension -> Extractor
+EXTRACTORS = {}
+
+
+def register_extractor(extensions, extractor):
+    """Route files with the given extensions to an extractor"""
+    for extension in extensions:
+        EXTRACTORS[extension.lower()] = extractor
+
+
+def get_extractor(path):
+    """Extractor for a file path, or None if its type is not supported"""
+    return EXTRACTORS.get(os.path.splitext(path)[1].lower())
+
+
+def supported_extensions():
+    return tuple(EXTRACTORS)
+
+
+def extractor_versions():
+    """Every registered extractor's version, for keys that depend on all of them"""
+    return ','.join(sorted({extractor.version for extractor in EXTRACTORS.values()}))
+
+
+def _limit_chars(chunks, max_chars):
+    # Stop pulling chunks once the character budget is spent
+    if max_chars is None:
+        yield from chunks
+        return
+    remaining = max_chars
+    for chunk in chunks:
+        if len(chunk) >= remaining:
+            yield chunk[:remaining]
+            return
+        remaining -= len(chunk)
+        yield chunk
+
+
+# PDF: PyPDF2, one page at a time
+
+def iter_pdf_text(pdf_file, limits=DEFAULT_LIMITS):
+    """Yield page text lazily, one newline-terminated chunk per page.
+
+    Pages are only parsed as they are consumed, and reading stops at the
+    page or character cap, so the worst case is bounded by the limits
+    rather than the document size.
+    """
+    def pages():
+        # Imported on first use to keep app startup fast
+        import PyPDF2
+
+        reader = PyPDF2.PdfReader(pdf_file)
+        for number, page in enumerate(reader.pages):
+            if limits.max_pages is not None and number >= limits.max_pages:
+                return
+            yield (page.extract_text() or "") + "\n"
+    return _limit_chars(pages(), limits.max_chars)
+
+
+@timed('extract_text_from_pdf')
+def extract_text_from_pdf(pdf_file, limits=DEFAULT_LIMITS):
+    return "".join(iter_pdf_text(pdf_file, limits))
+
+
+def iter_pdf_tokens(pdf_file, limits=DEFAULT_LIMITS):
+    """Yield scoring tokens page by page without building the document string.
+
+    Pages are joined by newlines, so tokenizing each page separately gives
+    the same tokens as tokenizing the extracted text.
+    """
+    for chunk in iter_pdf_text(pdf_file, limits):
+        yield from tokenize(chunk)
+
+
+# DOCX: stream word/document.xml paragraph by paragraph
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+def iter_docx_text(docx_file, limits=DEFAULT_LIMITS):
+    """Yield one newline-terminated chunk per paragraph of a .docx file.
+
+    document.xml is parsed incrementally and each paragraph is discarded
+    once yielded, so memory stays flat and parsing stops at the character
+    cap. DOCX has no fixed pages, so only max_chars applies.
+    """
+    def paragraphs():
+        with zipfile.ZipFile(docx_file) as archive:
+            with archive.open('word/document.xml') as xml:
+                parts = []
+                for event, element in ElementTree.iterparse(xml, events=('end',)):
+                    tag = element.tag
+                    if tag == _W + 't':
+                        parts.append(element.text or "")
+                    elif tag == _W + 'tab':
+                        parts.append("\t")
+                    elif tag in (_W + 'br', _W + 'cr'):
+                        parts.append("\n")
+                    elif tag == _W + 'p':
+                        yield "".join(parts) + "\n"
+                        parts = []
+                        element.clear()
+    return _limit_chars(paragraphs(), limits.max_chars)
+
+
+@timed('extract_text_from_docx')
+def extract_text_from_docx(docx_file, limits=DEFAULT_LIMITS):
+    return "".join(iter_docx_text(docx_file, limits))
+
+
+# Legacy DOC: pure-Python scan for text runs in the binary file
+
+# UTF-16LE runs (Word's Unicode text) or 8-bit runs (cp1252 "compressed" text)
+_DOC_TEXT_RUN = re.compile(rb'(?:[\x20-\x7e\t\r\n]\x00){4,}|[\x20-\x7e\t\r\n]{6,}')
+_DOC_BLOCK_SIZE = 64 * 1024
+_DOC_MAX_CARRY = 1024 * 1024
+
+
+def iter_doc_text(doc_file, limits=DEFAULT_LIMITS):
+    """Yield readable text runs from a Word 97-2003 .doc file.
+
+    This is a fallback rather than a full OLE/FIB parser: the file is read in
+    blocks and runs of printable UTF-16LE or 8-bit text are kept, which
+    recovers body text (plus some style and font names) for keyword scoring.
+    """
+    def runs():
+        carry = b''
+        while True:
+            block = doc_file.read(_DOC_BLOCK_SIZE)
+            data = carry + block
+            carry = b''
+            for match in _DOC_TEXT_RUN.finditer(data):
+                # A run touching the end of the buffer may continue in the next block
+                if block and match.end() == len(data) and len(data) - match.start() < _DOC_MAX_CARRY:
+                    carry = data[match.start():]
+                    break
+                run = match.group()
+                if len(run) > 1 and run[1] == 0:
+                    text = run.decode('utf-16-le', errors='ignore')
+                else:
+                    text = run.decode('cp1252', errors='ignore')
+                yield text.replace('\r', '\n') + "\n"
+            if not block:
+                return
+    return _limit_chars(runs(), limits.max_chars)
+
+
+@timed('extract_text_from_doc')
+def extract_text_from_doc(doc_file, limits=DEFAULT_LIMITS):
+    return "".join(iter_doc_text(doc_file, limits))
+
+
+register_extractor(['.pdf'], Extractor('pdf', PDF_EXTRACTOR_VERSION, iter_pdf_text, extract_text_from_pdf))
+register_extractor(['.docx'], Extractor('docx', DOCX_EXTRACTOR_VERSION, iter_docx_text, extract_text_from_docx))
+register_extractor(['.doc'], Extractor('doc', DOC_EXTRACTOR_VERSION, iter_doc_text, extract_text_from_doc))
+
+
+def extract_resume_text(path, cache=None, limits=DEFAULT_LIMITS):
+    """Extract text from a resume or JD file, reusing cached text for known content"""
+    extractor = get_extractor(path)
+    if extractor is None:
+        return ""
+    if cache is None:
+        with open(path, 'rb') as f:
+            return extractor.extract_text(f, limits)
+    return cache.get_or_extract(
+        path, limits.version(extractor.version), partial(extractor.extract_text, limits=limits)
+    )
+
+
+def iter_resume_tokens(path, cache=None, limits=DEFAULT_LIMITS):
+    """Tokens of a resume file; without a cache the file is streamed chunk by chunk"""
+    extractor = get_extractor(path)
+    if cache is None and extractor is not None:
+        with open(path, 'rb') as f:
+            for chunk in extractor.iter_text(f, limits):
+                yield from tokenize(chunk)
+        return
+    yield from tokenize(extract_resume_text(path, cache, limits))
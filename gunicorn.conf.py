@@ -0,0 +1,27 @@
+"""gunicorn settings for wsgi:app; each value can be overridden from the environment"""
+import multiprocessing
+import os
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+
+# Processes share the SQLite database in WAL mode. SQLite has one writer at a
+# time, so more processes than this only add lock contention.
+workers = int(os.environ.get('WEB_CONCURRENCY', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+# Threads serve requests that wait on disk or the database; keep DB_POOL_SIZE >= threads
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# /screen_resumes scores the whole resume folder inside the request
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = 30
+keepalive = 5
+
+# Restart workers now and then so memory from large uploads is returned
+max_requests = 1000
+max_requests_jitter = 100
+
+# Not preloaded: database connections and background threads are opened in each worker
+preload_app = False
+
+# An empty GUNICORN_ACCESS_LOG turns the access log off
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-') or None
@@ -0,0 +1,53 @@
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+
+class Identity(namedtuple('Identity', ['id', 'username', 'email', 'role', 'name'])):
+    """The few user fields needed to authorize and render a page"""
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(user.id, user.username, user.email, user.role, user.name)
+
+
+class IdentityCache:
+    """Process-wide TTL cache of user_id -> Identity, bounded to maxsize entries.
+
+    Invalidation only reaches this process, so other worker processes may use
+    a changed or deleted user's old identity until its entry expires.
+    """
+
+    def __init__(self, ttl=300, maxsize=10000):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries = OrderedDict()  # user_id -> (expires_at, identity)
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+    def set(self, user_id, identity):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, identity)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
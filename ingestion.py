@@ -0,0 +1,78 @@
+import hashlib
+import os
+import zipfile
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class UploadTooLarge(ValueError):
+    """A file or archive member went over the per-file size cap"""
+
+
+def copy_and_hash(source, dest_path, max_bytes=None, chunk_size=CHUNK_SIZE):
+    """Stream source into dest_path chunk by chunk; returns (sha256 hex digest, size).
+
+    The size is counted from the bytes actually read, not from headers, so a
+    compressed zip member cannot expand past max_bytes. A partial file is
+    removed if copying fails.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(dest_path, 'wb') as out:
+            for chunk in iter(lambda: source.read(chunk_size), b''):
+                size += len(chunk)
+                if max_bytes is not None and size > max_bytes:
+                    raise UploadTooLarge(f'larger than {max_bytes} bytes')
+                digest.update(chunk)
+                out.write(chunk)
+    except BaseException:
+        if os.path.exists(dest_path):
+            os.remove(dest_path)
+        raise
+    return digest.hexdigest(), size
+
+
+def _is_metadata(name):
+    # Folders and the resource forks / hidden files that archivers add
+    base = os.path.basename(name)
+    return not base or base.startswith('.') or name.startswith('__MACOSX/')
+
+
+def iter_upload_members(uploads, extensions):
+    """Yield (filename, stream, error) for every resume in a multi-file upload.
+
+    Plain files are yielded as-is. Zip archives are read in place and each
+    member is decompressed lazily while the caller consumes its stream, so
+    an archive is never held in memory. Entries that cannot be imported are
+    yielded with stream None and the reason in error.
+    """
+    for upload in uploads:
+        name = upload.filename
+        if not name.lower().endswith('.zip'):
+            if name.lower().endswith(extensions):
+                yield name, upload.stream, None
+            else:
+                yield name, None, 'unsupported file type'
+            continue
+        try:
+            archive = zipfile.ZipFile(upload.stream)
+        except zipfile.BadZipFile:
+            yield name, None, 'not a valid zip archive'
+            continue
+        with archive:
+            for info in archive.infolist():
+                if info.is_dir() or _is_metadata(info.filename):
+                    continue
+                member = f'{name}/{info.filename}'
+                if not info.filename.lower().endswith(extensions):
+                    yield member, None, 'unsupported file type'
+                    continue
+                try:
+                    stream = archive.open(info)
+                except (RuntimeError, NotImplementedError, zipfile.BadZipFile) as e:
+                    # Encrypted members or unsupported compression methods
+                    yield member, None, str(e)
+                    continue
+                with stream:
+                    yield member, stream, None
@@ -0,0 +1,197 @@
+import cProfile
+import hmac
+import os
+import threading
+import time
+from functools import wraps
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Checked on every instrumented call; everything below is a no-op while False
+_enabled = False
+
+
+def enable(on=True):
+    global _enabled
+    _enabled = on
+
+
+def is_enabled():
+    return _enabled
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram, one series per label set"""
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.series = {}  # sorted label tuple -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, labels=None):
+        key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            series = self.series.get(key)
+            if series is None:
+                series = self.series[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            items = sorted(self.series.items())
+        for key, series in items:
+            labels = ','.join(f'{k}="{_escape(v)}"' for k, v in key)
+            prefix = labels + ',' if labels else ''
+            for bound, count in zip(self.buckets, series):
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {series[-1]}')
+            suffix = '{' + labels + '}' if labels else ''
+            lines.append(f'{self.name}_sum{suffix} {series[-2]:.6f}')
+            lines.append(f'{self.name}_count{suffix} {series[-1]}')
+        return '\n'.join(lines)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Gauge:
+    """Point-in-time value read from a callback each time metrics are rendered"""
+
+    def __init__(self, name, help_text, read):
+        self.name = name
+        self.help_text = help_text
+        self.read = read
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} gauge']
+        try:
+            lines.append(f'{self.name} {float(self.read())}')
+        except Exception:
+            # A failing source leaves the gauge without a sample rather than breaking /metrics
+            pass
+        return '\n'.join(lines)
+
+
+request_duration = Histogram('http_request_duration_seconds', 'Flask request latency by endpoint')
+span_duration = Histogram('span_duration_seconds', 'Latency of instrumented hot-path functions')
+sql_duration = Histogram('sql_query_duration_seconds', 'SQL statement latency by statement type')
+HISTOGRAMS = [request_duration, span_duration, sql_duration]
+GAUGES = []
+
+
+def register_gauge(name, help_text, read):
+    gauge = Gauge(name, help_text, read)
+    GAUGES.append(gauge)
+    return gauge
+
+
+def render_metrics():
+    """All histograms and gauges in the Prometheus text exposition format"""
+    return '\n'.join(metric.render() for metric in HISTOGRAMS + GAUGES) + '\n'
+
+
+def timed(name):
+    """Decorator recording a function's latency as span_duration_seconds{span=name}"""
+    def decorator(f):
+        @wraps(f)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return f(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return f(*args, **kwargs)
+            finally:
+                span_duration.observe(time.perf_counter() - started, {'span': name})
+        return wrapper
+    return decorator
+
+
+def _token_matches(sent, expected):
+    return bool(sent) and bool(expected) and hmac.compare_digest(sent.encode('utf-8'), expected.encode('utf-8'))
+
+
+def init_app(app, db=None):
+    """Install timing middleware, SQL timing and /metrics when METRICS_ENABLED is set.
+
+    /metrics needs `Authorization: Bearer <METRICS_TOKEN>`; without a token it
+    only answers local clients. With PROFILING_ENABLED also set, a request whose
+    X-Profile header equals PROFILING_TOKEN is run under cProfile and its stats
+    are written to PROFILE_DIR.
+    """
+    from flask import Response, abort, g, request
+
+    if not app.config.get('METRICS_ENABLED'):
+        return
+    enable()
+
+    @app.before_request
+    def _start_request_timer():
+        g._request_started = time.perf_counter()
+        if app.config.get('PROFILING_ENABLED') and _token_matches(
+            request.headers.get('X-Profile'), app.config.get('PROFILING_TOKEN')
+        ):
+            g._profiler = cProfile.Profile()
+            g._profiler.enable()
+
+    @app.after_request
+    def _record_request(response):
+        profiler = g.pop('_profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            profile_dir = app.config.get('PROFILE_DIR', 'profiles')
+            os.makedirs(profile_dir, exist_ok=True)
+            file_name = f'{int(time.time() * 1000)}_{request.endpoint or "unknown"}.prof'
+            profiler.dump_stats(os.path.join(profile_dir, file_name))
+            # The name within PROFILE_DIR only; the server's paths stay private
+            response.headers['X-Profile-File'] = file_name
+        started = g.pop('_request_started', None)
+        if started is not None:
+            request_duration.observe(time.perf_counter() - started, {
+                'method': request.method,
+                'endpoint': request.endpoint or 'unknown',
+                'status': response.status_code,
+            })
+        return response
+
+    if db is not None:
+        from sqlalchemy import event
+
+        with app.app_context():
+            engine = db.engine
+
+        @event.listens_for(engine, 'before_cursor_execute')
+        def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+            conn.info.setdefault('_query_started', []).append(time.perf_counter())
+
+        @event.listens_for(engine, 'after_cursor_execute')
+        def _record_query(conn, cursor, statement, parameters, context, executemany):
+            started = conn.info['_query_started'].pop()
+            verb = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else 'UNKNOWN'
+            sql_duration.observe(time.perf_counter() - started, {'statement': verb})
+
+        @event.listens_for(engine, 'handle_error')
+        def _forget_failed_query(exception_context):
+            # A failed statement never reaches after_cursor_execute; drop its start
+            # so the pooled connection's next statement is not timed from it
+            conn = exception_context.connection
+            if conn is not None and conn.info.get('_query_started'):
+                conn.info['_query_started'].pop()
+
+    @app.route('/metrics')
+    def metrics():
+        token = app.config.get('METRICS_TOKEN')
+        if token:
+            sent = request.headers.get('Authorization', '')
+            if not _token_matches(sent.removeprefix('Bearer '), token):
+                abort(401)
+        elif request.remote_addr not in ('127.0.0.1', '::1'):
+            abort(403)
+        return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
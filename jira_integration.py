@@ -1,19 +1,89 @@
 import os
-from jira import JIRA
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Jira accepts at most 50 issues per bulk create call
+BULK_CREATE_LIMIT = 50
+RETRY_STATUSES = (429, 503)
+
+def issue_fields(project_key, summary, description, issue_type="Task", **kwargs):
+    """Field dict for a new issue, as sent to Jira"""
+    fields = {
+        'project': {'key': project_key},
+        'summary': summary,
+        'description': description,
+        'issuetype': {'name': issue_type},
+    }
+    # Add any additional fields provided in kwargs
+    fields.update(kwargs)
+    return fields
+
 class JiraClient:
-    def __init__(self):
-        self.server = os.getenv('JIRA_SERVER')
-        self.email = os.getenv('JIRA_EMAIL')
-        self.api_token = os.getenv('JIRA_API_TOKEN')
+    def __init__(self, server=None, email=None, api_token=None, max_workers=4, max_retries=5,
+                 backoff=1.0, max_backoff=30.0, timeout=30):
+        self.server = (server or os.getenv('JIRA_SERVER') or '').rstrip('/')
+        self.email = email or os.getenv('JIRA_EMAIL')
+        self.api_token = api_token or os.getenv('JIRA_API_TOKEN')
         self.client = None
+        # Bulk operations share one pooled session and run at most max_workers requests at a time
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self._session = None
+    
+    @property
+    def session(self):
+        """Keep-alive HTTP session shared by the bulk operations, one pooled connection per worker"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            
+            session = requests.Session()
+            session.auth = (self.email, self.api_token)
+            session.headers.update({'Accept': 'application/json', 'Content-Type': 'application/json'})
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._session = session
+        return self._session
+    
+    def _request(self, method, path, **kwargs):
+        """Send a REST call, retrying rate-limited (429) and unavailable (503) responses with backoff"""
+        url = f"{self.server}/rest/api/2/{path}"
+        for attempt in range(self.max_retries + 1):
+            response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                break
+            time.sleep(self._retry_delay(response, attempt))
+        response.raise_for_status()
+        return response
+    
+    def _retry_delay(self, response, attempt):
+        retry_after = response.headers.get('Retry-After')
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        # Exponential backoff with jitter, so parallel workers don't retry in lockstep
+        return min(self.backoff * 2 ** attempt, self.max_backoff) * (0.5 + random.random() / 2)
+    
+    def _map(self, fn, items):
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(fn, items))
         
     def connect(self):
         """Establish connection to Jira"""
+        # The jira package is slow to import, so it is loaded on first connect
+        from jira import JIRA
+        
         try:
             self.client = JIRA(
                 server=self.server,
@@ -31,14 +101,7 @@ class JiraClient:
                 return None, message
                 
         try:
-            issue_dict = {
-                'project': {'key': project_key},
-                'summary': summary,
-                'description': description,
-                'issuetype': {'name': issue_type},
-            }
-            # Add any additional fields provided in kwargs
-            issue_dict.update(kwargs)
+            issue_dict = issue_fields(project_key, summary, description, issue_type, **kwargs)
             
             issue = self.client.create_issue(fields=issue_dict)
             return issue, f"Successfully created issue {issue.key}"
@@ -61,17 +124,60 @@ class JiraClient:
     
     def update_issue(self, issue_key, **fields):
         """Update an existing Jira issue"""
-        if not self.client:
-            success, message = self.connect()
-            if not success:
-                return False, message
-                
+        # A direct PUT: there is no need to fetch the issue first
         try:
-            issue = self.client.issue(issue_key)
-            issue.update(fields=fields)
+            self._request('PUT', f'issue/{issue_key}', json={'fields': fields})
             return True, f"Successfully updated issue {issue_key}"
         except Exception as e:
             return False, f"Failed to update issue: {str(e)}"
+    
+    def create_issues(self, issues):
+        """Create many issues through the bulk endpoint, 50 per call, batches sent concurrently.
+
+        issues is a list of field dicts (see issue_fields). Returns a list in
+        the same order with the new issue key or None, and a summary message.
+        """
+        batches = [issues[i:i + BULK_CREATE_LIMIT] for i in range(0, len(issues), BULK_CREATE_LIMIT)]
+        
+        from requests import HTTPError
+        
+        def create_batch(batch):
+            try:
+                response = self._request('POST', 'issue/bulk', json={'issueUpdates': [{'fields': f} for f in batch]})
+                body = response.json()
+            except HTTPError as e:
+                # Jira answers 400 when every issue in the batch failed
+                try:
+                    body = e.response.json()
+                except ValueError:
+                    return [None] * len(batch)
+            except Exception:
+                return [None] * len(batch)
+            failed = {error.get('failedElementNumber') for error in body.get('errors', [])}
+            created = iter(body.get('issues', []))
+            return [None if i in failed else next(created, {}).get('key') for i in range(len(batch))]
+        
+        keys = [key for batch_keys in self._map(create_batch, batches) for key in batch_keys]
+        failed = keys.count(None)
+        message = f"Created {len(keys) - failed} of {len(keys)} issues"
+        return keys, message + (f", {failed} failed" if failed else "")
+    
+    def update_issues(self, updates):
+        """Apply field updates to many issues concurrently; updates maps issue key -> fields.
+
+        Returns a dict of issue key -> error message for the updates that failed.
+        """
+        def update(item):
+            issue_key, fields = item
+            success, message = self.update_issue(issue_key, **fields)
+            return issue_key, None if success else message
+        
+        return {key: error for key, error in self._map(update, list(updates.items())) if error}
+    
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,244 @@
+import json
+import threading
+import time
+
+import sqlite_store
+
+DONE_RETENTION = 24 * 3600  # seconds completed operations are kept for lookups
+
+
+class JiraOutbox:
+    """Durable queue of Jira operations, backed by SQLite and drained by a background thread.
+
+    Routes enqueue and return at once. The worker claims pending operations
+    in batches, coalesces updates to the same issue into one call, sends
+    creates through the bulk endpoint and retries failures with backoff
+    until max_attempts. Operations survive a restart and are picked up by
+    the next worker. Claimed rows are leased for `lease` seconds, so
+    several processes can share one outbox without sending twice.
+    """
+
+    def __init__(self, path, client_factory, batch_size=50, poll_interval=1.0, max_attempts=5, retry_backoff=30.0,
+                 lease=300.0):
+        self.path = path
+        self.client_factory = client_factory
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.lease = lease
+        self.flushed = 0
+        self.last_flush_at = None
+        self._client = None
+        self._lock = threading.Lock()
+        self._conn = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite_store.connect(self.path)
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS jira_outbox ('
+                ' id INTEGER PRIMARY KEY AUTOINCREMENT,'
+                ' op TEXT NOT NULL,'  # create or update
+                ' issue_key TEXT,'
+                ' payload TEXT NOT NULL,'
+                ' status TEXT NOT NULL DEFAULT \'pending\','  # pending, done, failed
+                ' attempts INTEGER NOT NULL DEFAULT 0,'
+                ' created_at REAL NOT NULL,'
+                ' next_attempt_at REAL NOT NULL,'
+                ' finished_at REAL,'
+                ' result TEXT,'
+                ' error TEXT)'
+            )
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS ix_jira_outbox_pending '
+                'ON jira_outbox (status, next_attempt_at)'
+            )
+            self._conn.commit()
+        return self._conn
+
+    def _enqueue(self, op, issue_key, payload):
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            cursor = conn.execute(
+                'INSERT INTO jira_outbox (op, issue_key, payload, created_at, next_attempt_at) VALUES (?, ?, ?, ?, ?)',
+                (op, issue_key, json.dumps(payload), now, now)
+            )
+            conn.commit()
+        self._wake.set()
+        return cursor.lastrowid
+
+    def enqueue_create(self, fields):
+        """Queue a new issue (see jira_integration.issue_fields); returns the outbox id"""
+        return self._enqueue('create', None, fields)
+
+    def enqueue_update(self, issue_key, fields):
+        """Queue a field update; pending updates to one issue are merged, later fields winning"""
+        return self._enqueue('update', issue_key, fields)
+
+    def get(self, outbox_id):
+        """Status of one queued operation, with the created issue key once it is done"""
+        with self._lock:
+            row = self._connect().execute(
+                'SELECT status, result, error, attempts FROM jira_outbox WHERE id = ?', (outbox_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'id': outbox_id, 'status': row[0], 'issue_key': row[1], 'error': row[2], 'attempts': row[3]}
+
+    def _claim(self):
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            # The write lock is taken up front so no other process claims the same rows
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                rows = conn.execute(
+                    'SELECT id, op, issue_key, payload, attempts FROM jira_outbox '
+                    'WHERE status = \'pending\' AND next_attempt_at <= ? '
+                    # An update waits while an older update to the same issue is backing off
+                    'AND NOT (op = \'update\' AND EXISTS (SELECT 1 FROM jira_outbox AS earlier '
+                    ' WHERE earlier.issue_key = jira_outbox.issue_key AND earlier.status = \'pending\' '
+                    ' AND earlier.id < jira_outbox.id AND earlier.next_attempt_at > ?)) '
+                    'ORDER BY id LIMIT ?',
+                    (now, now, self.batch_size)
+                ).fetchall()
+                # Leased until the outcome is recorded; rows of a worker that died come due again
+                conn.executemany(
+                    'UPDATE jira_outbox SET next_attempt_at = ? WHERE id = ?',
+                    [(now + self.lease, row[0]) for row in rows]
+                )
+                conn.commit()
+            except BaseException:
+                # Never leave the shared connection holding the write lock
+                conn.rollback()
+                raise
+        return rows
+
+    def drain_once(self):
+        """Flush one batch of due operations; returns how many outbox rows were handled"""
+        rows = self._claim()
+        if not rows:
+            return 0
+        if self._client is None:
+            self._client = self.client_factory()
+
+        creates = [row for row in rows if row[1] == 'create']
+        updates = {}
+        for row in rows:
+            if row[1] == 'update':
+                updates.setdefault(row[2], []).append(row)
+
+        outcomes = []  # (row, issue key or None, error or None)
+        if creates:
+            try:
+                keys, message = self._client.create_issues([json.loads(row[3]) for row in creates])
+            except Exception as e:
+                keys, message = [None] * len(creates), str(e)
+            outcomes.extend((row, key, None if key else message) for row, key in zip(creates, keys))
+        if updates:
+            merged = {}
+            for issue_key, issue_rows in updates.items():
+                fields = {}
+                for row in issue_rows:
+                    fields.update(json.loads(row[3]))
+                merged[issue_key] = fields
+            try:
+                errors = self._client.update_issues(merged)
+            except Exception as e:
+                errors = dict.fromkeys(merged, str(e))
+            for issue_key, issue_rows in updates.items():
+                outcomes.extend((row, issue_key, errors.get(issue_key)) for row in issue_rows)
+
+        self._record(outcomes)
+        return len(rows)
+
+    def _record(self, outcomes):
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            try:
+                for row, issue_key, error in outcomes:
+                    outbox_id, attempts = row[0], row[4] + 1
+                    if error is None:
+                        conn.execute(
+                            'UPDATE jira_outbox SET status = \'done\', attempts = ?, result = ?, error = NULL, '
+                            'finished_at = ? WHERE id = ?',
+                            (attempts, issue_key, now, outbox_id)
+                        )
+                    elif attempts >= self.max_attempts:
+                        conn.execute(
+                            'UPDATE jira_outbox SET status = \'failed\', attempts = ?, error = ?, finished_at = ? '
+                            'WHERE id = ?',
+                            (attempts, error, now, outbox_id)
+                        )
+                    else:
+                        conn.execute(
+                            'UPDATE jira_outbox SET attempts = ?, error = ?, next_attempt_at = ? WHERE id = ?',
+                            (attempts, error, now + self.retry_backoff * 2 ** (attempts - 1), outbox_id)
+                        )
+                conn.execute(
+                    'DELETE FROM jira_outbox WHERE status = \'done\' AND finished_at < ?', (now - DONE_RETENTION,)
+                )
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        self.flushed += len(outcomes)
+        self.last_flush_at = now
+
+    def _run(self):
+        while not self._stop.is_set():
+            # Cleared before draining, so an enqueue during the flush is not missed
+            self._wake.clear()
+            try:
+                # Keep flushing while full batches are waiting
+                if self.drain_once() >= self.batch_size:
+                    continue
+            except Exception as e:
+                print(f"Error draining Jira outbox: {str(e)}")
+            self._wake.wait(self.poll_interval)
+
+    def start(self):
+        """Start the background worker if it is not running"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name='jira-outbox', daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self):
+        """Queue depth, lag (age of the oldest pending operation) and flush counters"""
+        with self._lock:
+            pending, oldest = self._connect().execute(
+                'SELECT COUNT(*), MIN(created_at) FROM jira_outbox WHERE status = \'pending\''
+            ).fetchone()
+            failed = self._conn.execute(
+                'SELECT COUNT(*) FROM jira_outbox WHERE status = \'failed\''
+            ).fetchone()[0]
+        return {
+            'depth': pending,
+            'lag_seconds': round(time.time() - oldest, 3) if oldest else 0,
+            'failed': failed,
+            'flushed': self.flushed,
+            'last_flush_at': self.last_flush_at,
+            'running': self._thread is not None and self._thread.is_alive(),
+        }
+
+    def close(self):
+        self.stop()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,45 @@
+import threading
+import time
+from collections import namedtuple
+
+
+class JobSummary(namedtuple('JobSummary', ['id', 'title', 'company', 'location'])):
+    """The job fields the dashboards list"""
+
+    @classmethod
+    def from_job(cls, job):
+        return cls(job.id, job.title, job.company, job.location)
+
+
+class ActiveJobsCache:
+    """Process-wide cache of the active-job listing.
+
+    A commit that changes a Job in this process invalidates it at once;
+    other worker processes see the change within ttl seconds.
+    """
+
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+        self._jobs = None
+        self._expires_at = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, load):
+        """The cached listing, or a fresh one from load() when it was invalidated or expired"""
+        with self._lock:
+            if self._jobs is not None and self._expires_at > time.monotonic():
+                return self._jobs
+            generation = self._generation
+        jobs = tuple(load())
+        with self._lock:
+            # An invalidation while loading means this result may already be stale
+            if generation == self._generation:
+                self._jobs = jobs
+                self._expires_at = time.monotonic() + self.ttl
+        return jobs
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._jobs = None
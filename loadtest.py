@@ -0,0 +1,236 @@
+"""Load test of the candidate apply and dashboard routes, dev server against gunicorn.
+
+Each mode gets a fresh scratch database and uploads folder. The app is started
+as a real HTTP server and driven by the same concurrent clients for the same
+time. 'dev' runs the Flask development server with SQLite defaults. 'wsgi'
+runs wsgi:app under gunicorn.conf.py with the WAL and pool settings. Results
+go to stdout as JSON, as benchmarks.py does:
+
+    python loadtest.py --clients 16 --duration 20 --output load.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from benchmarks import make_docx, percentile, synthetic_lines
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PASSWORD = 'load-test'
+MODES = ('dev', 'wsgi')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def server_env(workdir, mode):
+    """FLASK_* settings read by create_app in the server process"""
+    env = dict(os.environ)
+    env.update({
+        'FLASK_SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(workdir, 'load.db'),
+        'FLASK_UPLOAD_FOLDER': os.path.join(workdir, 'uploads'),
+        'FLASK_WTF_CSRF_ENABLED': 'false',
+        'FLASK_SECRET_KEY': 'load-test',
+    })
+    if mode == 'dev':
+        # What `python app.py` ran with before: no pragmas, default pool
+        env['FLASK_SQLITE_PRAGMAS'] = '{}'
+        env['FLASK_SQLALCHEMY_ENGINE_OPTIONS'] = '{}'
+    return env
+
+
+def seed(workdir, mode, clients, hr_clients):
+    """Create the schema, the demo jobs and one login per client (load0, load1, ...) in the mode's database"""
+    from werkzeug.security import generate_password_hash
+
+    script = (
+        'import sys, app\n'
+        'flask_app = app.create_app()\n'
+        'with flask_app.app_context():\n'
+        '    app.init_db()\n'
+        '    for i in range(int(sys.argv[1])):\n'
+        '        role = "hr" if i < int(sys.argv[2]) else "candidate"\n'
+        '        app.db.session.add(app.User(username=f"load{i}", email=f"load{i}@example.com",\n'
+        '                                    password=sys.argv[3], role=role, name=f"Load User {i}"))\n'
+        '    app.db.session.commit()\n'
+        '    print(app.Job.query.first().id)\n'
+    )
+    # A cheap hash: the test measures the routes, not the login
+    password = generate_password_hash(PASSWORD, method='pbkdf2:sha256:1000')
+    output = subprocess.run(
+        [sys.executable, '-c', script, str(clients), str(hr_clients), password],
+        cwd=HERE, env=server_env(workdir, mode), check=True, capture_output=True, text=True
+    ).stdout
+    return int(output.strip().splitlines()[-1])
+
+
+def start_server(workdir, mode, port, workers, threads):
+    env = server_env(workdir, mode)
+    if mode == 'dev':
+        command = [sys.executable, '-c', f'import app; app.create_app().run(port={port})']
+    else:
+        env.update({'WEB_CONCURRENCY': str(workers), 'GUNICORN_THREADS': str(threads), 'GUNICORN_ACCESS_LOG': ''})
+        command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}', 'wsgi:app']
+    # The dev server logs every request to stderr, so it goes to a file rather than a pipe
+    log_path = os.path.join(workdir, f'{mode}.log')
+    with open(log_path, 'wb') as log:
+        process = subprocess.Popen(command, cwd=HERE, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+    import requests
+
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        if process.poll() is not None:
+            with open(log_path, errors='replace') as log:
+                raise RuntimeError(f'{mode} server exited: {log.read()[-2000:]}')
+        try:
+            requests.get(f'http://127.0.0.1:{port}/', timeout=5)
+            return process
+        except requests.RequestException:
+            # Not listening yet, or workers still booting
+            time.sleep(0.1)
+    process.terminate()
+    raise RuntimeError(f'{mode} server did not start on port {port}')
+
+
+def client_loop(base_url, username, role, job_id, deadline, seed_value, samples):
+    """Log in, then apply and load dashboards until the deadline, recording (route, seconds, ok)"""
+    import requests
+
+    rng = random.Random(seed_value)
+    http = requests.Session()
+    http.post(f'{base_url}/login/{role}', data={'username': username, 'password': PASSWORD}, allow_redirects=False)
+    resume = make_docx(synthetic_lines(rng, 40, skill_ratio=0.4))
+    while time.time() < deadline:
+        if role == 'hr':
+            route, call = 'hr_dashboard', lambda: http.get(f'{base_url}/hr/dashboard', allow_redirects=False)
+        elif rng.random() < 0.5:
+            route, call = 'candidate_apply', lambda: http.post(f'{base_url}/candidate/apply', data={
+                'job_id': job_id, 'full_name': username, 'email': f'{username}@example.com'
+            }, files={'resume': ('resume.docx', resume)}, allow_redirects=False)
+        else:
+            route, call = 'candidate_dashboard', lambda: http.get(f'{base_url}/candidate/dashboard', allow_redirects=False)
+        started = time.perf_counter()
+        try:
+            response = call()
+            # Apply answers with a redirect; a redirect to the login page means the session was lost
+            ok = response.status_code < 400 and '/login' not in response.headers.get('Location', '')
+        except requests.RequestException:
+            ok = False
+        samples.append((route, time.perf_counter() - started, ok))
+
+
+def run_mode(mode, clients, duration, workers, threads, seed_value):
+    """Seed a scratch database, start the server in one mode and drive it; returns one row per route"""
+    workdir = tempfile.mkdtemp(prefix=f'ai-avengers-load-{mode}-')
+    process = None
+    try:
+        hr_clients = max(clients // 4, 1)
+        job_id = seed(workdir, mode, clients, hr_clients)
+        port = free_port()
+        process = start_server(workdir, mode, port, workers, threads)
+
+        samples = []
+        deadline = time.time() + duration
+        threads_list = [
+            threading.Thread(target=client_loop, args=(
+                f'http://127.0.0.1:{port}',
+                f'load{i}',
+                'hr' if i < hr_clients else 'candidate',
+                job_id, deadline, seed_value + i, samples
+            ))
+            for i in range(clients)
+        ]
+        started = time.perf_counter()
+        for thread in threads_list:
+            thread.start()
+        for thread in threads_list:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        rows = []
+        for route in sorted({route for route, _, _ in samples}):
+            latencies = [seconds for name, seconds, _ in samples if name == route]
+            errors = sum(1 for name, _, ok in samples if name == route and not ok)
+            rows.append({
+                'mode': mode,
+                'route': route,
+                'requests': len(latencies),
+                'errors': errors,
+                'seconds': round(elapsed, 3),
+                'throughput_per_s': round((len(latencies) - errors) / elapsed, 2),
+                'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+                'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+            })
+        return rows
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(10)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def run(modes=MODES, clients=16, duration=20, workers=None, threads=4, seed_value=0):
+    """Run the same load against each mode and report per-route results and the wsgi/dev speedup"""
+    workers = workers or min((os.cpu_count() or 1) * 2 + 1, 8)
+    results = []
+    for mode in modes:
+        results.extend(run_mode(mode, clients, duration, workers, threads, seed_value))
+
+    throughput = {(row['mode'], row['route']): row['throughput_per_s'] for row in results}
+    speedup = {
+        route: round(throughput[('wsgi', route)] / throughput[('dev', route)], 2)
+        for mode, route in throughput
+        if mode == 'dev' and throughput[('dev', route)] and ('wsgi', route) in throughput
+    }
+    return {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'clients': clients,
+            'duration_s': duration,
+            'gunicorn_workers': workers,
+            'gunicorn_threads': threads,
+            'seed': seed_value,
+        },
+        'results': results,
+        'speedup': speedup,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modes', nargs='+', default=list(MODES), choices=MODES)
+    parser.add_argument('--clients', type=int, default=16, help='concurrent clients; a quarter are HR users')
+    parser.add_argument('--duration', type=float, default=20, help='seconds of load per mode')
+    parser.add_argument('--workers', type=int, help='gunicorn worker processes (default: 2 * CPUs + 1, at most 8)')
+    parser.add_argument('--threads', type=int, default=4, help='threads per gunicorn worker')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write JSON here instead of stdout')
+    args = parser.parse_args(argv)
+
+    report = run(args.modes, args.clients, args.duration, args.workers, args.threads, args.seed)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,253 @@
+import heapq
+import math
+from array import array
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the array-backed path is used without it
+    np = None
+
+SCORING_MODES = ('percentage', 'tfidf', 'bm25', 'cosine')
+
+
+def tokenize(text):
+    """Split text into lowercase whitespace-delimited tokens"""
+    return (text or "").lower().split()
+
+
+def keyword_score(keywords, resume_terms):
+    """Percentage of job keywords (with repeats) present in a resume's term set"""
+    matched = sum(1 for word in keywords if word in resume_terms)
+    score = (matched / len(keywords)) * 100 if keywords else 0
+    return min(100, round(score, 2))
+
+
+def rank_top_k(results, k, key=lambda result: result['score']):
+    """Highest scoring k results, best first, using a bounded heap (O(n log k)).
+
+    Ties keep their input order, matching a stable descending sort. k=None
+    returns every result sorted.
+    """
+    if k is None:
+        return sorted(results, key=key, reverse=True)
+    return heapq.nlargest(k, results, key=key)
+
+
+class InvertedIndex:
+    """Corpus-wide term index so a job description is scored once against all resumes.
+
+    Each document is tokenized a single time into term frequencies; scoring then
+    only walks the postings of the job description's distinct terms.
+    """
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = {}      # term -> {doc_id: term frequency}
+        self.doc_lengths = {}   # doc_id -> number of tokens
+        self.doc_terms = {}     # doc_id -> distinct terms, for cheap removal
+        self.doc_norms = {}     # doc_id -> euclidean norm of the term-frequency vector
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.doc_lengths
+
+    def add(self, doc_id, text):
+        """Index a document, replacing any previous version with the same id"""
+        return self.add_tokens(doc_id, tokenize(text))
+
+    def add_tokens(self, doc_id, tokens):
+        """Index an already tokenized document"""
+        return self.add_frequencies(doc_id, Counter(tokens))
+
+    def add_frequencies(self, doc_id, frequencies):
+        """Index a document given as a term -> count mapping"""
+        if doc_id in self.doc_lengths:
+            self.remove(doc_id)
+        for term, count in frequencies.items():
+            self.postings.setdefault(term, {})[doc_id] = count
+        length = sum(frequencies.values())
+        self.doc_lengths[doc_id] = length
+        self.doc_terms[doc_id] = tuple(frequencies)
+        self.doc_norms[doc_id] = math.sqrt(sum(count * count for count in frequencies.values()))
+        self.total_length += length
+        return frequencies
+
+    def remove(self, doc_id):
+        """Drop a document and its postings from the index"""
+        length = self.doc_lengths.pop(doc_id, None)
+        if length is None:
+            return False
+        self.total_length -= length
+        self.doc_norms.pop(doc_id, None)
+        for term in self.doc_terms.pop(doc_id, ()):
+            docs = self.postings[term]
+            docs.pop(doc_id, None)
+            if not docs:
+                del self.postings[term]
+        return True
+
+    def score(self, job_description, mode='percentage'):
+        """Score every indexed document against a job description.
+
+        Returns a dict of doc_id -> score. 'percentage' reproduces the original
+        keyword-coverage formula; 'tfidf', 'bm25' and 'cosine' are relevance rankings.
+        """
+        return self.score_terms(tokenize(job_description), mode)
+
+    def score_terms(self, keywords, mode='percentage'):
+        """Score every indexed document against pre-tokenized job keywords"""
+        if mode not in SCORING_MODES:
+            raise ValueError(f"Unknown scoring mode: {mode}")
+        query = Counter(keywords)
+        scores = dict.fromkeys(self.doc_lengths, 0)
+        if not query:
+            return scores
+
+        if mode == 'percentage':
+            total = len(keywords)
+            matched = dict.fromkeys(self.doc_lengths, 0)
+            for term, count in query.items():
+                for doc_id in self.postings.get(term, ()):
+                    matched[doc_id] += count
+            for doc_id, hits in matched.items():
+                scores[doc_id] = min(100, round((hits / total) * 100, 2))
+            return scores
+
+        if mode == 'cosine':
+            query_norm = math.sqrt(sum(count * count for count in query.values()))
+            for term, count in query.items():
+                for doc_id, tf in self.postings.get(term, {}).items():
+                    scores[doc_id] += count * tf
+            return {
+                doc_id: round(dot / (query_norm * self.doc_norms[doc_id]), 4) if dot else 0
+                for doc_id, dot in scores.items()
+            }
+
+        n_docs = len(self.doc_lengths)
+        avg_length = (self.total_length / n_docs) if n_docs else 0
+        for term, count in query.items():
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            if mode == 'tfidf':
+                idf = math.log((1 + n_docs) / (1 + len(docs))) + 1
+                for doc_id, tf in docs.items():
+                    scores[doc_id] += count * (tf / self.doc_lengths[doc_id]) * idf
+            else:
+                idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                for doc_id, tf in docs.items():
+                    norm = 1 - self.b + self.b * (self.doc_lengths[doc_id] / avg_length if avg_length else 0)
+                    scores[doc_id] += count * idf * (tf * (self.k1 + 1)) / (tf + self.k1 * norm)
+        return {doc_id: round(value, 4) for doc_id, value in scores.items()}
+
+
+class DocumentTermMatrix:
+    """Sparse document-term matrix in CSR form over integer vocabulary ids.
+
+    The corpus is tokenized and laid out once; each job description is then
+    scored against every row in a single pass. NumPy is used when installed,
+    otherwise the same arrays are walked in pure Python.
+    """
+
+    def __init__(self):
+        self.doc_ids = []
+        self.vocabulary = {}          # term -> column id
+        self.indptr = array('l', [0])  # row i spans indices[indptr[i]:indptr[i + 1]]
+        self.indices = array('l')     # column ids
+        self.data = array('d')        # term frequencies
+        self.row_norms = array('d')
+
+    @classmethod
+    def from_documents(cls, documents):
+        """Build a matrix from (doc_id, text) pairs"""
+        matrix = cls()
+        for doc_id, text in documents:
+            matrix.add_row(doc_id, Counter(tokenize(text)))
+        return matrix
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def add_row(self, doc_id, frequencies):
+        """Append one document given as a term -> count mapping"""
+        vocabulary = self.vocabulary
+        for term, count in frequencies.items():
+            column = vocabulary.get(term)
+            if column is None:
+                column = vocabulary[term] = len(vocabulary)
+            self.indices.append(column)
+            self.data.append(count)
+        self.indptr.append(len(self.indices))
+        self.row_norms.append(math.sqrt(sum(count * count for count in frequencies.values())))
+        self.doc_ids.append(doc_id)
+
+    def _row_sums(self, weights, use_data):
+        # Sum weights[column] (times the frequency, if use_data) over each row
+        n_rows = len(self.doc_ids)
+        if np is not None:
+            indptr = np.frombuffer(self.indptr, dtype=self.indptr.typecode)
+            values = np.asarray(weights, dtype=float)[np.frombuffer(self.indices, dtype=self.indices.typecode)]
+            if use_data:
+                values = values * np.frombuffer(self.data, dtype=float)
+            rows = np.repeat(np.arange(n_rows), np.diff(indptr))
+            return np.bincount(rows, weights=values, minlength=n_rows).tolist()
+        sums = []
+        indices, data, indptr = self.indices, self.data, self.indptr
+        for row in range(n_rows):
+            total = 0.0
+            for position in range(indptr[row], indptr[row + 1]):
+                weight = weights[indices[position]]
+                if weight:
+                    total += weight * data[position] if use_data else weight
+            sums.append(total)
+        return sums
+
+    def _query_weights(self, query):
+        weights = array('d', bytes(8 * len(self.vocabulary)))
+        for term, count in query.items():
+            column = self.vocabulary.get(term)
+            if column is not None:
+                weights[column] = count
+        return weights
+
+    def coverage_scores(self, keywords):
+        """Keyword-coverage percentage for every row, same formula as keyword_score"""
+        if not keywords:
+            return dict.fromkeys(self.doc_ids, 0)
+        hits = self._row_sums(self._query_weights(Counter(keywords)), use_data=False)
+        total = len(keywords)
+        return {
+            doc_id: min(100, round((matched / total) * 100, 2))
+            for doc_id, matched in zip(self.doc_ids, hits)
+        }
+
+    def cosine_scores(self, keywords):
+        """Cosine similarity between the keyword vector and every row"""
+        query = Counter(keywords)
+        query_norm = math.sqrt(sum(count * count for count in query.values()))
+        if not query_norm:
+            return dict.fromkeys(self.doc_ids, 0)
+        dots = self._row_sums(self._query_weights(query), use_data=True)
+        return {
+            doc_id: round(dot / (query_norm * norm), 4) if dot else 0
+            for doc_id, dot, norm in zip(self.doc_ids, dots, self.row_norms)
+        }
+
+
+def batch_score(job_description, documents, mode='percentage'):
+    """Score one job description against (doc_id, text) pairs in one batch.
+
+    mode is 'percentage' (keyword coverage) or 'cosine'. Returns doc_id -> score.
+    """
+    if mode not in ('percentage', 'cosine'):
+        raise ValueError(f"Unsupported batch scoring mode: {mode}")
+    matrix = documents if isinstance(documents, DocumentTermMatrix) else DocumentTermMatrix.from_documents(documents)
+    keywords = tokenize(job_description)
+    if mode == 'cosine':
+        return matrix.cosine_scores(keywords)
+    return matrix.coverage_scores(keywords)
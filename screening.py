@@ -0,0 +1,135 @@
+import multiprocessing
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from extraction import DEFAULT_LIMITS, iter_resume_tokens
+from scoring import InvertedIndex
+from text_cache import TextCache
+
+# One cache handle per worker process, keyed by database path
+_worker_caches = {}
+
+
+def _worker_cache(cache_path, max_bytes):
+    cache = _worker_caches.get(cache_path)
+    if cache is None:
+        cache = _worker_caches[cache_path] = TextCache(cache_path, max_bytes=max_bytes)
+    return cache
+
+
+def extract_terms(path, cache_path=None, cache_max_bytes=None, limits=DEFAULT_LIMITS):
+    """Extract a file and reduce it to term frequencies (runs inside pool workers)"""
+    cache = _worker_cache(cache_path, cache_max_bytes) if cache_path else None
+    return Counter(iter_resume_tokens(path, cache, limits))
+
+
+class _PoolContext:
+    """A multiprocessing context that keeps handles to the worker processes it starts.
+
+    Workers come from forkserver (spawn where that is unavailable) rather than
+    fork: the app process runs server, job and outbox threads, and forking it
+    copies whatever locks those threads hold at that moment.
+    """
+
+    def __init__(self):
+        methods = multiprocessing.get_all_start_methods()
+        self._context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        self.processes = []
+
+    def __getattr__(self, name):
+        return getattr(self._context, name)
+
+    def Process(self, *args, **kwargs):
+        process = self._context.Process(*args, **kwargs)
+        self.processes.append(process)
+        return process
+
+
+def _start_pool(workers):
+    context = _PoolContext()
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context), context
+
+
+def _terminate(executor, context):
+    # A running future cannot be cancelled, so workers stuck on a pathological
+    # file are killed outright before the pool is replaced.
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in context.processes:
+        if process.is_alive():
+            process.terminate()
+
+
+def iter_corpus_terms(files, cache=None, workers=0, chunk_size=32, timeout=None, limits=DEFAULT_LIMITS):
+    """Yield (doc_id, term frequencies, error) for each (doc_id, path) pair.
+
+    With workers > 1 files are extracted across a process pool in chunks;
+    a file that takes longer than timeout seconds is reported as an error
+    and its worker is replaced before the next chunk starts.
+    """
+    files = list(files)
+    if workers <= 1:
+        for doc_id, path in files:
+            try:
+                yield doc_id, Counter(iter_resume_tokens(path, cache, limits)), None
+            except Exception as e:
+                yield doc_id, None, str(e)
+        return
+
+    cache_path = cache.path if cache is not None else None
+    cache_max_bytes = cache.max_bytes if cache is not None else None
+    executor, context = _start_pool(workers)
+    try:
+        for start in range(0, len(files), chunk_size):
+            chunk = files[start:start + chunk_size]
+            futures = [
+                (doc_id, executor.submit(extract_terms, path, cache_path, cache_max_bytes, limits))
+                for doc_id, path in chunk
+            ]
+            replace_pool = False
+            for doc_id, future in futures:
+                try:
+                    yield doc_id, future.result(timeout=timeout), None
+                except FutureTimeoutError:
+                    replace_pool = True
+                    yield doc_id, None, f'Timed out after {timeout} seconds'
+                except BrokenProcessPool as e:
+                    replace_pool = True
+                    yield doc_id, None, f'Worker failed: {str(e)}'
+                except Exception as e:
+                    yield doc_id, None, str(e)
+            if replace_pool:
+                _terminate(executor, context)
+                executor, context = _start_pool(workers)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def build_index(files, cache=None, workers=0, chunk_size=32, timeout=None, progress=None,
+                limits=DEFAULT_LIMITS):
+    """Extract and index a corpus of (doc_id, path) pairs.
+
+    Returns (index, errors, throughput) where errors maps doc_id to a message
+    and throughput reports files per second for the extraction pass. If given,
+    progress(done, total) is called after every file.
+    """
+    files = list(files)
+    started = time.perf_counter()
+    index = InvertedIndex()
+    errors = {}
+    for done, (doc_id, terms, error) in enumerate(iter_corpus_terms(files, cache, workers, chunk_size, timeout, limits), 1):
+        if progress is not None:
+            progress(done, len(files))
+        if error is not None:
+            errors[doc_id] = error
+            continue
+        index.add_frequencies(doc_id, terms)
+    elapsed = time.perf_counter() - started
+    throughput = {
+        'files': len(files),
+        'workers': max(workers, 1),
+        'seconds': round(elapsed, 3),
+        'files_per_second': round(len(files) / elapsed, 2) if elapsed else None,
+    }
+    return index, errors, throughput
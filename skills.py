@@ -0,0 +1,83 @@
+import re
+
+# Bump when extraction rules change so stored skill profiles are rebuilt
+SKILLS_VERSION = 'skills-2'
+
+STOPWORDS = frozenset('''
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each etc few for from further had has have
+having he her here hers him his how i if in into is it its itself just me more most my no nor not now of
+off on once only or other our ours out over own same she should so some such than that the their them
+then there these they this those through to too under until up us very was we were what when where
+which while who whom why will with would you your yours
+'''.split())
+
+# Words that fill job descriptions and resumes without naming a skill
+BOILERPLATE = frozenset('''
+ability able applicant applicants apply candidate candidates company degree environment excellent
+experience experienced familiarity good great ideal including job knowledge looking must new plus
+preferred proficiency proficient profile related requirement requirements responsibilities
+responsibility role skills strong team understanding using work working year years
+'''.split())
+
+# Job title words shared by most postings; as skills they would match nearly every resume
+TITLE_WORDS = frozenset('''
+associate developer developers development engineer engineering engineers intern junior lead principal
+senior software staff web
+'''.split())
+
+# Common spellings folded onto one term
+ALIASES = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'postgres': 'postgresql',
+    'k8s': 'kubernetes',
+    'golang': 'go',
+    'node': 'node.js',
+    'nodejs': 'node.js',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'ml': 'machine-learning',
+}
+
+# Single-letter terms that are real skills
+SHORT_SKILLS = frozenset({'c', 'r'})
+
+# Keeps symbols that belong to skill names: c++, c#, node.js, ci/cd
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#./-]*")
+_LETTER = re.compile(r"[a-z]")
+
+
+def normalize_terms(text):
+    """Yield lowercase terms with surrounding punctuation removed and aliases applied"""
+    for token in _TOKEN.findall((text or "").lower()):
+        token = token.rstrip('./-')
+        yield ALIASES.get(token, token)
+
+
+def extract_skills(text):
+    """Sorted distinct skill terms in text: no stopwords, boilerplate, title words or numbers such as 5+"""
+    return sorted({
+        term for term in normalize_terms(text)
+        if (len(term) > 1 or term in SHORT_SKILLS)
+        and term not in STOPWORDS
+        and term not in BOILERPLATE
+        and term not in TITLE_WORDS
+        and _LETTER.search(term)
+    })
+
+
+def match_score(job_skills, candidate_skills):
+    """Percentage of a job's skills found in a candidate's skills"""
+    job_skills = set(job_skills)
+    if not job_skills:
+        return 0
+    return round(len(job_skills & set(candidate_skills)) / len(job_skills) * 100, 2)
+
+
+def dump_skills(skills):
+    return ' '.join(skills)
+
+
+def load_skills(value):
+    return (value or '').split()
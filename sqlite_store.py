@@ -0,0 +1,13 @@
+import os
+import sqlite3
+
+
+def connect(path):
+    """Open a SQLite file shared by several worker processes, creating its folder"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    # WAL lets worker processes read while one of them writes
+    conn.execute('PRAGMA journal_mode=WAL')
+    return conn
@@ -0,0 +1,132 @@
+from app import Application, ApplicationSkills, Job, JobMatch, JobSkills, User, db, top_candidates_by_job
+from conftest import job_ids
+
+
+def add_candidates(app, count):
+    with app.app_context():
+        users = [
+            User(username=f'cand{i}', email=f'cand{i}@example.com', password='-', role='candidate', name=f'Cand {i}')
+            for i in range(count)
+        ]
+        db.session.add_all(users)
+        db.session.commit()
+        return [user.id for user in users]
+
+
+def add_matches(app, job_id, candidate_ids, scores):
+    with app.app_context():
+        for candidate_id, score in zip(candidate_ids, scores):
+            application = Application(candidate_id=candidate_id, job_id=job_id, resume_path='-')
+            db.session.add(application)
+            db.session.flush()
+            db.session.add(JobMatch(job_id=job_id, application_id=application.id, candidate_id=candidate_id, score=score))
+        db.session.commit()
+
+
+def test_top_candidates_per_active_job(app):
+    first, second = job_ids(app)
+    candidates = add_candidates(app, 4)
+    add_matches(app, first, candidates, [10, 90, 50, 90])
+    add_matches(app, second, candidates[:1], [70])
+
+    with app.app_context():
+        top = top_candidates_by_job(limit=3)
+        assert [job['job_id'] for job in top] == [first, second]
+        # Ties keep application order, as on the per-job candidates page
+        assert [c['name'] for c in top[0]['candidates']] == ['Cand 1', 'Cand 3', 'Cand 2']
+        assert top[1]['candidates'] == [{'name': 'Cand 0', 'email': 'cand0@example.com', 'score': 70}]
+
+        db.session.get(Job, second).is_active = False
+        db.session.commit()
+        assert [job['job_id'] for job in top_candidates_by_job()] == [first]
+
+
+def revalidate(client, url, etag):
+    return client.get(url, headers={'If-None-Match': etag})
+
+
+def test_hr_dashboard_answers_304_until_its_data_changes(app, hr_client):
+    first = hr_client.get('/hr/dashboard')
+    assert first.status_code == 200 and first.headers['Cache-Control'] == 'private, no-cache'
+    etag = first.headers['ETag'].strip('"')
+
+    unchanged = revalidate(hr_client, '/hr/dashboard', etag)
+    assert unchanged.status_code == 304 and unchanged.data == b''
+
+    job_id = job_ids(app)[0]
+    with app.app_context():
+        db.session.get(Job, job_id).title = 'Staff Software Engineer'
+        db.session.commit()
+    renamed = revalidate(hr_client, '/hr/dashboard', etag)
+    assert renamed.status_code == 200 and b'Staff Software Engineer' in renamed.data
+    etag = renamed.headers['ETag'].strip('"')
+
+    add_matches(app, job_id, add_candidates(app, 1), [80])
+    applied = revalidate(hr_client, '/hr/dashboard', etag)
+    assert applied.status_code == 200 and b'<span>Cand 0</span>' in applied.data
+
+
+def test_pending_flash_is_always_rendered(app, hr_client):
+    def flash_pending():
+        with hr_client.session_transaction() as sess:
+            sess['_flashes'] = [('success', 'Job saved')]
+
+    flash_pending()
+    shown = hr_client.get('/hr/dashboard')
+    assert b'Job saved' in shown.data
+
+    # The same message again: the client has this exact page, but only a render consumes the flash
+    flash_pending()
+    again = revalidate(hr_client, '/hr/dashboard', shown.headers['ETag'].strip('"'))
+    assert again.status_code == 200 and b'Job saved' in again.data
+    with hr_client.session_transaction() as sess:
+        assert '_flashes' not in sess
+
+
+def test_candidate_dashboard_lists_applications_with_their_jobs(app, candidate):
+    client, candidate_id = candidate
+    empty = client.get('/candidate/dashboard')
+    assert b'<td>Senior Software Engineer</td>' not in empty.data
+
+    add_matches(app, job_ids(app)[0], [candidate_id], [50])
+    applied = revalidate(client, '/candidate/dashboard', empty.headers['ETag'].strip('"'))
+    assert applied.status_code == 200
+    assert b'<td>Senior Software Engineer</td>' in applied.data
+    assert revalidate(client, '/candidate/dashboard', applied.headers['ETag'].strip('"')).status_code == 304
+
+
+def test_application_statuses_get_their_own_icons(app, candidate):
+    client, candidate_id = candidate
+    first, second = job_ids(app)
+    with app.app_context():
+        db.session.add_all([
+            Application(candidate_id=candidate_id, job_id=first, resume_path='-'),
+            Application(candidate_id=candidate_id, job_id=second, resume_path='-', status='Accepted'),
+        ])
+        db.session.commit()
+
+    page = client.get('/candidate/dashboard').get_data(as_text=True)
+    rows = page.split('application-status status-')[1:]
+    icons = {row.split('"', 1)[0]: row.split('fas', 1)[1].split()[0] for row in rows}
+    assert icons == {'pending': 'fa-file-alt', 'accepted': 'fa-check-circle'}
+
+
+def test_editing_a_job_refreshes_its_skill_profile_and_ranking(app):
+    job_id = job_ids(app)[0]
+    candidate_id, = add_candidates(app, 1)
+    add_matches(app, job_id, [candidate_id], [0])
+    with app.app_context():
+        application = Application.query.one()
+        db.session.add(ApplicationSkills(application_id=application.id, skills='go rust'))
+        job = db.session.get(Job, job_id)
+        job.description, job.requirements = 'Go and Rust services', None
+        db.session.commit()
+
+        assert db.session.get(JobSkills, job_id).skills == 'go rust services'
+        assert JobMatch.query.one().score == 66.67
+
+        # Changes to other columns leave the profile alone
+        profiled_at = db.session.get(JobSkills, job_id).updated_at
+        db.session.get(Job, job_id).location = 'Berlin'
+        db.session.commit()
+        assert db.session.get(JobSkills, job_id).updated_at == profiled_at
@@ -0,0 +1,59 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from drive_service import DriveServiceFactory
+
+
+class FakeCredentials:
+    def __init__(self, expires_in):
+        self.token = 'token-0'
+        self.refresh_token = 'refresh'
+        self.expiry = datetime.utcnow() + timedelta(seconds=expires_in)
+        self.refreshes = 0
+
+    def refresh(self, request):
+        time.sleep(0.01)  # widen the window for concurrent refreshes
+        self.refreshes += 1
+        self.token = f'token-{self.refreshes}'
+        self.expiry = datetime.utcnow() + timedelta(hours=1)
+
+
+def _factory(creds, built):
+    return DriveServiceFactory(
+        token_path=None,
+        load_credentials=lambda: creds,
+        build_service=lambda c: built.append(threading.get_ident()) or object()
+    )
+
+
+def test_services_are_reused_per_thread():
+    creds = FakeCredentials(expires_in=3600)
+    built = []
+    factory = _factory(creds, built)
+
+    assert factory() is factory()
+    services = []
+    threads = [threading.Thread(target=lambda: services.append(factory())) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(built) == 5 and len(set(map(id, services))) == 4
+    assert creds.refreshes == 0
+
+
+def test_credentials_near_expiry_are_refreshed_once():
+    creds = FakeCredentials(expires_in=60)  # inside the 5 minute margin
+    factory = _factory(creds, [])
+
+    threads = [threading.Thread(target=factory) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert creds.refreshes == 1 and creds.token == 'token-1'
+    factory()
+    assert creds.refreshes == 1
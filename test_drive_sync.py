@@ -0,0 +1,177 @@
+import re
+
+import httplib2
+
+import app as app_module
+from app import DriveSync, ResumeRecord, db
+from drive_sync import GOOGLE_DOC_MIME_TYPE, download_files, is_retryable, list_folder_files, next_cursor
+
+
+class FakeMediaHttp:
+    """Serves ranged GETs like the Drive media endpoint"""
+
+    def __init__(self, data, fail_status=None):
+        self.data = data
+        self.fail_status = fail_status
+        self.ranges = []
+
+    def request(self, uri, method='GET', headers=None, **kwargs):
+        if self.fail_status:
+            return httplib2.Response({'status': self.fail_status}), b'boom'
+        start, end = map(int, re.match(r'bytes=(\d+)-(\d+)', headers['range']).groups())
+        self.ranges.append((start, end))
+        chunk = self.data[start:end + 1]
+        content_range = f'bytes {start}-{start + len(chunk) - 1}/{len(self.data)}'
+        return httplib2.Response({'status': 206, 'content-range': content_range}), chunk
+
+
+class FakeMediaRequest:
+    def __init__(self, uri, http):
+        self.uri = uri
+        self.http = http
+        self.headers = {}
+
+
+class FakeFiles:
+    def __init__(self, drive):
+        self.drive = drive
+
+    def list(self, q, pageSize, pageToken=None, **kwargs):
+        self.drive.queries.append(q)
+        since = re.search(r"modifiedTime >= '([^']+)'", q)
+        files = sorted((f for f in self.drive.listing if not since or f['modifiedTime'] >= since.group(1)),
+                       key=lambda f: f['modifiedTime'])
+        start = int(pageToken or 0)
+        page = {'files': files[start:start + pageSize]}
+        if start + pageSize < len(files):
+            page['nextPageToken'] = str(start + pageSize)
+        return FakeRequest(page)
+
+    def get_media(self, fileId):
+        return self.drive.media(fileId)
+
+    def export_media(self, fileId, mimeType):
+        self.drive.exported.append(fileId)
+        return self.drive.media(fileId)
+
+
+class FakeRequest:
+    def __init__(self, response):
+        self.response = response
+
+    def execute(self):
+        return self.response
+
+
+class FakeDrive:
+    def __init__(self, files, contents, failing=()):
+        self.listing = files
+        self.contents = contents
+        # file id -> HTTP status its download fails with; a plain collection means 500
+        self.failing = failing if isinstance(failing, dict) else dict.fromkeys(failing, 500)
+        self.queries = []
+        self.exported = []
+        self.https = {}
+
+    def files(self):
+        return FakeFiles(self)
+
+    def media(self, file_id):
+        http = self.https[file_id] = FakeMediaHttp(self.contents[file_id], self.failing.get(file_id))
+        return FakeMediaRequest(f'https://drive.test/{file_id}', http)
+
+
+def _drive(failing=()):
+    files = [
+        {'id': f'f{i}', 'name': f'cand_{i}.pdf', 'mimeType': 'application/pdf', 'modifiedTime': f'2024-01-0{i + 1}T00:00:00.000Z'}
+        for i in range(5)
+    ]
+    files.append({'id': 'doc', 'name': 'Cover', 'mimeType': GOOGLE_DOC_MIME_TYPE, 'modifiedTime': '2024-01-07T00:00:00.000Z'})
+    files.append({'id': 'img', 'name': 'photo.png', 'mimeType': 'image/png', 'modifiedTime': '2024-01-08T00:00:00.000Z'})
+    contents = {f['id']: f['id'].encode() * 100 for f in files}
+    return FakeDrive(files, contents, failing)
+
+
+def test_listing_follows_pages_and_cursor():
+    drive = _drive()
+    assert [f['id'] for f in list_folder_files(drive, 'folder', page_size=2)] == ['f0', 'f1', 'f2', 'f3', 'f4', 'doc', 'img']
+    assert len(drive.queries) == 4
+
+    recent = list_folder_files(drive, 'folder', modified_since='2024-01-05T00:00:00.000Z', page_size=2)
+    assert [f['id'] for f in recent] == ['f4', 'doc', 'img']
+
+
+def test_downloads_are_chunked_and_cursor_stops_at_failures(tmp_path):
+    drive = _drive(failing={'f2'})
+    downloads = list(download_files(lambda: drive, list_folder_files(drive, 'folder', page_size=2), str(tmp_path),
+                                    ('.pdf', '.docx'), workers=3, chunk_size=64, retries=0))
+    by_id = {d.file['id']: d for d in downloads}
+
+    assert open(by_id['f0'].path, 'rb').read() == drive.contents['f0']
+    assert len(drive.https['f0'].ranges) == 4  # 200 bytes in 64-byte chunks
+    assert by_id['doc'].path and drive.exported == ['doc']
+    assert by_id['img'].error == 'unsupported file type' and not by_id['img'].retryable
+    assert by_id['f2'].path is None and by_id['f2'].retryable
+    assert not [name for name in tmp_path.iterdir() if not any(d.path == str(name) for d in downloads)]
+
+    # The failed file is listed again next time; with no failures the newest timestamp wins
+    assert next_cursor(None, downloads) == '2024-01-03T00:00:00.000Z'
+    assert next_cursor(None, [d for d in downloads if not d.retryable]) == '2024-01-08T00:00:00.000Z'
+    assert next_cursor('2024-02-01T00:00:00.000Z', []) == '2024-02-01T00:00:00.000Z'
+
+
+def test_permanent_failures_do_not_hold_the_cursor(tmp_path):
+    drive = _drive(failing={'f1': 403, 'f2': 404, 'f3': 429})
+    downloads = {d.file['id']: d for d in download_files(
+        lambda: drive, list_folder_files(drive, 'folder'), str(tmp_path), ('.pdf', '.docx'), retries=0
+    )}
+    assert not downloads['f1'].retryable and not downloads['f2'].retryable
+    assert downloads['f3'].retryable
+    assert next_cursor(None, downloads.values()) == '2024-01-04T00:00:00.000Z'
+
+    del drive.failing['f3']
+    downloads = list(download_files(lambda: drive, list_folder_files(drive, 'folder'), str(tmp_path),
+                                    ('.pdf', '.docx'), retries=0))
+    assert next_cursor(None, downloads) == '2024-01-08T00:00:00.000Z'
+
+
+def test_drive_rate_limits_are_retried():
+    from googleapiclient.errors import HttpError
+
+    limited = b'{"error": {"errors": [{"reason": "userRateLimitExceeded"}], "code": 403}}'
+    assert is_retryable(HttpError(httplib2.Response({'status': 403}), limited))
+    assert not is_retryable(HttpError(httplib2.Response({'status': 403}), b'{"error": {"code": 403}}'))
+    assert is_retryable(OSError('connection reset'))
+
+
+def test_sync_route_imports_and_persists_the_cursor(app, hr_client, monkeypatch):
+    drive = _drive(failing={'f2': 500})
+    monkeypatch.setattr(app_module, 'get_google_drive_service', lambda: drive)
+    app.config['DRIVE_DOWNLOAD_RETRIES'] = 0
+
+    assert hr_client.post('/hr/drive/sync').status_code == 400
+    first = hr_client.post('/hr/drive/sync', data={'folder_id': 'folder'}).get_json()
+    assert first['imported'] == 5
+    assert {s['file'] for s in first['skipped']} == {'cand_2.pdf', 'photo.png'}
+    assert first['cursor'] == '2024-01-03T00:00:00.000Z'
+
+    # The next sync lists from the failed file on; files already stored are duplicates
+    del drive.failing['f2']
+    second = hr_client.post('/hr/drive/sync', data={'folder_id': 'folder'}).get_json()
+    assert "modifiedTime >= '2024-01-03T00:00:00.000Z'" in drive.queries[-1]
+    assert second['imported'] == 1
+    assert sorted(second['duplicates']) == ['Cover.docx', 'cand_3.pdf', 'cand_4.pdf']
+    with app.app_context():
+        state = db.session.get(DriveSync, 'folder')
+        assert (state.cursor, state.files_imported) == ('2024-01-08T00:00:00.000Z', 6)
+        assert ResumeRecord.query.filter_by(source='Google Drive').count() == 6
+
+
+def test_sync_route_reports_drive_errors(app, hr_client, monkeypatch):
+    def unavailable():
+        raise RuntimeError('no credentials')
+
+    monkeypatch.setattr(app_module, 'get_google_drive_service', unavailable)
+    response = hr_client.post('/hr/drive/sync', data={'folder_id': 'folder'})
+    assert response.status_code == 500
+    assert 'no credentials' in response.get_json()['error']
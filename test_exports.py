@@ -0,0 +1,62 @@
+import io
+
+from openpyxl import load_workbook
+
+from app import ScreeningJob, db, save_screening_results
+from exports import iter_csv
+
+RESULTS = [
+    {'resume': 'b.docx', 'name': 'Alan, T', 'email': 'alan@example.com', 'score': 40.0},
+    {'resume': 'a.docx', 'name': 'Ada', 'email': 'ada@example.com', 'score': 90.0},
+]
+
+
+def add_run(app, status='completed', results=RESULTS):
+    with app.app_context():
+        job = ScreeningJob(job_description='python', status=status)
+        db.session.add(job)
+        db.session.flush()
+        save_screening_results(job.id, results)
+        db.session.commit()
+        return job.id
+
+
+def test_csv_rows_are_yielded_one_at_a_time():
+    chunks = list(iter_csv(iter(RESULTS)))
+    assert chunks == ['Name,Email,Score (%)\r\n', '"Alan, T",alan@example.com,40.0\r\n', 'Ada,ada@example.com,90.0\r\n']
+
+
+def test_csv_export_streams_the_run_best_first(app, hr_client):
+    job_id = add_run(app)
+    response = hr_client.get(f'/download_results?job_id={job_id}&format=csv')
+    assert response.status_code == 200 and response.is_streamed
+    assert response.mimetype == 'text/csv'
+    assert response.headers['Content-Disposition'] == f'attachment; filename=screened_candidates_{job_id}.csv'
+    assert response.get_data(as_text=True).splitlines() == [
+        'Name,Email,Score (%)', 'Ada,ada@example.com,90.0', '"Alan, T",alan@example.com,40.0'
+    ]
+
+
+def test_xlsx_export_defaults_to_the_sessions_latest_run(app, hr_client):
+    job_id = add_run(app)
+    with hr_client.session_transaction() as sess:
+        sess['screening_job_id'] = job_id
+    response = hr_client.get('/download_results')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+    assert f'filename=screened_candidates_{job_id}.xlsx' in response.headers['Content-Disposition']
+
+    sheet = load_workbook(io.BytesIO(response.data))['Screened Candidates']
+    assert [list(row) for row in sheet.iter_rows(values_only=True)] == [
+        ['Name', 'Email', 'Score (%)'], ['Ada', 'ada@example.com', 90], ['Alan, T', 'alan@example.com', 40]
+    ]
+
+
+def test_export_errors(app, hr_client):
+    assert hr_client.get('/download_results').status_code == 404
+    assert hr_client.get('/download_results?job_id=missing').status_code == 404
+    assert hr_client.get(f'/download_results?job_id={add_run(app, status="running")}').status_code == 404
+
+    response = hr_client.get(f'/download_results?job_id={add_run(app)}&format=pdf')
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Unsupported export format: pdf'}
@@ -0,0 +1,63 @@
+import io
+
+from benchmarks import make_doc, make_docx, make_pdf
+from extraction import (
+    UNLIMITED, ExtractionLimits, extract_resume_text, extract_text_from_doc, extract_text_from_docx,
+    extract_text_from_pdf, iter_pdf_tokens, iter_resume_tokens,
+)
+from scoring import tokenize
+
+
+def _portfolio(pages=5):
+    lines = [f'page{page} line{line} python flask' for page in range(pages) for line in range(3)]
+    return make_pdf(lines, lines_per_page=3)
+
+
+def test_unlimited_extraction_reads_every_page():
+    text = extract_text_from_pdf(io.BytesIO(_portfolio()), UNLIMITED)
+    assert 'page0' in text and 'page4' in text
+    assert text.endswith('\n')
+
+
+def test_page_and_character_caps_stop_early():
+    by_pages = extract_text_from_pdf(io.BytesIO(_portfolio()), ExtractionLimits(max_pages=2, max_chars=None))
+    assert 'page1' in by_pages and 'page2' not in by_pages
+
+    by_chars = extract_text_from_pdf(io.BytesIO(_portfolio()), ExtractionLimits(max_pages=None, max_chars=50))
+    assert len(by_chars) == 50
+
+
+def test_token_stream_matches_tokenized_text():
+    for limits in (UNLIMITED, ExtractionLimits(max_pages=3, max_chars=130)):
+        text = extract_text_from_pdf(io.BytesIO(_portfolio()), limits)
+        assert list(iter_pdf_tokens(io.BytesIO(_portfolio()), limits)) == tokenize(text)
+
+
+def test_docx_paragraphs_are_extracted_in_order():
+    lines = ['Senior Python & Flask developer', 'docker kubernetes <aws>']
+    text = extract_text_from_docx(io.BytesIO(make_docx(lines)), UNLIMITED)
+    assert text == 'Senior Python & Flask developer\ndocker kubernetes <aws>\n'
+
+    capped = extract_text_from_docx(io.BytesIO(make_docx(lines * 20)), ExtractionLimits(None, 40))
+    assert len(capped) == 40
+
+
+def test_doc_fallback_recovers_body_text():
+    lines = [f'line{i} python flask postgresql' for i in range(5000)]
+    text = extract_text_from_doc(io.BytesIO(make_doc(lines)), UNLIMITED)
+    # Runs spanning read blocks are stitched back together
+    for i in (0, 2500, 4999):
+        assert f'line{i} python flask postgresql\n' in text
+
+
+def test_resume_helpers_dispatch_on_extension(tmp_path):
+    lines = ['python flask sql']
+    for name, data in (('a.pdf', make_pdf(lines)), ('a.docx', make_docx(lines)), ('a.doc', make_doc(lines))):
+        path = tmp_path / name
+        path.write_bytes(data)
+        assert 'python flask sql' in extract_resume_text(str(path))
+        assert {'python', 'flask', 'sql'} <= set(iter_resume_tokens(str(path)))
+
+    unknown = tmp_path / 'a.txt'
+    unknown.write_text('python')
+    assert extract_resume_text(str(unknown)) == ''
@@ -0,0 +1,74 @@
+from flask import session
+
+from app import User, db, get_current_identity, identity_cache
+from identity import Identity, IdentityCache
+
+
+def hr_id(app):
+    with app.app_context():
+        return User.query.filter_by(username='hr101').one().id
+
+
+def test_entries_expire_and_are_bounded(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr('identity.time.monotonic', lambda: now[0])
+    cache = IdentityCache(ttl=30, maxsize=2)
+    for user_id in (1, 2):
+        cache.set(user_id, Identity(user_id, 'u', 'e', 'hr', 'n'))
+    cache.get(1)
+    cache.set(3, Identity(3, 'u', 'e', 'hr', 'n'))
+    # The least recently used entry made room
+    assert cache.get(2) is None and cache.get(1).id == 1
+
+    now[0] += 31
+    assert cache.get(1) is None
+
+    # ttl=0 turns caching off
+    uncached = IdentityCache(ttl=0)
+    uncached.set(1, Identity(1, 'u', 'e', 'hr', 'n'))
+    assert uncached.get(1) is None
+
+
+def test_identity_is_loaded_once_per_request(app):
+    user_id = hr_id(app)
+    with app.test_request_context():
+        session['user_id'] = user_id
+        identity = get_current_identity()
+        assert identity.role == 'hr' and identity_cache.get(user_id) == identity
+
+        identity_cache.clear()
+        assert get_current_identity() is identity
+        assert identity_cache.get(user_id) is None
+
+
+def test_login_primes_and_logout_drops_the_identity(app):
+    client = app.test_client()
+    response = client.post('/login/hr', data={'username': 'hr101', 'password': 'hr1234'})
+    assert response.status_code == 302
+    user_id = hr_id(app)
+    assert identity_cache.get(user_id).username == 'hr101'
+
+    client.get('/logout')
+    assert identity_cache.get(user_id) is None
+
+
+def test_user_changes_invalidate_the_cached_identity(app, hr_client):
+    user_id = hr_id(app)
+    assert hr_client.get('/hr/dashboard').status_code == 200
+    assert identity_cache.get(user_id).role == 'hr'
+
+    with app.app_context():
+        db.session.get(User, user_id).role = 'candidate'
+        db.session.commit()
+    assert identity_cache.get(user_id) is None
+    # The demoted user is turned away on the next request
+    response = hr_client.get('/hr/dashboard')
+    assert response.status_code == 302 and response.location.endswith('/candidate/dashboard')
+
+    with app.app_context():
+        db.session.delete(db.session.get(User, user_id))
+        db.session.commit()
+    assert identity_cache.get(user_id) is None
+    assert hr_client.get('/hr/dashboard').status_code == 302
+    with hr_client.session_transaction() as sess:
+        assert 'user_id' not in sess
@@ -0,0 +1,131 @@
+import hashlib
+import io
+import os
+import zipfile
+from collections import namedtuple
+
+import pytest
+
+import app as app_module
+from app import ResumeFile, ResumeRecord, db
+from conftest import job_ids
+from ingestion import UploadTooLarge, copy_and_hash, iter_upload_members
+
+Upload = namedtuple('Upload', ['filename', 'stream'])
+
+
+def _zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+
+def test_copy_and_hash_streams_and_caps(tmp_path):
+    data = b'resume' * 1000
+    digest, size = copy_and_hash(io.BytesIO(data), tmp_path / 'a.pdf', chunk_size=64)
+    assert (digest, size) == (hashlib.sha256(data).hexdigest(), len(data))
+    assert (tmp_path / 'a.pdf').read_bytes() == data
+
+    with pytest.raises(UploadTooLarge):
+        copy_and_hash(io.BytesIO(data), tmp_path / 'b.pdf', max_bytes=100, chunk_size=64)
+    assert not (tmp_path / 'b.pdf').exists()
+
+
+def test_zip_members_and_plain_files_are_yielded_lazily():
+    archive = _zip({
+        'agency/a.pdf': b'pdf a',
+        'agency/b.DOCX': b'docx b',
+        'agency/notes.txt': b'notes',
+        '__MACOSX/agency/._a.pdf': b'fork',
+        'agency/.DS_Store': b'junk',
+    })
+    uploads = [Upload('batch.zip', archive), Upload('c.pdf', io.BytesIO(b'pdf c')), Upload('broken.zip', io.BytesIO(b'no'))]
+
+    seen = [(name, stream.read() if stream else None, error)
+            for name, stream, error in iter_upload_members(uploads, ('.pdf', '.docx', '.doc'))]
+
+    assert seen == [
+        ('batch.zip/agency/a.pdf', b'pdf a', None),
+        ('batch.zip/agency/b.DOCX', b'docx b', None),
+        ('batch.zip/agency/notes.txt', None, 'unsupported file type'),
+        ('c.pdf', b'pdf c', None),
+        ('broken.zip', None, 'not a valid zip archive'),
+    ]
+
+
+def _import(client, files, **form):
+    data = dict(form, resumes=[(io.BytesIO(content), name) for name, content in files.items()])
+    return client.post('/hr/resumes/import', data=data)
+
+
+def test_bulk_import_skips_content_already_stored(app, hr_client):
+    first = _import(hr_client, {'ada.pdf': b'ada', 'batch.zip': _zip({'alan.pdf': b'alan', 'notes.txt': b'x'}).getvalue()}).get_json()
+    assert first['imported'] == 2
+    assert first['skipped'] == [{'file': 'batch.zip/notes.txt', 'error': 'unsupported file type'}]
+
+    second = _import(hr_client, {'ada-renamed.pdf': b'ada', 'grace.pdf': b'grace', 'grace2.pdf': b'grace'}).get_json()
+    assert second['imported'] == 1
+    assert sorted(second['duplicates']) == ['ada-renamed.pdf', 'grace2.pdf']
+    with app.app_context():
+        assert ResumeFile.query.count() == ResumeRecord.query.count() == 3
+    resumes_dir = os.path.join(app.config['UPLOAD_FOLDER'], 'resumes')
+    assert len(os.listdir(resumes_dir)) == 3
+
+
+def test_bulk_import_commits_per_batch(app, hr_client, monkeypatch):
+    app.config['BULK_IMPORT_BATCH_SIZE'] = 2
+    batches = []
+    save = app_module.save_imported_resumes
+
+    def recording_save(batch, *args, **kwargs):
+        batches.append(len(batch))
+        save(batch, *args, **kwargs)
+        # Each batch is committed before the next one is read
+        assert not app_module.db.session.new and not app_module.db.session.dirty
+
+    monkeypatch.setattr(app_module, 'save_imported_resumes', recording_save)
+    job_id = job_ids(app)[0]
+    summary = _import(hr_client, {f'cand{i}.pdf': f'resume {i}'.encode() for i in range(5)}, job_id=job_id).get_json()
+    assert (summary['imported'], summary['job_id'], batches) == (5, job_id, [2, 2, 1])
+    with app.app_context():
+        assert {record.job_id for record in ResumeRecord.query} == {job_id}
+
+
+def test_concurrent_import_of_the_same_content_is_a_duplicate(app, monkeypatch):
+    digest = hashlib.sha256(b'ada').hexdigest()
+    with app.app_context():
+        # Stored by another request after this one checked for known hashes
+        db.session.add(ResumeFile(content_hash=digest, file_path='elsewhere.pdf'))
+        db.session.commit()
+    stored = app_module.stored_resume_hashes
+    calls = []
+
+    def racing_stored_hashes(hashes):
+        calls.append(1)
+        return set() if len(calls) == 1 else stored(hashes)
+
+    monkeypatch.setattr(app_module, 'stored_resume_hashes', racing_stored_hashes)
+
+    uploads = [Upload('ada.pdf', io.BytesIO(b'ada')), Upload('alan.pdf', io.BytesIO(b'alan'))]
+    resumes_dir = os.path.join(app.config['UPLOAD_FOLDER'], 'resumes')
+    with app.test_request_context():
+        summary = app_module.import_resumes(uploads, resumes_dir)
+        assert ResumeRecord.query.count() == 1
+    assert (summary['imported'], summary['duplicates']) == (1, ['ada.pdf'])
+    assert len(calls) == 2
+    assert len(os.listdir(resumes_dir)) == 1
+
+
+def test_import_route_has_its_own_body_limit(app, hr_client):
+    app.config['MAX_CONTENT_LENGTH'] = 1000
+    app.config['BULK_IMPORT_MAX_CONTENT_LENGTH'] = 100000
+    big = b'x' * 5000
+    assert _import(hr_client, {'big.pdf': big}).status_code == 200
+    response = hr_client.post('/upload_jd', data={'job_description': (io.BytesIO(big), 'jd.pdf')})
+    assert response.status_code == 413
+
+    app.config['BULK_IMPORT_MAX_CONTENT_LENGTH'] = 1000
+    assert _import(hr_client, {'big2.pdf': big + b'2'}).status_code == 413
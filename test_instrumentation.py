@@ -0,0 +1,99 @@
+import os
+
+import pytest
+from sqlalchemy import text
+
+import instrumentation
+from app import db
+from instrumentation import Gauge, Histogram, render_metrics, timed
+
+
+@pytest.fixture
+def app_config(tmp_path):
+    return {
+        'METRICS_ENABLED': True,
+        'PROFILING_ENABLED': True,
+        'PROFILING_TOKEN': 'profile-secret',
+        'PROFILE_DIR': str(tmp_path / 'profiles'),
+    }
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram('job_seconds', 'Job latency', buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value, {'queue': 'a"b'})
+    assert histogram.render().splitlines() == [
+        '# HELP job_seconds Job latency',
+        '# TYPE job_seconds histogram',
+        'job_seconds_bucket{queue="a\\"b",le="0.1"} 1',
+        'job_seconds_bucket{queue="a\\"b",le="1.0"} 2',
+        'job_seconds_bucket{queue="a\\"b",le="+Inf"} 3',
+        'job_seconds_sum{queue="a\\"b"} 5.550000',
+        'job_seconds_count{queue="a\\"b"} 3',
+    ]
+
+
+def test_failing_gauge_has_no_sample():
+    assert Gauge('depth', 'Queue depth', lambda: 3).render().endswith('\ndepth 3.0')
+    assert Gauge('depth', 'Queue depth', lambda: 1 / 0).render().splitlines() == [
+        '# HELP depth Queue depth', '# TYPE depth gauge'
+    ]
+
+
+def test_disabled_instrumentation_is_a_no_op():
+    calls = []
+    span = timed('test_disabled_span')(lambda: calls.append(1))
+    span()
+    assert calls == [1]
+    assert 'span="test_disabled_span"' not in render_metrics()
+
+
+@pytest.mark.parametrize('app_config', [{}])
+def test_metrics_route_needs_metrics_enabled(app):
+    assert not instrumentation.is_enabled()
+    assert app.test_client().get('/metrics').status_code == 404
+
+
+def test_metrics_exposition(app):
+    client = app.test_client()
+    client.get('/')
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    body = response.get_data(as_text=True)
+    assert '# TYPE http_request_duration_seconds histogram' in body
+    assert 'http_request_duration_seconds_count{endpoint="main.role_selection",method="GET",status="200"} 1' in body
+    assert 'sql_query_duration_seconds_count{statement="SELECT"}' in body
+    assert '# TYPE jira_outbox_depth gauge' in body
+
+
+def test_metrics_need_the_token_or_a_local_client(app):
+    client = app.test_client()
+    assert client.get('/metrics', environ_base={'REMOTE_ADDR': '10.0.0.5'}).status_code == 403
+
+    app.config['METRICS_TOKEN'] = 'scrape-secret'
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'}).status_code == 200
+
+
+def test_profile_is_dumped_only_for_the_profiling_token(app):
+    client = app.test_client()
+    profile_dir = app.config['PROFILE_DIR']
+
+    assert 'X-Profile-File' not in client.get('/', headers={'X-Profile': 'guess'}).headers
+    assert not os.path.exists(profile_dir)
+
+    response = client.get('/', headers={'X-Profile': 'profile-secret'})
+    file_name = response.headers['X-Profile-File']
+    assert os.listdir(profile_dir) == [file_name]
+    assert file_name.endswith('_main.role_selection.prof')
+
+
+def test_failed_statement_does_not_skew_later_timings(app):
+    with app.app_context(), db.engine.connect() as conn:
+        with pytest.raises(Exception):
+            conn.execute(text('SELECT * FROM no_such_table'))
+        assert conn.info['_query_started'] == []
+        conn.execute(text('SELECT 1'))
+        assert conn.info['_query_started'] == []
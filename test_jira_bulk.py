@@ -0,0 +1,103 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from jira_integration import JiraClient, issue_fields
+
+
+class StubJira(BaseHTTPRequestHandler):
+    """Just enough of the Jira REST API: bulk create, edit, and one 429 per endpoint"""
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=None, headers=None):
+        data = json.dumps(body).encode() if body is not None else b''
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _throttled(self):
+        state = self.server.state
+        with state['lock']:
+            state['calls'].append((self.command, self.path))
+            if self.command not in state['throttled']:
+                state['throttled'].add(self.command)
+                self._send(429, {'errorMessages': ['rate limited']}, {'Retry-After': '0'})
+                return True
+        return False
+
+    def do_GET(self):
+        self.server.state['calls'].append((self.command, self.path))
+        self._send(500)
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if self._throttled():
+            return
+        issues, errors = [], []
+        for i, update in enumerate(payload['issueUpdates']):
+            if update['fields']['summary'] == 'bad':
+                errors.append({'failedElementNumber': i, 'elementErrors': {'errors': {'summary': 'invalid'}}})
+            else:
+                with self.server.state['lock']:
+                    self.server.state['next_id'] += 1
+                    key = f"HR-{self.server.state['next_id']}"
+                issues.append({'id': key, 'key': key})
+        self._send(201, {'issues': issues, 'errors': errors})
+
+    def do_PUT(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        if self._throttled():
+            return
+        key = self.path.rsplit('/', 1)[1]
+        if key == 'NOPE-1':
+            self._send(404, {'errorMessages': ['Issue does not exist']})
+            return
+        self.server.state['updated'][key] = payload['fields']
+        self._send(204)
+
+
+@pytest.fixture
+def stub():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubJira)
+    server.state = {'lock': threading.Lock(), 'calls': [], 'throttled': set(), 'next_id': 0, 'updated': {}}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _client(server):
+    host, port = server.server_address
+    return JiraClient(server=f'http://{host}:{port}', email='hr@example.com', api_token='token', max_workers=3, backoff=0)
+
+
+def test_bulk_create_batches_and_retries_rate_limits(stub):
+    client = _client(stub)
+    issues = [issue_fields('HR', f'Interview candidate {i}', 'Shortlisted') for i in range(120)]
+    issues[55] = issue_fields('HR', 'bad', 'Rejected by the stub')
+
+    keys, message = client.create_issues(issues)
+
+    assert len(keys) == 120 and keys[55] is None
+    assert len(set(keys) - {None}) == 119
+    assert message == 'Created 119 of 120 issues, 1 failed'
+    posts = [path for method, path in stub.state['calls'] if method == 'POST']
+    assert posts == ['/rest/api/2/issue/bulk'] * 4  # 3 batches of <= 50, plus one rate-limited attempt
+
+
+def test_updates_skip_the_fetch(stub):
+    client = _client(stub)
+
+    errors = client.update_issues({'HR-1': {'summary': 'Moved to interview'}, 'HR-2': {'labels': ['shortlist']}, 'NOPE-1': {}})
+
+    assert list(errors) == ['NOPE-1']
+    assert stub.state['updated'] == {'HR-1': {'summary': 'Moved to interview'}, 'HR-2': {'labels': ['shortlist']}}
+    assert not [call for call in stub.state['calls'] if call[0] == 'GET']
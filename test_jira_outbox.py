@@ -0,0 +1,160 @@
+import sqlite3
+import time
+
+import pytest
+
+import app as app_module
+from app import ScreeningJob, db, save_screening_results
+from jira_outbox import JiraOutbox
+
+
+class FakeClient:
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.created = []
+        self.updates = []
+
+    def create_issues(self, issues):
+        keys = []
+        for fields in issues:
+            if fields['summary'] in self.failing:
+                keys.append(None)
+            else:
+                self.created.append(fields)
+                keys.append(f'HR-{len(self.created)}')
+        return keys, 'ok'
+
+    def update_issues(self, updates):
+        self.updates.append(updates)
+        return {key: 'rejected' for key in updates if key in self.failing}
+
+
+def test_updates_to_one_issue_are_coalesced(tmp_path):
+    client = FakeClient()
+    outbox = JiraOutbox(str(tmp_path / 'outbox.db'), lambda: client)
+    first = outbox.enqueue_create({'summary': 'Interview Ana'})
+    outbox.enqueue_update('HR-7', {'summary': 'old', 'labels': ['a']})
+    outbox.enqueue_update('HR-8', {'labels': ['b']})
+    outbox.enqueue_update('HR-7', {'summary': 'new'})
+    assert outbox.stats()['depth'] == 4
+
+    assert outbox.drain_once() == 4
+    assert client.updates == [{'HR-7': {'summary': 'new', 'labels': ['a']}, 'HR-8': {'labels': ['b']}}]
+    assert outbox.get(first)['issue_key'] == 'HR-1'
+    assert outbox.stats()['depth'] == 0 and outbox.drain_once() == 0
+
+
+def test_failures_back_off_and_survive_a_restart(tmp_path):
+    path = str(tmp_path / 'outbox.db')
+    outbox = JiraOutbox(path, lambda: FakeClient(failing={'flaky', 'HR-9'}), max_attempts=2, retry_backoff=0)
+    flaky = outbox.enqueue_create({'summary': 'flaky'})
+    outbox.enqueue_update('HR-9', {'labels': ['x']})
+
+    outbox.drain_once()
+    assert outbox.get(flaky)['status'] == 'pending' and outbox.get(flaky)['attempts'] == 1
+    outbox.drain_once()
+    assert outbox.get(flaky)['status'] == 'failed'
+    assert outbox.stats()['failed'] == 2
+
+    pending = outbox.enqueue_create({'summary': 'Interview Bo'})
+    outbox.close()
+
+    # A new process picks up what was left in the queue
+    client = FakeClient()
+    restarted = JiraOutbox(path, lambda: client, poll_interval=0.01)
+    restarted.start()
+    deadline = time.time() + 5
+    while restarted.get(pending)['status'] == 'pending' and time.time() < deadline:
+        time.sleep(0.01)
+    restarted.close()
+    assert client.created == [{'summary': 'Interview Bo'}]
+
+
+def test_claimed_rows_are_leased_to_one_process(tmp_path):
+    path = str(tmp_path / 'outbox.db')
+    first_client, second_client = FakeClient(), FakeClient()
+    first = JiraOutbox(path, lambda: first_client)
+    second = JiraOutbox(path, lambda: second_client)
+    first.enqueue_create({'summary': 'Interview Cy'})
+
+    rows = first._claim()
+    assert len(rows) == 1
+    # Another worker sharing the file skips the leased row
+    assert second.drain_once() == 0
+    first._record([(rows[0], 'HR-1', None)])
+    assert second.get(rows[0][0])['status'] == 'done'
+    assert second_client.created == []
+
+
+def test_failed_claim_releases_the_write_lock(tmp_path):
+    path = str(tmp_path / 'outbox.db')
+    outbox = JiraOutbox(path, FakeClient)
+    outbox.enqueue_create({'summary': 'Interview Di'})
+    outbox.batch_size = 'not a number'
+    with pytest.raises(sqlite3.Error):
+        outbox._claim()
+    assert not outbox._conn.in_transaction
+
+    other = sqlite3.connect(path, timeout=0)
+    other.execute('BEGIN IMMEDIATE')
+    other.rollback()
+    other.close()
+    outbox.close()
+
+
+def wait_until_sent(client, outbox_id):
+    deadline = time.time() + 5
+    while time.time() < deadline:
+        entry = client.get(f'/jira/outbox?id={outbox_id}').get_json()
+        if entry['status'] != 'pending':
+            return entry
+        time.sleep(0.01)
+    raise AssertionError(f'outbox entry {outbox_id} was not sent')
+
+
+def test_shortlist_tickets_are_queued_and_sent(app, hr_client):
+    client = FakeClient()
+    app_module.jira_outbox.client_factory = lambda: client
+    app_module.jira_outbox.poll_interval = 0.01
+    with app.app_context():
+        job = ScreeningJob(job_description='python', status='completed')
+        db.session.add(job)
+        db.session.flush()
+        save_screening_results(job.id, [
+            {'resume': 'a.docx', 'name': 'Ada', 'email': 'ada@example.com', 'score': 90.0},
+            {'resume': 'b.docx', 'name': 'Alan', 'email': 'alan@example.com', 'score': 50.0},
+        ])
+        running = ScreeningJob(job_description='python', status='running')
+        db.session.add(running)
+        db.session.commit()
+        job_id, running_id = job.id, running.id
+
+    app.config['JIRA_PROJECT_KEY'] = None
+    assert hr_client.post(f'/screening/jobs/{job_id}/jira').status_code == 400
+    assert hr_client.post(f'/screening/jobs/{running_id}/jira', data={'project_key': 'HR'}).status_code == 409
+    assert hr_client.post('/screening/jobs/missing/jira', data={'project_key': 'HR'}).status_code == 404
+
+    response = hr_client.post(f'/screening/jobs/{job_id}/jira', data={'project_key': 'HR', 'min_score': 70})
+    assert response.status_code == 202
+    queued = response.get_json()
+    assert queued['queued'] == 1
+    assert wait_until_sent(hr_client, queued['outbox_ids'][0])['issue_key'] == 'HR-1'
+    assert client.created[0]['summary'] == 'Interview Ada (90)'
+    assert client.created[0]['project'] == {'key': 'HR'}
+
+
+def test_issue_updates_are_queued(app, hr_client):
+    client = FakeClient()
+    app_module.jira_outbox.client_factory = lambda: client
+    app_module.jira_outbox.poll_interval = 0.01
+
+    assert hr_client.post('/jira/issues/HR-3', json={}).status_code == 400
+    assert hr_client.post('/jira/issues/HR-3', json={'fields': ['labels']}).status_code == 400
+    response = hr_client.post('/jira/issues/HR-3', json={'fields': {'labels': ['interview']}})
+    assert response.status_code == 202
+    assert wait_until_sent(hr_client, response.get_json()['outbox_id'])['status'] == 'done'
+    assert client.updates == [{'HR-3': {'labels': ['interview']}}]
+
+    stats = hr_client.get('/jira/outbox').get_json()
+    assert (stats['depth'], stats['flushed'], stats['running']) == (0, 1, True)
+    assert hr_client.get('/jira/outbox?id=999').status_code == 404
@@ -0,0 +1,38 @@
+from job_listing import ActiveJobsCache, JobSummary
+
+
+def test_listing_is_loaded_once_until_invalidated():
+    cache = ActiveJobsCache(ttl=60)
+    loads = []
+
+    def load():
+        loads.append(1)
+        return [JobSummary(1, 'Engineer', 'Tech Corp', 'Remote')]
+
+    assert cache.get(load) == (JobSummary(1, 'Engineer', 'Tech Corp', 'Remote'),)
+    cache.get(load)
+    assert len(loads) == 1
+
+    cache.invalidate()
+    cache.get(load)
+    assert len(loads) == 2
+
+
+def test_expired_listing_is_reloaded():
+    cache = ActiveJobsCache(ttl=0)
+    loads = []
+    cache.get(lambda: loads.append(1) or [])
+    cache.get(lambda: loads.append(1) or [])
+    assert len(loads) == 2
+
+
+def test_invalidation_during_load_is_not_cached_over():
+    cache = ActiveJobsCache(ttl=60)
+
+    def stale_load():
+        # A job changes while the old listing is being read
+        cache.invalidate()
+        return [JobSummary(1, 'Old title', None, None)]
+
+    assert cache.get(stale_load)[0].title == 'Old title'
+    assert cache.get(lambda: [JobSummary(1, 'New title', None, None)])[0].title == 'New title'
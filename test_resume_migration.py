@@ -0,0 +1,54 @@
+import json
+import os
+
+from app import ResumeRecord, db, migrate_resume_database_json
+
+ENTRIES = [
+    {'id': 'r1', 'name': 'Ada', 'email': 'ada@example.com', 'dateAdded': '2024-01-02',
+     'applicationId': '7', 'jobId': 2, 'score': 80},
+    # Unreadable date and ids are stored as NULL rather than failing the import
+    {'id': 'r2', 'name': 'Alan', 'appliedDate': 'last tuesday', 'applicationId': 'n/a', 'jobId': ''},
+    # The same id twice: the first entry wins
+    {'id': 'r1', 'name': 'Ada again'},
+    {'name': 'No id'},
+]
+
+
+def write_legacy_json(app, entries):
+    path = os.path.join(app.config['UPLOAD_FOLDER'], 'resume_database.json')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(entries, f)
+    return path
+
+
+def test_legacy_json_is_imported_once(app):
+    path = write_legacy_json(app, ENTRIES)
+    with app.app_context():
+        assert migrate_resume_database_json() == 3
+        records = {record.id: record for record in ResumeRecord.query}
+
+        ada = records['r1']
+        assert ada.name == 'Ada'
+        assert ada.applied_date.isoformat() == '2024-01-02T00:00:00'
+        assert (ada.application_id, ada.job_id, ada.score, ada.status) == (7, 2, 80, 'New')
+
+        alan = records['r2']
+        assert (alan.applied_date, alan.application_id, alan.job_id) == (None, None, None)
+
+        assert [r.name for r in records.values() if r.id not in ('r1', 'r2')] == ['No id']
+
+    assert not os.path.exists(path)
+    assert os.path.exists(path + '.migrated')
+    with app.app_context():
+        assert migrate_resume_database_json() == 0
+
+
+def test_records_already_in_the_database_are_skipped(app):
+    with app.app_context():
+        db.session.add(ResumeRecord(id='r1', name='Existing'))
+        db.session.commit()
+    write_legacy_json(app, ENTRIES)
+    with app.app_context():
+        assert migrate_resume_database_json() == 2
+        assert db.session.get(ResumeRecord, 'r1').name == 'Existing'
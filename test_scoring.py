@@ -0,0 +1,99 @@
+import random
+
+import pytest
+
+import scoring
+
+from scoring import DocumentTermMatrix, InvertedIndex, batch_score, keyword_score, rank_top_k, tokenize
+
+
+def _legacy_screen_resume(resume_text, job_description):
+    # Original list-scan implementation, kept here as the reference formula
+    keywords = job_description.lower().split()
+    resume_words = resume_text.lower().split()
+    matched = sum(1 for word in keywords if word in resume_words)
+    score = (matched / len(keywords)) * 100 if keywords else 0
+    return min(100, round(score, 2))
+
+
+def test_index_matches_legacy_percentage_scores():
+    rng = random.Random(7)
+    vocab = ['python', 'flask', 'sql', 'aws', 'docker', 'java', 'react', 'go', 'rust', 'Team', 'lead']
+    job_description = ' '.join(rng.choice(vocab) for _ in range(25))
+
+    index = InvertedIndex()
+    resumes = {}
+    for i in range(50):
+        text = ' '.join(rng.choice(vocab) for _ in range(rng.randint(0, 40)))
+        resumes[f'resume_{i}.pdf'] = text
+        index.add(f'resume_{i}.pdf', text)
+
+    scores = index.score(job_description)
+    for doc_id, text in resumes.items():
+        assert scores[doc_id] == _legacy_screen_resume(text, job_description)
+        assert keyword_score(tokenize(job_description), set(tokenize(text))) == scores[doc_id]
+
+
+def test_empty_job_description_scores_zero():
+    index = InvertedIndex()
+    index.add('a', 'python flask')
+    assert index.score('') == {'a': 0}
+
+
+def test_readding_and_removing_documents():
+    index = InvertedIndex()
+    index.add('a', 'python python flask')
+    index.add('a', 'java')
+    assert index.score('python')['a'] == 0
+    assert index.remove('a')
+    assert 'a' not in index
+    assert index.postings == {}
+
+
+def test_ranking_modes_prefer_rarer_matches():
+    index = InvertedIndex()
+    index.add('common', 'python python team')
+    index.add('rare', 'kubernetes team')
+    index.add('other', 'python team')
+    for mode in ('tfidf', 'bm25'):
+        scores = index.score('kubernetes python', mode=mode)
+        assert scores['rare'] > scores['other']
+
+
+def test_batch_scoring_matches_legacy_and_index():
+    rng = random.Random(11)
+    vocab = ['python', 'flask', 'sql', 'aws', 'docker', 'java', 'react', 'go']
+    job_description = ' '.join(rng.choice(vocab) for _ in range(15))
+    documents = [(i, ' '.join(rng.choice(vocab) for _ in range(rng.randint(0, 30)))) for i in range(40)]
+
+    matrix = DocumentTermMatrix.from_documents(documents)
+    index = InvertedIndex()
+    for doc_id, text in documents:
+        index.add(doc_id, text)
+
+    coverage = batch_score(job_description, matrix)
+    assert coverage == {doc_id: _legacy_screen_resume(text, job_description) for doc_id, text in documents}
+    assert batch_score(job_description, matrix, mode='cosine') == index.score(job_description, mode='cosine')
+
+
+def test_matrix_numpy_and_python_paths_agree(monkeypatch):
+    pytest.importorskip('numpy')
+    rng = random.Random(5)
+    vocab = ['python', 'flask', 'sql', 'aws', 'docker', 'java']
+    keywords = [rng.choice(vocab) for _ in range(10)]
+    matrix = DocumentTermMatrix.from_documents(
+        (i, ' '.join(rng.choice(vocab) for _ in range(rng.randint(0, 20)))) for i in range(30)
+    )
+    vectorized = (matrix.coverage_scores(keywords), matrix.cosine_scores(keywords))
+
+    monkeypatch.setattr(scoring, 'np', None)
+    assert (matrix.coverage_scores(keywords), matrix.cosine_scores(keywords)) == vectorized
+
+
+def test_rank_top_k_matches_stable_sort():
+    rng = random.Random(3)
+    results = [{'resume': i, 'score': rng.choice([0, 25.5, 50, 75, 100])} for i in range(200)]
+    expected = sorted(results, key=lambda r: r['score'], reverse=True)
+    assert rank_top_k(results, 10) == expected[:10]
+    assert rank_top_k(results, None) == expected
+    assert rank_top_k(results, 0) == []
@@ -0,0 +1,176 @@
+import io
+import os
+
+import pytest
+from werkzeug.datastructures import FileStorage
+
+import app as app_module
+from app import Application, Job, JobDescription, ResumeRecord, ScreeningJob, ScreeningScore, User, db, run_screening_job
+from benchmarks import make_docx
+from conftest import job_ids, upload_jd, write_resumes
+
+JD = 'python flask sql docker kubernetes'
+
+
+def screen(client, **form):
+    response = client.post('/screen_resumes', data=form)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def test_repeat_run_reuses_scores_by_content_hash(app, hr_client):
+    paths = write_resumes(app, {'ada_lovelace_1_a': 'python flask sql', 'alan_turing_2_b': 'python'})
+    jd_job = job_ids(app)[0]
+    upload_jd(hr_client, jd_job, JD)
+
+    first = screen(hr_client, job_id=jd_job)
+    assert first['throughput']['reused'] == 0
+    with app.app_context():
+        assert ScreeningScore.query.count() == 2
+
+    # Only the new file and the changed file are scored again
+    write_resumes(app, {'alan_turing_2_b': 'python docker', 'grace_hopper_3_c': 'kubernetes'})
+    second = screen(hr_client, job_id=jd_job)
+    assert second['throughput']['reused'] == 1
+    assert second['throughput']['files'] == 2
+    scores = {r['resume']: r['score'] for r in second['results']}
+    assert scores == {
+        os.path.basename(paths[0]): 60.0, 'alan_turing_2_b.docx': 40.0, 'grace_hopper_3_c.docx': 20.0
+    }
+
+
+def test_scores_are_written_back_to_the_jds_job_only(app, hr_client):
+    path, = write_resumes(app, {'ada_lovelace_1_a': 'python flask sql'})
+    jd_job, other_job = job_ids(app)
+    with app.app_context():
+        candidate_id = User.query.filter_by(username='hr101').one().id
+        db.session.add_all([
+            Application(candidate_id=candidate_id, job_id=jd_job, resume_path=path),
+            Application(candidate_id=candidate_id, job_id=other_job, resume_path=path, score=5.0),
+            ResumeRecord(id='same-job', job_id=jd_job, file_path=path),
+            ResumeRecord(id='other-job', job_id=other_job, file_path=path, score=5.0),
+        ])
+        db.session.commit()
+    upload_jd(hr_client, jd_job, JD)
+
+    screen(hr_client, job_id=jd_job)
+    with app.app_context():
+        assert {a.job_id: a.score for a in Application.query} == {jd_job: 60.0, other_job: 5.0}
+        assert db.session.get(ResumeRecord, 'same-job').score == 60.0
+        assert db.session.get(ResumeRecord, 'other-job').score == 5.0
+
+
+def test_background_jobs_store_scores_without_writing_back(app):
+    path, = write_resumes(app, {'ada_lovelace_1_a': 'python flask sql'})
+    with app.app_context():
+        candidate_id = User.query.filter_by(username='hr101').one().id
+        db.session.add(Application(candidate_id=candidate_id, job_id=job_ids(app)[0], resume_path=path))
+        job = ScreeningJob(job_description=JD)
+        db.session.add(job)
+        db.session.commit()
+        job_id = job.id
+
+    run_screening_job(app, job_id)
+    with app.app_context():
+        assert ScreeningScore.query.count() == 1
+        assert Application.query.one().score is None
+
+
+def test_upload_jd_stores_one_file_per_job(app, hr_client):
+    jd_job = job_ids(app)[0]
+    jds_dir = os.path.join(app.config['UPLOAD_FOLDER'], 'jds')
+
+    response = upload_jd(hr_client, jd_job, 'python flask', filename='Senior JD.docx')
+    assert response.status_code == 200
+    assert response.get_json() == {
+        'message': 'Job description uploaded successfully', 'job_id': jd_job,
+        'file_name': 'Senior_JD.docx', 'keywords': 2
+    }
+    first, = os.listdir(jds_dir)
+
+    # A new upload replaces the job's previous file
+    upload_jd(hr_client, jd_job, 'python flask sql')
+    second, = os.listdir(jds_dir)
+    assert second != first
+    with app.app_context():
+        assert db.session.get(JobDescription, jd_job).keywords() == ['python', 'flask', 'sql']
+
+
+def test_upload_jd_rejects_unknown_job_and_unreadable_file(app, hr_client):
+    assert upload_jd(hr_client, 9999, JD).status_code == 400
+
+    jd_job = job_ids(app)[0]
+    upload_jd(hr_client, jd_job, JD)
+    jds_dir = os.path.join(app.config['UPLOAD_FOLDER'], 'jds')
+    stored = os.listdir(jds_dir)
+
+    response = hr_client.post('/upload_jd', data={
+        'job_id': jd_job, 'job_description': (io.BytesIO(b'not a pdf'), 'broken.pdf')
+    })
+    assert response.status_code == 400
+    assert 'Could not read the job description' in response.get_json()['error']
+    # No orphan upload, and the job keeps its previous JD
+    assert os.listdir(jds_dir) == stored
+    with app.app_context():
+        assert db.session.get(JobDescription, jd_job).file_path == os.path.join(jds_dir, stored[0])
+
+
+def jd_upload(text):
+    return FileStorage(stream=io.BytesIO(make_docx([text])), filename='jd.docx')
+
+
+def test_concurrent_first_jd_uploads_keep_the_last(app):
+    jd_job = job_ids(app)[0]
+    with app.app_context():
+        job = db.session.get(Job, jd_job)
+        assert job.jd is None
+        # Another request stores the job's first JD after this one has looked
+        with db.engine.begin() as conn:
+            conn.execute(db.insert(JobDescription).values(
+                job_id=jd_job, file_name='other.docx', file_path='other.docx', content_hash='-', text='java', tokens='java'
+            ))
+
+        jd = app_module.save_job_description(job, jd_upload('python flask'))
+        assert jd.keywords() == ['python', 'flask']
+        assert JobDescription.query.one().file_path == jd.file_path and os.path.exists(jd.file_path)
+
+
+def test_failed_jd_save_leaves_no_file(app, monkeypatch):
+    def broken_refresh(job):
+        raise RuntimeError('database is locked')
+    monkeypatch.setattr(app_module, 'refresh_job_skills', broken_refresh)
+
+    with app.app_context():
+        with pytest.raises(RuntimeError):
+            app_module.save_job_description(db.session.get(Job, job_ids(app)[0]), jd_upload('python'))
+        assert JobDescription.query.count() == 0
+    assert os.listdir(os.path.join(app.config['UPLOAD_FOLDER'], 'jds')) == []
+
+
+def test_screening_uses_the_requested_job_or_the_latest_upload(app, hr_client):
+    write_resumes(app, {'ada_lovelace_1_a': 'python flask sql'})
+    first, second = job_ids(app)
+    upload_jd(hr_client, first, 'python flask')
+    upload_jd(hr_client, second, 'java spring')
+
+    assert screen(hr_client, job_id=first)['results'][0]['score'] == 100.0
+    per_job = screen(hr_client, job_id=second)
+    assert per_job['jd_job_id'] == second and per_job['results'][0]['score'] == 0
+
+    # Without a job_id, the user's most recent upload is used
+    latest = screen(hr_client)
+    assert latest['jd_job_id'] == second
+
+    with app.app_context():
+        db.session.delete(db.session.get(JobDescription, second))
+        db.session.commit()
+    assert screen(hr_client)['jd_job_id'] == first
+    assert hr_client.post('/screen_resumes', data={'job_id': second}).status_code == 400
+
+
+def test_requested_workers_are_capped(app, hr_client):
+    write_resumes(app, {'ada_lovelace_1_a': 'python flask sql'})
+    jd_job = job_ids(app)[0]
+    upload_jd(hr_client, jd_job, JD)
+    app.config['SCREENING_MAX_WORKERS'] = 1
+    assert screen(hr_client, job_id=jd_job, workers=64)['throughput']['workers'] == 1
@@ -0,0 +1,47 @@
+import time
+
+from benchmarks import make_pdf
+from screening import _start_pool, _terminate, build_index
+from text_cache import TextCache
+
+
+def _corpus(tmp_path):
+    words = ['python', 'flask', 'sql', 'docker', 'java', 'react']
+    files = []
+    for i in range(12):
+        path = tmp_path / f'candidate_{i}_1700000000_cv.pdf'
+        path.write_bytes(make_pdf([' '.join(words[j % len(words)] for j in range(i, i + 1 + i % 4))]))
+        files.append((path.name, str(path)))
+    broken = tmp_path / 'broken_0_1700000000_cv.pdf'
+    broken.write_bytes(b'not a pdf')
+    files.append((broken.name, str(broken)))
+    return files
+
+
+def test_parallel_screening_matches_serial(tmp_path):
+    files = _corpus(tmp_path)
+    job_description = 'python sql docker kubernetes'
+
+    serial, serial_errors, _ = build_index(files)
+    cache = TextCache(str(tmp_path / 'cache.db'))
+    parallel, parallel_errors, throughput = build_index(files, cache=cache, workers=2, chunk_size=4, timeout=30)
+
+    assert serial.score(job_description) == parallel.score(job_description)
+    assert set(serial_errors) == set(parallel_errors) == {'broken_0_1700000000_cv.pdf'}
+    assert throughput['files'] == len(files)
+    assert throughput['files_per_second'] > 0
+    # Workers populated the shared on-disk cache
+    assert cache.stats()['entries'] == len(files) - 1
+
+
+def test_stuck_workers_are_killed():
+    executor, context = _start_pool(1)
+    future = executor.submit(time.sleep, 30)
+    deadline = time.time() + 10
+    while not future.running() and time.time() < deadline:
+        time.sleep(0.01)
+
+    _terminate(executor, context)
+    for process in context.processes:
+        process.join(5)
+        assert not process.is_alive()
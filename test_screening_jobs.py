@@ -0,0 +1,131 @@
+import time
+from datetime import datetime, timedelta
+
+import app as app_module
+from app import ScreeningJob, ScreeningResult, db
+from conftest import job_ids, upload_jd, write_resumes
+
+JD = 'python flask sql docker kubernetes'
+RESUMES = {
+    'ada_lovelace_1_a': 'python flask sql docker kubernetes',
+    'alan_turing_2_b': 'python flask sql',
+    'grace_hopper_3_c': 'python',
+    'linus_t_4_d': 'cobol fortran',
+}
+
+
+def wait_for(client, job_id, status='completed', timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        body = client.get(f'/screening/jobs/{job_id}').get_json()
+        if body['status'] == status:
+            return body
+        time.sleep(0.05)
+    raise AssertionError(f'job {job_id} is still {body["status"]}')
+
+
+def add_job(app, **fields):
+    with app.app_context():
+        job = ScreeningJob(job_description=JD, **fields)
+        db.session.add(job)
+        db.session.commit()
+        return job.id
+
+
+def get_job(app, job_id):
+    with app.app_context():
+        return db.session.get(ScreeningJob, job_id).to_dict()
+
+
+def test_submitted_job_runs_and_pages_its_results(app, hr_client):
+    write_resumes(app, RESUMES)
+    jd_job = job_ids(app)[0]
+    assert upload_jd(hr_client, jd_job, JD).status_code == 200
+
+    response = hr_client.post('/screening/jobs', data={'job_id': jd_job})
+    assert response.status_code == 202
+    submitted = response.get_json()
+    assert submitted['status'] == 'queued'
+
+    status = wait_for(hr_client, submitted['job_id'])
+    assert status['processed'] == status['total'] == len(RESUMES)
+
+    first = hr_client.get(submitted['results_url'] + '?per_page=2').get_json()
+    assert first['has_next'] and first['page'] is None
+    assert [r['score'] for r in first['results']] == [100.0, 60.0]
+    second = hr_client.get(submitted['results_url'] + f'?per_page=2&cursor={first["next_cursor"]}').get_json()
+    assert not second['has_next'] and second['next_cursor'] is None
+    assert [r['score'] for r in second['results']] == [20.0, 0.0]
+
+    paged = hr_client.get(submitted['results_url'] + '?per_page=2&page=2').get_json()
+    assert paged['page'] == 2 and paged['results'] == second['results']
+    filtered = hr_client.get(submitted['results_url'] + '?min_score=50').get_json()
+    assert len(filtered['results']) == 2
+    assert hr_client.get(submitted['results_url'] + '?cursor=not-a-cursor').status_code == 400
+
+
+def test_submit_needs_a_job_description_and_known_mode(app, hr_client):
+    jd_job = job_ids(app)[0]
+    assert hr_client.post('/screening/jobs', data={'job_id': jd_job}).status_code == 400
+    upload_jd(hr_client, jd_job, JD)
+    assert hr_client.post('/screening/jobs', data={'job_id': jd_job, 'mode': 'magic'}).status_code == 400
+
+
+def test_unknown_and_unfinished_jobs(app, hr_client):
+    assert hr_client.get('/screening/jobs/missing').status_code == 404
+    job_id = add_job(app, status='running', started_at=datetime.utcnow())
+    response = hr_client.get(f'/screening/jobs/{job_id}/results')
+    assert response.status_code == 409
+    assert response.get_json()['job']['status'] == 'running'
+
+
+def test_interrupted_jobs_are_requeued_on_first_use(app, hr_client):
+    write_resumes(app, RESUMES)
+    queued = add_job(app)
+    stale = add_job(app, status='running', started_at=datetime.utcnow() - timedelta(hours=2))
+    # Still inside the stale limit: another worker process may be running it
+    recent = add_job(app, status='running', started_at=datetime.utcnow())
+
+    wait_for(hr_client, queued)
+    wait_for(hr_client, stale)
+    app_module.screening_executor.shutdown(wait=True)
+    assert get_job(app, recent)['status'] == 'running'
+    assert get_job(app, recent)['total'] == 0
+
+
+def test_claim_runs_each_job_once(app):
+    write_resumes(app, RESUMES)
+    job_id = add_job(app)
+    app_module.run_screening_job(app, job_id)
+    done = get_job(app, job_id)
+    assert done['status'] == 'completed'
+
+    # A finished job is not claimed again, so its results stay as they are
+    app_module.run_screening_job(app, job_id)
+    assert get_job(app, job_id) == done
+    with app.app_context():
+        assert ScreeningResult.query.filter_by(job_id=job_id).count() == len(RESUMES)
+
+
+def test_stale_running_job_is_taken_over(app):
+    write_resumes(app, RESUMES)
+    app.config['SCREENING_JOB_STALE_AFTER'] = 60
+    now = datetime.utcnow()
+    # Started long ago but still beating: another worker is making progress
+    alive = add_job(app, status='running', started_at=now - timedelta(hours=2), heartbeat_at=now - timedelta(seconds=30))
+    stopped = add_job(app, status='running', started_at=now - timedelta(seconds=90), heartbeat_at=now - timedelta(seconds=90))
+
+    app_module.run_screening_job(app, alive)
+    app_module.run_screening_job(app, stopped)
+    assert get_job(app, alive)['status'] == 'running'
+    done = get_job(app, stopped)
+    assert done['status'] == 'completed' and done['processed'] == len(RESUMES)
+    assert done['heartbeat_at'] > (now - timedelta(seconds=90)).isoformat()
+
+
+def test_init_db_adds_the_heartbeat_column_to_an_old_table(app):
+    with app.app_context():
+        db.session.execute(db.text('ALTER TABLE screening_job DROP COLUMN heartbeat_at'))
+        db.session.commit()
+        app_module.init_db()
+        assert 'heartbeat_at' in {c['name'] for c in db.inspect(db.engine).get_columns('screening_job')}
@@ -0,0 +1,28 @@
+from skills import dump_skills, extract_skills, load_skills, match_score
+
+
+def test_extract_skills_keeps_skill_symbols_and_folds_aliases():
+    skills = extract_skills('Strong experience with JS, Node, C++ and C# on k8s; CI/CD a plus. 5+ years.')
+    assert skills == ['c#', 'c++', 'ci/cd', 'javascript', 'kubernetes', 'node.js']
+
+
+def test_extract_skills_drops_stopwords_and_boilerplate():
+    assert extract_skills('The ideal candidate has excellent knowledge of Python and R') == ['python', 'r']
+    assert extract_skills('') == []
+
+
+def test_extract_skills_drops_generic_title_words():
+    assert extract_skills('Senior Software Engineer, web development in Go') == ['go']
+
+
+def test_match_score_is_share_of_job_skills_found():
+    job = extract_skills('Python, Flask, PostgreSQL, Docker')
+    candidate = extract_skills('Built Flask services on postgres with python')
+    assert match_score(job, candidate) == 75.0
+    assert match_score([], candidate) == 0
+
+
+def test_skills_round_trip_through_storage():
+    skills = extract_skills('python flask sql')
+    assert load_skills(dump_skills(skills)) == skills
+    assert load_skills(None) == []
@@ -0,0 +1,76 @@
+import sqlite3
+import time
+
+from text_cache import TextCache, content_hash
+
+
+def test_get_or_extract_hits_after_first_extraction(tmp_path):
+    source = tmp_path / 'resume.pdf'
+    source.write_bytes(b'fake pdf bytes')
+    calls = []
+
+    def extractor(f):
+        calls.append(f.read())
+        return 'python flask'
+
+    cache = TextCache(str(tmp_path / 'cache.db'))
+    assert cache.get_or_extract(str(source), 'v1', extractor) == 'python flask'
+    assert cache.get_or_extract(str(source), 'v1', extractor) == 'python flask'
+    assert len(calls) == 1
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+    # A new extractor version must not reuse old text
+    cache.get_or_extract(str(source), 'v2', extractor)
+    assert len(calls) == 2
+
+
+def test_eviction_keeps_total_size_bounded(tmp_path):
+    cache = TextCache(str(tmp_path / 'cache.db'), max_bytes=25)
+    for i in range(5):
+        cache.put(content_hash(bytes([i])), 'v1', 'x' * 10)
+    stats = cache.stats()
+    assert stats['bytes'] <= 25
+    assert stats['evictions'] == 3
+    # The most recent entry survives
+    assert cache.get(content_hash(bytes([4])), 'v1') == 'x' * 10
+    assert cache.get(content_hash(bytes([0])), 'v1') is None
+
+
+def test_byte_total_tracks_replacements_and_survives_reopening(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = TextCache(path)
+    cache.put('a', 'v1', 'x' * 10)
+    cache.put('a', 'v1', 'x' * 4)
+    cache.put('b', 'v1', 'y' * 6)
+    assert cache.stats()['bytes'] == 10
+    cache.close()
+    assert TextCache(path).stats()['bytes'] == 10
+
+
+def test_hits_are_written_in_batches_and_still_steer_eviction(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = TextCache(path, max_bytes=30, touch_batch=100)
+    for name in ('old', 'mid', 'new'):
+        cache.put(name, 'v1', 'x' * 10)
+        time.sleep(0.01)
+    assert cache.get('old', 'v1') == 'x' * 10
+    # The hit is only in memory so far
+    other = sqlite3.connect(path)
+    assert other.execute("SELECT last_access FROM extracted_text WHERE digest = 'old'").fetchone()[0] < \
+        other.execute("SELECT last_access FROM extracted_text WHERE digest = 'new'").fetchone()[0]
+    other.close()
+
+    cache.put('newest', 'v1', 'x' * 10)
+    assert cache.get('old', 'v1') is not None
+    assert cache.get('mid', 'v1') is None
+
+
+def test_existing_cache_without_total_is_counted_once(tmp_path):
+    path = str(tmp_path / 'cache.db')
+    cache = TextCache(path)
+    cache.put('a', 'v1', 'x' * 7)
+    conn = cache._connect()
+    conn.execute('DROP TABLE cache_meta')
+    conn.commit()
+    cache.close()
+    assert TextCache(path).stats()['bytes'] == 7
@@ -0,0 +1,18 @@
+import app as app_module
+from app import ScreeningJob, db
+
+
+def test_only_static_files_are_cached_for_long(app, hr_client):
+    static = hr_client.get('/static/css/style.css')
+    assert static.cache_control.max_age == app.config['STATIC_MAX_AGE']
+
+    with app.app_context():
+        job = ScreeningJob(job_description='python', status='completed')
+        db.session.add(job)
+        db.session.commit()
+        app_module.save_screening_results(job.id, [{'resume': 'a.docx', 'name': 'a', 'email': 'a@example.com', 'score': 50.0}])
+        db.session.commit()
+        job_id = job.id
+    export = hr_client.get(f'/download_results?job_id={job_id}')
+    assert export.status_code == 200
+    assert export.cache_control.max_age is None and not export.cache_control.public
@@ -0,0 +1,184 @@
+import hashlib
+import threading
+import time
+
+import sqlite_store
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024  # 256MB of extracted text
+TOUCH_BATCH = 256  # cache hits whose access times are written in one transaction
+EVICT_BATCH = 64  # least recently used rows read per eviction step
+
+
+def content_hash(data):
+    """SHA-256 hex digest of raw file bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_hash(path, chunk_size=1024 * 1024):
+    """SHA-256 hex digest of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class TextCache:
+    """Content-addressed store of extracted document text, backed by SQLite.
+
+    Entries are keyed by the SHA-256 of the source bytes plus the extractor
+    version, so a new extractor never serves stale text. The total size of
+    cached text is bounded; least recently used entries are evicted first.
+
+    The byte total is kept in a meta row, so a put never scans the table.
+    Hits only record their access time in memory; the times are written in
+    batches, and before any eviction so the LRU order is current.
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES, touch_batch=TOUCH_BATCH):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.touch_batch = touch_batch
+        self._touched = {}  # (digest, version) -> last access not yet written
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite_store.connect(self.path)
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS extracted_text ('
+                ' digest TEXT NOT NULL,'
+                ' version TEXT NOT NULL,'
+                ' text TEXT NOT NULL,'
+                ' size INTEGER NOT NULL,'
+                ' last_access REAL NOT NULL,'
+                ' PRIMARY KEY (digest, version))'
+            )
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS ix_extracted_text_last_access '
+                'ON extracted_text (last_access)'
+            )
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)'
+            )
+            # Caches created before the running total start from one full count
+            self._conn.execute(
+                'INSERT OR IGNORE INTO cache_meta (key, value) '
+                'SELECT \'total_bytes\', COALESCE(SUM(size), 0) FROM extracted_text'
+            )
+            self._conn.commit()
+        return self._conn
+
+    def get(self, digest, version):
+        """Return cached text for a content hash, or None on a miss"""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT text FROM extracted_text WHERE digest = ? AND version = ?',
+                (digest, version)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touched[(digest, version)] = time.time()
+            if len(self._touched) >= self.touch_batch:
+                self._flush_touches(conn)
+                conn.commit()
+            return row[0]
+
+    def _flush_touches(self, conn):
+        if self._touched:
+            conn.executemany(
+                'UPDATE extracted_text SET last_access = ? WHERE digest = ? AND version = ?',
+                [(accessed, digest, version) for (digest, version), accessed in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def put(self, digest, version, text):
+        """Store extracted text and evict old entries past the size bound"""
+        size = len(text.encode('utf-8'))
+        with self._lock:
+            conn = self._connect()
+            # The write lock is taken first so the byte total stays exact across processes
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                row = conn.execute(
+                    'SELECT size FROM extracted_text WHERE digest = ? AND version = ?', (digest, version)
+                ).fetchone()
+                conn.execute(
+                    'INSERT OR REPLACE INTO extracted_text (digest, version, text, size, last_access) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (digest, version, text, size, time.time())
+                )
+                total = self._add_bytes(conn, size - (row[0] if row else 0))
+                if total > self.max_bytes:
+                    self._flush_touches(conn)
+                    self._evict(conn, total)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+    def _add_bytes(self, conn, delta):
+        conn.execute('UPDATE cache_meta SET value = value + ? WHERE key = \'total_bytes\'', (delta,))
+        return conn.execute('SELECT value FROM cache_meta WHERE key = \'total_bytes\'').fetchone()[0]
+
+    def _evict(self, conn, total):
+        # Oldest entries first, a batch at a time from the last_access index
+        while total > self.max_bytes:
+            rows = conn.execute(
+                'SELECT digest, version, size FROM extracted_text ORDER BY last_access LIMIT ?', (EVICT_BATCH,)
+            ).fetchall()
+            if not rows:
+                break
+            freed = 0
+            for digest, version, size in rows:
+                if total - freed <= self.max_bytes:
+                    break
+                conn.execute('DELETE FROM extracted_text WHERE digest = ? AND version = ?', (digest, version))
+                self._touched.pop((digest, version), None)
+                freed += size
+                self.evictions += 1
+            total = self._add_bytes(conn, -freed)
+
+    def get_or_extract(self, path, version, extractor):
+        """Return text for the file at path, running extractor(file) only on a miss"""
+        digest = file_hash(path)
+        text = self.get(digest, version)
+        if text is None:
+            with open(path, 'rb') as f:
+                text = extractor(f)
+            self.put(digest, version, text)
+        return text
+
+    def stats(self):
+        """Hit/miss counters and current size of the cache"""
+        with self._lock:
+            conn = self._connect()
+            self._flush_touches(conn)
+            conn.commit()
+            entries = conn.execute('SELECT COUNT(*) FROM extracted_text').fetchone()[0]
+            size = conn.execute('SELECT value FROM cache_meta WHERE key = \'total_bytes\'').fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0,
+            'entries': entries,
+            'bytes': size,
+            'max_bytes': self.max_bytes,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._flush_touches(self._conn)
+                self._conn.commit()
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,11 @@
+"""Production entry point:
+
+    flask --app app init-db
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Settings come from FLASK_* environment variables, e.g. FLASK_SECRET_KEY,
+FLASK_SQLALCHEMY_DATABASE_URI and FLASK_UPLOAD_FOLDER.
+"""
+from app import create_app
+
+app = create_app()